@@ -0,0 +1,18 @@
+# Dibaca otomatis oleh gunicorn (./gunicorn.conf.py) saat start.
+# Menyiapkan mode multiprocess prometheus_client agar /metrics menggabungkan
+# metrik dari semua worker (lihat project/metrik.py).
+import os
+import shutil
+
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus_multiproc')
+
+
+def on_starting(server):
+    # Bersihkan file metrik sisa proses sebelumnya
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
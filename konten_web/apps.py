@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class KontenWebConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'konten_web'
+
+    def ready(self):
+        # Signal pembuatan varian gambar responsif (project/gambar.py)
+        import konten_web.signals
+        from project.instrumentasi import ukur_upload_cloudinary
+
+        # Upload media (CloudinaryField) tercatat sebagai segmen 'cloudinary'
+        for model in self.get_models():
+            ukur_upload_cloudinary(model)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('konten_web', '0002_alter_dokumentasi_file_media_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dokumentasi',
+            name='media_varian',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='herosection',
+            name='media_varian',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
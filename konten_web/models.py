@@ -13,6 +13,8 @@ class HeroSection(models.Model):
         resource_type='auto', # 'auto' artinya bisa upload Video ATAU Gambar
         help_text="Upload Video (mp4/webm) atau Gambar (jpg/png)"
     )
+    # Peta URL varian responsif (srcset), diisi otomatis oleh signals (project/gambar.py)
+    media_varian = models.JSONField(default=dict, blank=True, editable=False)
     
     is_active = models.BooleanField(default=True, help_text="Jika dicentang, slide ini akan tampil")
     urutan = models.IntegerField(default=0, help_text="Angka lebih kecil tampil lebih dulu")
@@ -41,6 +43,7 @@ class Dokumentasi(models.Model):
         resource_type='auto', # Penting agar bisa upload video dokumentasi
         help_text="Upload Foto (.jpg/.png) atau Video (.mp4)"
     )
+    media_varian = models.JSONField(default=dict, blank=True, editable=False)
     
     urutan = models.IntegerField(default=0, help_text="Urutan tampilan (0 paling awal)")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -7,7 +7,7 @@ class HeroSectionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = HeroSection
-        fields = ['id', 'judul', 'sub_judul', 'background_media', 'media_url', 'media_type', 'is_active', 'urutan']
+        fields = ['id', 'judul', 'sub_judul', 'background_media', 'media_url', 'media_varian', 'media_type', 'is_active', 'urutan']
 
     def get_media_url(self, obj):
         # PERBAIKAN: Langsung ambil URL dari CloudinaryField
@@ -40,7 +40,7 @@ class DokumentasiSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Dokumentasi
-        fields = ['id', 'judul', 'deskripsi', 'file_media', 'media_url', 'media_type', 'urutan', 'created_at']
+        fields = ['id', 'judul', 'deskripsi', 'file_media', 'media_url', 'media_varian', 'media_type', 'urutan', 'created_at']
 
     def get_media_url(self, obj):
         # PERBAIKAN: Langsung return URL Cloudinary
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from project.gambar import sinkron_varian
+
+from .models import Dokumentasi, HeroSection
+
+
+@receiver(post_save, sender=HeroSection)
+def buat_varian_hero(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sinkron_varian(instance, 'background_media', 'media_varian')
+
+
+@receiver(post_save, sender=Dokumentasi)
+def buat_varian_dokumentasi(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sinkron_varian(instance, 'file_media', 'media_varian')
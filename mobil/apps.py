@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class MobilConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mobil'
+
+    def ready(self):
+        # Signal untuk invalidasi cache katalog (mobil/cache.py)
+        import mobil.signals
+        from project.instrumentasi import ukur_upload_cloudinary
+
+        # Upload gambar (CloudinaryField) tercatat sebagai segmen 'cloudinary'
+        for model in self.get_models():
+            ukur_upload_cloudinary(model)
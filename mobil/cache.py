@@ -0,0 +1,120 @@
+"""
+Cache response katalog publik (list mobil & rekomendasi) + conditional GET.
+
+- Versi armada disimpan di Django cache dan dinaikkan setiap Mobil di-save /
+  di-delete (signals.py). Key cache memuat versi, jadi data lama tidak perlu
+  dihapus satu per satu, cukup kadaluarsa sendiri.
+- ETag = versi + query param yang dinormalisasi. `If-None-Match` /
+  `If-Modified-Since` yang masih cocok dijawab 304 tanpa query ke database.
+- Hanya untuk pengunjung non-admin; admin melihat semua status mobil, jadi
+  selalu dihitung langsung.
+- Versi harus dibaca semua worker gunicorn & proses manage.py (hitung_skor_mobil,
+  seed_rental), jadi sebaiknya cache bersama (REDIS_URL, settings 13. CACHE);
+  tanpa Redis, KATALOG_CACHE_TTL dipendekkan. Jika key versi ter-evict, versi baru diambil dari jam
+  (milidetik), bukan mulai dari 1 lagi, agar tidak pernah memakai ulang key
+  cache / ETag milik data lama.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Mobil
+
+CACHE_KEY_VERSI = 'mobil:katalog:versi'
+CACHE_KEY_DIUBAH = 'mobil:katalog:diubah'
+
+FIELD_SNAPSHOT = [
+    'id', 'merk', 'transmisi', 'kapasitas_kursi', 'harga_per_hari',
+    'popularity', 'dengan_supir', 'status',
+]
+
+
+def _versi_awal():
+    return int(time.time() * 1000)
+
+
+def versi_katalog():
+    """Return (versi, waktu_diubah_epoch)."""
+    data = cache.get_many([CACHE_KEY_VERSI, CACHE_KEY_DIUBAH])
+    versi = data.get(CACHE_KEY_VERSI)
+    diubah = data.get(CACHE_KEY_DIUBAH)
+    if versi is None:
+        cache.add(CACHE_KEY_VERSI, _versi_awal(), timeout=None)
+        versi = cache.get(CACHE_KEY_VERSI) or _versi_awal()
+    if diubah is None:
+        # Belum tercatat (cache baru / ter-evict): anggap berubah sekarang
+        diubah = int(time.time())
+        cache.add(CACHE_KEY_DIUBAH, diubah, timeout=None)
+    return versi, diubah
+
+
+def naikkan_versi_katalog():
+    """Panggil setiap data armada berubah (termasuk update massal / bulk_create)."""
+    try:
+        cache.incr(CACHE_KEY_VERSI)
+    except ValueError:
+        # Key belum ada / sudah ter-evict
+        cache.add(CACHE_KEY_VERSI, _versi_awal(), timeout=None)
+        cache.incr(CACHE_KEY_VERSI)
+    cache.set(CACHE_KEY_DIUBAH, int(time.time()), timeout=None)
+
+
+def snapshot_armada():
+    """Kolom filter seluruh mobil (1 query per versi armada), dipakai facet katalog."""
+    versi, _ = versi_katalog()
+    cache_key = f'mobil:snapshot:{versi}'
+    data = cache.get(cache_key)
+    if data is None:
+        data = list(Mobil.objects.order_by('id').values(*FIELD_SNAPSHOT))
+        cache.set(cache_key, data, timeout=getattr(settings, 'KATALOG_CACHE_TTL', 3600))
+    return data
+
+
+def _normalisasi_params(request):
+    """Query param terurut, nilai kosong dibuang: `?b=2&a=1&c=` == `?a=1&b=2`."""
+    pasangan = sorted(
+        (kunci, nilai)
+        for kunci, daftar in request.query_params.lists()
+        for nilai in daftar
+        if nilai != ''
+    )
+    return '&'.join(f'{k}={v}' for k, v in pasangan)
+
+
+def respon_katalog(request, nama, bangun):
+    """
+    `bangun()` -> data response (hanya dipanggil saat cache miss).
+    Host ikut jadi bagian key karena link paginasi (next/previous) absolut.
+    """
+    versi, diubah = versi_katalog()
+    digest = hashlib.sha256(
+        f'{nama}|{request.get_host()}|{_normalisasi_params(request)}'.encode('utf-8')
+    ).hexdigest()[:32]
+    etag = quote_etag(f'{versi}-{digest}')
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(diubah),
+        'Cache-Control': 'no-cache',
+        'Vary': 'Authorization',
+    }
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    else:
+        since = parse_http_date_safe(request.headers.get('If-Modified-Since') or '')
+        if since is not None and diubah <= since:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cache_key = f'mobil:katalog:{versi}:{digest}'
+    data = cache.get(cache_key)
+    if data is None:
+        data = bangun()
+        cache.set(cache_key, data, timeout=getattr(settings, 'KATALOG_CACHE_TTL', 3600))
+    return Response(data, headers=headers)
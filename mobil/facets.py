@@ -0,0 +1,116 @@
+"""
+Facet katalog (jumlah mobil per merk, transmisi, kursi, popularity, supir, rentang harga).
+
+Dihitung dari snapshot armada di memori (mobil/cache.py, 1 query per versi
+armada), bukan satu query per kombinasi filter. Facet bersifat disjungtif:
+jumlah untuk sebuah facet memakai semua filter aktif KECUALI filter facet itu
+sendiri, jadi sidebar tetap menampilkan pilihan lain beserta jumlahnya.
+Semantik filter sama dengan `filter_katalog` (mobil/filters.py).
+"""
+from bisect import bisect_right
+from decimal import Decimal
+
+from .filters import angka_param
+
+# Batas bawah tiap bucket harga per hari; bucket terakhir tanpa batas atas
+BATAS_HARGA = [0, 300000, 500000, 750000, 1000000]
+
+FACETS = ['merk', 'transmisi', 'kapasitas_kursi', 'popularity', 'dengan_supir', 'harga']
+
+
+def bucket_harga(harga):
+    """Return (batas_bawah, batas_atas) bucket; batas_atas None untuk bucket termahal."""
+    idx = max(bisect_right(BATAS_HARGA, harga) - 1, 0)
+    atas = BATAS_HARGA[idx + 1] if idx + 1 < len(BATAS_HARGA) else None
+    return BATAS_HARGA[idx], atas
+
+
+def _predikat(params, is_admin):
+    """Filter aktif per facet: dict nama_facet -> fungsi(mobil) -> bool."""
+    pred = {}
+
+    status = params.get('status')
+    if status:
+        pred['status'] = lambda m: m['status'] == status
+    elif not is_admin:
+        pred['status'] = lambda m: m['status'] == 'aktif'
+
+    merk = params.get('merk')
+    if merk:
+        merk = merk.lower()
+        pred['merk'] = lambda m: merk in (m['merk'] or '').lower()
+
+    transmisi = params.get('transmisi')
+    if transmisi:
+        pred['transmisi'] = lambda m: m['transmisi'] == transmisi
+
+    min_kursi = angka_param(params, 'min_kursi', int)
+    if min_kursi is not None:
+        pred['kapasitas_kursi'] = lambda m: m['kapasitas_kursi'] >= min_kursi
+
+    min_harga = angka_param(params, 'min_harga', Decimal)
+    max_harga = angka_param(params, 'max_harga', Decimal)
+    if min_harga is not None or max_harga is not None:
+        pred['harga'] = lambda m: (
+            (min_harga is None or m['harga_per_hari'] >= min_harga)
+            and (max_harga is None or m['harga_per_hari'] <= max_harga)
+        )
+
+    popularity = params.get('popularity')
+    if popularity:
+        pred['popularity'] = lambda m: m['popularity'] == popularity
+
+    dengan_supir = params.get('dengan_supir')
+    if dengan_supir is not None:
+        is_supir = str(dengan_supir).lower() in ['true', '1', 'yes']
+        pred['dengan_supir'] = lambda m: m['dengan_supir'] == is_supir
+
+    return pred
+
+
+def hitung_facets(snapshot, params, is_admin=False, kecuali_ids=()):
+    """
+    `snapshot`: list dict mobil (lihat `snapshot_armada`).
+    `kecuali_ids`: mobil yang tidak tersedia di rentang tanggal yang diminta.
+    """
+    pred = _predikat(params, is_admin)
+    kecuali_ids = set(kecuali_ids)
+    nilai_facet = {
+        'merk': lambda m: m['merk'] or '-',
+        'transmisi': lambda m: m['transmisi'],
+        'kapasitas_kursi': lambda m: m['kapasitas_kursi'],
+        'popularity': lambda m: m['popularity'],
+        'dengan_supir': lambda m: m['dengan_supir'],
+        'harga': lambda m: bucket_harga(m['harga_per_hari']),
+    }
+    hitung = {facet: {} for facet in FACETS}
+    total = 0
+
+    for m in snapshot:
+        if m['id'] in kecuali_ids:
+            continue
+        gagal = [nama for nama, cek in pred.items() if not cek(m)]
+        if not gagal:
+            total += 1
+        # Lolos semua filter kecuali (paling banyak) filter facet itu sendiri
+        if len(gagal) > 1:
+            continue
+        for facet in FACETS:
+            if gagal and gagal[0] != facet:
+                continue
+            kunci = nilai_facet[facet](m)
+            hitung[facet][kunci] = hitung[facet].get(kunci, 0) + 1
+
+    hasil = {'total': total}
+    for facet in FACETS:
+        if facet == 'harga':
+            hasil[facet] = [
+                {'min': bawah, 'max': atas, 'jumlah': n}
+                for (bawah, atas), n in sorted(hitung[facet].items())
+            ]
+        else:
+            hasil[facet] = [
+                {'nilai': nilai, 'jumlah': n}
+                for nilai, n in sorted(hitung[facet].items(), key=lambda x: (-x[1], str(x[0])))
+            ]
+    return hasil
@@ -0,0 +1,60 @@
+from decimal import Decimal, InvalidOperation
+
+from rest_framework.exceptions import ValidationError
+
+
+def angka_param(params, nama, tipe):
+    """Parameter angka opsional; nilai bukan angka -> ValidationError (400), bukan 500 dari database."""
+    nilai = params.get(nama)
+    if not nilai:
+        return None
+    try:
+        hasil = tipe(nilai)
+    except (ValueError, InvalidOperation):
+        raise ValidationError({nama: "Harus berupa angka."})
+    if isinstance(hasil, Decimal) and not hasil.is_finite():
+        raise ValidationError({nama: "Harus berupa angka."})
+    return hasil
+
+
+def filter_katalog(queryset, params, user=None):
+    """
+    Filter katalog mobil dari query params (dipakai list mobil & simulasi harga).
+    `params`: QueryDict / dict biasa.
+    """
+    status_param = params.get('status')
+    if status_param:
+        queryset = queryset.filter(status=status_param)
+    else:
+        if not (user and user.is_authenticated and (user.is_staff or getattr(user, 'role', '') == 'admin')):
+            queryset = queryset.filter(status='aktif')
+
+    merk = params.get('merk')
+    if merk:
+        queryset = queryset.filter(merk__icontains=merk)
+
+    transmisi = params.get('transmisi')
+    if transmisi:
+        queryset = queryset.filter(transmisi=transmisi)
+
+    min_kursi = angka_param(params, 'min_kursi', int)
+    if min_kursi is not None:
+        queryset = queryset.filter(kapasitas_kursi__gte=min_kursi)
+
+    min_harga = angka_param(params, 'min_harga', Decimal)
+    max_harga = angka_param(params, 'max_harga', Decimal)
+    if min_harga is not None:
+        queryset = queryset.filter(harga_per_hari__gte=min_harga)
+    if max_harga is not None:
+        queryset = queryset.filter(harga_per_hari__lte=max_harga)
+
+    popularity = params.get('popularity')
+    if popularity:
+        queryset = queryset.filter(popularity=popularity)
+
+    dengan_supir = params.get('dengan_supir')
+    if dengan_supir is not None:
+        is_supir = str(dengan_supir).lower() in ['true', '1', 'yes']
+        queryset = queryset.filter(dengan_supir=is_supir)
+
+    return queryset
@@ -0,0 +1,34 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from mobil.cache import naikkan_versi_katalog
+from project.gambar import MODEL_BERGAMBAR, sinkron_varian
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill peta varian gambar responsif (Mobil, Supir, konten_web) untuk data yang "
+        "diunggah sebelum fitur varian ada, atau setelah LEBAR_VARIAN diubah (--paksa)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--paksa', action='store_true', help='Hitung ulang walaupun file gambar tidak berubah.')
+        parser.add_argument('--model', help='Hanya model ini, mis. mobil.Mobil.')
+
+    def handle(self, *args, **options):
+        total = 0
+        for label, field_gambar, field_varian in MODEL_BERGAMBAR:
+            if options['model'] and options['model'].lower() != label.lower():
+                continue
+            model = apps.get_model(label)
+            diubah = 0
+            qs = model.objects.exclude(**{f'{field_gambar}__isnull': True}).exclude(**{field_gambar: ''})
+            for obj in qs.order_by('pk').iterator(chunk_size=200):
+                if sinkron_varian(obj, field_gambar, field_varian, paksa=options['paksa']):
+                    diubah += 1
+            if diubah and label == 'mobil.Mobil':
+                # queryset.update tidak memicu signal -> cache katalog dinaikkan manual
+                naikkan_versi_katalog()
+            self.stdout.write(f"{label}: {diubah} diperbarui")
+            total += diubah
+        self.stdout.write(self.style.SUCCESS(f"Selesai: {total} peta varian diperbarui."))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from mobil.cache import naikkan_versi_katalog
+from mobil.skor import perbarui_skor
+
+
+class Command(BaseCommand):
+    help = (
+        "Perbarui skor popularitas mobil (dasar urutan rekomendasi) dari data pesanan. "
+        "Default incremental: hanya mobil yang pesanannya berubah sejak refresh terakhir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--penuh', action='store_true', help='Hitung ulang semua mobil (mis. cron mingguan).')
+
+    def handle(self, *args, **options):
+        mulai = time.perf_counter()
+        jumlah = perbarui_skor(penuh=options['penuh'])
+        # Urutan rekomendasi (yang di-cache per versi armada) ikut berubah
+        naikkan_versi_katalog()
+        self.stdout.write(self.style.SUCCESS(
+            f"Skor diperbarui: {jumlah} mobil dihitung ulang ({(time.perf_counter() - mulai) * 1000:.0f} ms)."
+        ))
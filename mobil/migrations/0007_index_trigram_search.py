@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:46
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobil', '0006_alter_mobil_gambar'),
+    ]
+
+    operations = [
+        # pg_trgm untuk index GIN gin_trgm_ops (IF NOT EXISTS, aman diulang)
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='mobil',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nama_mobil'), name='gin_trgm_ops'), name='mobil_nama_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='mobil',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('merk'), name='gin_trgm_ops'), name='mobil_merk_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='mobil',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('plat_nomor'), name='gin_trgm_ops'), name='mobil_plat_trgm'),
+        ),
+    ]
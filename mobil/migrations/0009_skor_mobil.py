@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobil', '0008_mobil_gambar_varian'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkorMobil',
+            fields=[
+                ('mobil', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='skor', serialize=False, to='mobil.mobil')),
+                ('aktif', models.BooleanField(default=True)),
+                ('boost', models.FloatField(default=1.0, help_text='Pengali dari label popularity')),
+                ('pesanan', models.FloatField(default=0)),
+                ('hari_tersewa', models.FloatField(default=0)),
+                ('pendapatan', models.FloatField(default=0)),
+                ('batal', models.FloatField(default=0)),
+                ('skor_permintaan', models.FloatField(default=0)),
+                ('skor_akhir', models.FloatField(default=0)),
+                ('dihitung_pada', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'mobil_skor',
+                'indexes': [models.Index(fields=['aktif', '-skor_akhir', '-mobil'], name='mobil_skor_topk_idx')],
+            },
+        ),
+    ]
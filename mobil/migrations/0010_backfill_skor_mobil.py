@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from mobil.skor import BOOST_LABEL, SKOR_DASAR
+
+
+def backfill(apps, schema_editor):
+    """
+    Baris awal per mobil agar rekomendasi tidak kosong sebelum `manage.py hitung_skor_mobil`
+    pertama: belum ada komponen pesanan, jadi skor = SKOR_DASAR x boost label (sama dengan `sinkron_label`).
+    """
+    Mobil = apps.get_model('mobil', 'Mobil')
+    SkorMobil = apps.get_model('mobil', 'SkorMobil')
+    baris = []
+    for mobil_id, status, popularity in Mobil.objects.values_list('id', 'status', 'popularity'):
+        boost = BOOST_LABEL.get(popularity, 1.0)
+        baris.append(SkorMobil(mobil_id=mobil_id, aktif=status == 'aktif', boost=boost, skor_akhir=SKOR_DASAR * boost))
+    SkorMobil.objects.bulk_create(baris, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobil', '0009_skor_mobil'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
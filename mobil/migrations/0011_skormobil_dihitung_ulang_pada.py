@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobil', '0010_backfill_skor_mobil'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skormobil',
+            name='dihitung_ulang_pada',
+            field=models.DateTimeField(blank=True, help_text='Terakhir dihitung ulang dari tabel pesanan (bukan hanya diluruhkan)', null=True),
+        ),
+    ]
@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 # Import CloudinaryField
 from cloudinary.models import CloudinaryField
 
@@ -44,6 +46,8 @@ class Mobil(models.Model):
     # --- PERUBAHAN DISINI ---
     # Menggunakan CloudinaryField agar otomatis upload ke folder 'mobil' di Cloudinary
     gambar = CloudinaryField('image', folder='mobil', blank=True, null=True)
+    # Peta URL varian responsif (srcset), diisi otomatis oleh signals (project/gambar.py)
+    gambar_varian = models.JSONField(default=dict, blank=True, editable=False)
     
     keterangan = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -52,6 +56,46 @@ class Mobil(models.Model):
     class Meta:
         db_table = 'mobil'
         ordering = ['-created_at']
+        indexes = [
+            # Search (icontains = UPPER(kolom) LIKE '%x%') via pg_trgm
+            GinIndex(OpClass(Upper('nama_mobil'), name='gin_trgm_ops'), name='mobil_nama_trgm'),
+            GinIndex(OpClass(Upper('merk'), name='gin_trgm_ops'), name='mobil_merk_trgm'),
+            GinIndex(OpClass(Upper('plat_nomor'), name='gin_trgm_ops'), name='mobil_plat_trgm'),
+        ]
     
     def __str__(self):
-        return f"{self.nama_mobil} - {self.plat_nomor}"
\ No newline at end of file
+        return f"{self.nama_mobil} - {self.plat_nomor}"
+
+
+class SkorMobil(models.Model):
+    """
+    Skor popularitas per mobil (dihitung mobil/skor.py, bukan diisi manual).
+    Semua komponen sudah diluruhkan (time decay) ke waktu `dihitung_pada`.
+    `aktif` & `boost` disalin dari Mobil agar rekomendasi cukup membaca index tabel ini.
+    """
+    mobil = models.OneToOneField(Mobil, on_delete=models.CASCADE, primary_key=True, related_name='skor')
+    aktif = models.BooleanField(default=True)
+    boost = models.FloatField(default=1.0, help_text="Pengali dari label popularity")
+
+    pesanan = models.FloatField(default=0)
+    hari_tersewa = models.FloatField(default=0)
+    pendapatan = models.FloatField(default=0)
+    batal = models.FloatField(default=0)
+
+    skor_permintaan = models.FloatField(default=0)
+    skor_akhir = models.FloatField(default=0)
+    dihitung_pada = models.DateTimeField(null=True, blank=True)
+    dihitung_ulang_pada = models.DateTimeField(
+        null=True, blank=True, help_text="Terakhir dihitung ulang dari tabel pesanan (bukan hanya diluruhkan)"
+    )
+
+    class Meta:
+        db_table = 'mobil_skor'
+        indexes = [
+            # Top-K rekomendasi: WHERE aktif ORDER BY skor_akhir DESC, mobil_id DESC LIMIT k
+            models.Index(fields=['aktif', '-skor_akhir', '-mobil'], name='mobil_skor_topk_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.mobil_id}: {self.skor_akhir:.2f}"
+
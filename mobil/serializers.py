@@ -18,7 +18,8 @@ class MobilSerializer(serializers.ModelSerializer):
     
     def get_gambar_url(self, obj):
         if obj.gambar:
-            return obj.gambar.url # Mengambil link https://res.cloudinary.com/...
+            # Peta varian (project/gambar.py) sudah menyimpan URL https; fallback untuk data lama
+            return (obj.gambar_varian or {}).get('asli') or obj.gambar.url
         return None
 
     def validate_plat_nomor(self, value):
@@ -41,10 +42,10 @@ class MobilListSerializer(serializers.ModelSerializer):
             'harga_per_hari', 'status', 'gambar_url',
             'transmisi', 'transmisi_display', 'kapasitas_kursi',
             'popularity', 'keterangan',
-            'dengan_supir'
+            'dengan_supir', 'gambar_varian'
         ]
 
     def get_gambar_url(self, obj):
         if obj.gambar:
-            return obj.gambar.url
-        return None
\ No newline at end of file
+            return (obj.gambar_varian or {}).get('asli') or obj.gambar.url
+        return None
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from project.gambar import sinkron_varian
+
+from .cache import naikkan_versi_katalog
+from .models import Mobil
+from .skor import sinkron_label
+
+
+@receiver(post_save, sender=Mobil)
+def buat_varian_gambar(sender, instance, raw=False, **kwargs):
+    """Gambar baru / berganti: hitung ulang peta varian responsif (sebelum versi katalog dinaikkan)."""
+    if not raw:
+        sinkron_varian(instance, 'gambar', 'gambar_varian')
+
+
+@receiver(post_save, sender=Mobil)
+def sinkron_skor(sender, instance, raw=False, **kwargs):
+    """Label popularity / status berubah: boost & flag aktif di tabel skor ikut diperbarui."""
+    if not raw:
+        sinkron_label(instance)
+
+
+@receiver(post_save, sender=Mobil)
+@receiver(post_delete, sender=Mobil)
+def invalidasi_cache_katalog(sender, **kwargs):
+    """Data armada berubah: cache katalog & ETag lama otomatis tidak berlaku."""
+    naikkan_versi_katalog()
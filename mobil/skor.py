@@ -0,0 +1,165 @@
+"""
+Skor popularitas mobil untuk rekomendasi (tabel `mobil_skor`).
+
+Komponen per mobil dari pesanan dalam SKOR_JENDELA_HARI terakhir, tiap
+pesanan diberi bobot peluruhan 0.5 ** (umur_hari / SKOR_HALF_LIFE_HARI):
+- pesanan      : jumlah pesanan (selain batal)
+- hari_tersewa : total hari sewa pesanan yang benar-benar terpakai
+- pendapatan   : total harga pesanan terpakai (rupiah)
+- batal        : jumlah pesanan batal -> rasio batal memotong skor
+
+    skor_permintaan = (pesanan + 0.5 * hari + pendapatan / 1 juta) * (1 - rasio_batal)
+    skor_akhir      = (skor_permintaan + SKOR_DASAR) * boost label popularity
+
+Refresh incremental (`manage.py hitung_skor_mobil`): semua baris dikalikan
+faktor peluruhan sejak refresh terakhir (1 UPDATE), lalu dihitung ulang dari
+tabel pesanan hanya untuk mobil yang:
+- pesanannya berubah sejak refresh terakhir (updated_at),
+- punya pesanan yang keluar dari SKOR_JENDELA_HARI sejak refresh terakhir
+  (peluruhan saja tidak pernah mengurangkan pesanan itu), atau
+- terakhir dihitung ulang lebih dari SKOR_HITUNG_ULANG_HARI lalu, agar
+  pesanan yang dihapus ikut terkoreksi (rolling, tanpa cron `--penuh`).
+Peluruhan via UPDATE hanya sama dengan hitung ulang untuk pesanan yang tetap
+di dalam jendela dan tidak dihapus; selisih lain terkoreksi oleh aturan di
+atas. `--penuh` tetap tersedia untuk hitung ulang semua mobil sekaligus.
+"""
+import datetime
+
+import numpy as np
+from django.conf import settings
+from django.db.models import F, Max, Q
+from django.utils import timezone
+
+from pesanan.models import Pesanan
+from pesanan.utilisasi import STATUS_TERPAKAI
+from .models import Mobil, SkorMobil
+
+# Label marketing sebagai pengali skor (bukan lagi satu-satunya dasar urutan)
+BOOST_LABEL = {
+    'standard': 1.0,
+    'new': 1.3,
+    'recommended': 1.4,
+    'bestseller': 1.5,
+    'hotdeal': 1.6,
+}
+
+# Skor minimal sebelum boost: mobil baru tanpa pesanan tetap terangkat labelnya
+SKOR_DASAR = 1.0
+
+BOBOT_HARI = 0.5
+PEMBAGI_PENDAPATAN = 1_000_000
+
+KOMPONEN = ['pesanan', 'hari_tersewa', 'pendapatan', 'batal']
+
+
+def _half_life():
+    return getattr(settings, 'SKOR_HALF_LIFE_HARI', 30)
+
+
+def skor_permintaan(pesanan, hari_tersewa, pendapatan, batal):
+    """Berlaku untuk skalar maupun array NumPy."""
+    total = pesanan + batal
+    rasio_batal = np.divide(batal, total, out=np.zeros_like(np.asarray(total, dtype=np.float64)), where=total > 0)
+    return (pesanan + BOBOT_HARI * hari_tersewa + pendapatan / PEMBAGI_PENDAPATAN) * (1 - rasio_batal)
+
+
+def sinkron_label(mobil):
+    """Status / label Mobil berubah: salin ke baris skor tanpa menghitung ulang pesanan."""
+    boost = BOOST_LABEL.get(mobil.popularity, 1.0)
+    aktif = mobil.status == 'aktif'
+    diubah = SkorMobil.objects.filter(mobil_id=mobil.pk).update(
+        aktif=aktif, boost=boost, skor_akhir=(F('skor_permintaan') + SKOR_DASAR) * boost,
+    )
+    if not diubah:
+        SkorMobil.objects.create(mobil_id=mobil.pk, aktif=aktif, boost=boost, skor_akhir=SKOR_DASAR * boost)
+
+
+def _hitung_komponen(mobil_ids, sekarang):
+    """dict mobil_id -> dict komponen terluruh (1 query untuk semua mobil target)."""
+    rows = list(
+        Pesanan.objects.filter(
+            mobil_id__in=mobil_ids,
+            created_at__gte=sekarang - datetime.timedelta(days=getattr(settings, 'SKOR_JENDELA_HARI', 365)),
+        ).values_list('mobil_id', 'created_at', 'status', 'total_hari', 'harga_total')
+    )
+    urut_ids = sorted(mobil_ids)
+    hasil = {mobil_id: dict.fromkeys(KOMPONEN, 0.0) for mobil_id in urut_ids}
+    if not rows:
+        return hasil
+
+    n = len(rows)
+    idx = np.searchsorted(urut_ids, np.fromiter((r[0] for r in rows), dtype=np.int64, count=n))
+    umur_hari = np.fromiter(((sekarang - r[1]).total_seconds() / 86400 for r in rows), dtype=np.float64, count=n)
+    status = np.array([r[2] for r in rows])
+    total_hari = np.fromiter((r[3] for r in rows), dtype=np.float64, count=n)
+    harga = np.fromiter((r[4] for r in rows), dtype=np.float64, count=n)
+
+    bobot = 0.5 ** (np.maximum(umur_hari, 0) / _half_life())
+    batal = status == 'batal'
+    terpakai = np.isin(status, STATUS_TERPAKAI)
+    m = len(urut_ids)
+    komponen = {
+        'pesanan': np.bincount(idx, weights=bobot * ~batal, minlength=m),
+        'hari_tersewa': np.bincount(idx, weights=bobot * terpakai * total_hari, minlength=m),
+        'pendapatan': np.bincount(idx, weights=bobot * terpakai * harga, minlength=m),
+        'batal': np.bincount(idx, weights=bobot * batal, minlength=m),
+    }
+    for i, mobil_id in enumerate(urut_ids):
+        hasil[mobil_id] = {nama: float(komponen[nama][i]) for nama in KOMPONEN}
+    return hasil
+
+
+def perbarui_skor(penuh=False):
+    """Return jumlah mobil yang skornya dihitung ulang dari tabel pesanan."""
+    sekarang = timezone.now()
+    mobil = {mobil_id: (status, popularity) for mobil_id, status, popularity in
+             Mobil.objects.values_list('id', 'status', 'popularity')}
+    terakhir = SkorMobil.objects.aggregate(t=Max('dihitung_pada'))['t']
+
+    if penuh or terakhir is None:
+        target = set(mobil)
+    else:
+        # Pesanan yang berubah sejak refresh terakhir (termasuk pembatalan massal di expiry.py,
+        # yang ikut mengisi updated_at) + mobil yang belum punya baris skor
+        target = set(
+            Pesanan.objects.filter(updated_at__gt=terakhir).values_list('mobil_id', flat=True).distinct()
+        )
+        jendela = datetime.timedelta(days=getattr(settings, 'SKOR_JENDELA_HARI', 365))
+        target |= set(
+            Pesanan.objects.filter(created_at__gte=terakhir - jendela, created_at__lt=sekarang - jendela)
+            .values_list('mobil_id', flat=True).distinct()
+        )
+        batas_hitung_ulang = sekarang - datetime.timedelta(days=getattr(settings, 'SKOR_HITUNG_ULANG_HARI', 7))
+        target |= set(
+            SkorMobil.objects.filter(Q(dihitung_ulang_pada__isnull=True) | Q(dihitung_ulang_pada__lt=batas_hitung_ulang))
+            .values_list('mobil_id', flat=True)
+        )
+        target |= set(mobil) - set(SkorMobil.objects.values_list('mobil_id', flat=True))
+        target &= set(mobil)
+
+        faktor = 0.5 ** ((sekarang - terakhir).total_seconds() / 86400 / _half_life())
+        SkorMobil.objects.update(
+            **{nama: F(nama) * faktor for nama in KOMPONEN},
+            skor_permintaan=F('skor_permintaan') * faktor,
+            skor_akhir=(F('skor_permintaan') * faktor + SKOR_DASAR) * F('boost'),
+            dihitung_pada=sekarang,
+        )
+
+    if target:
+        komponen = _hitung_komponen(target, sekarang)
+        baris = []
+        for mobil_id, k in komponen.items():
+            status, popularity = mobil[mobil_id]
+            boost = BOOST_LABEL.get(popularity, 1.0)
+            permintaan = float(skor_permintaan(k['pesanan'], k['hari_tersewa'], k['pendapatan'], k['batal']))
+            baris.append(SkorMobil(
+                mobil_id=mobil_id, aktif=status == 'aktif', boost=boost, **k,
+                skor_permintaan=permintaan, skor_akhir=(permintaan + SKOR_DASAR) * boost,
+                dihitung_pada=sekarang, dihitung_ulang_pada=sekarang,
+            ))
+        SkorMobil.objects.bulk_create(
+            baris, batch_size=1000, update_conflicts=True, unique_fields=['mobil'],
+            update_fields=['aktif', 'boost', *KOMPONEN, 'skor_permintaan', 'skor_akhir', 'dihitung_pada',
+                           'dihitung_ulang_pada'],
+        )
+    return len(target)
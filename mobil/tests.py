@@ -1,3 +1,81 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+
+from .facets import hitung_facets
+
+
+def mobil(id, merk, transmisi, kursi=7, harga=350000, status='aktif', popularity='standard', dengan_supir=False):
+    """Satu baris snapshot armada (bentuk `snapshot_armada`)."""
+    return {
+        'id': id, 'merk': merk, 'transmisi': transmisi, 'kapasitas_kursi': kursi,
+        'harga_per_hari': Decimal(harga), 'status': status, 'popularity': popularity,
+        'dengan_supir': dengan_supir,
+    }
+
+
+ARMADA = [
+    mobil(1, 'Toyota', 'manual'),
+    mobil(2, 'Toyota', 'matic', harga=550000),
+    mobil(3, 'Honda', 'matic', kursi=5, harga=300000),
+    mobil(4, 'Honda', 'manual', kursi=5),
+    mobil(5, 'Daihatsu', 'manual', harga=325000),
+    mobil(6, 'Toyota', 'matic', harga=1200000, status='servis'),
+]
+
+
+def jumlah(hasil, facet):
+    return {item['nilai']: item['jumlah'] for item in hasil[facet]}
+
+
+class HitungFacetsTest(SimpleTestCase):
+    def test_tanpa_filter_hanya_mobil_aktif(self):
+        hasil = hitung_facets(ARMADA, {})
+
+        self.assertEqual(hasil['total'], 5)
+        self.assertEqual(jumlah(hasil, 'merk'), {'Toyota': 2, 'Honda': 2, 'Daihatsu': 1})
+        self.assertEqual(jumlah(hasil, 'transmisi'), {'manual': 3, 'matic': 2})
+
+    def test_facet_disjungtif_mengabaikan_filternya_sendiri(self):
+        hasil = hitung_facets(ARMADA, {'merk': 'toyota', 'transmisi': 'matic'})
+
+        self.assertEqual(hasil['total'], 1)
+        # Merk dihitung dengan filter transmisi saja -> pilihan merk lain tetap terlihat
+        self.assertEqual(jumlah(hasil, 'merk'), {'Toyota': 1, 'Honda': 1})
+        # Transmisi dihitung dengan filter merk saja
+        self.assertEqual(jumlah(hasil, 'transmisi'), {'manual': 1, 'matic': 1})
+        # Facet tanpa filter aktif memakai semua filter
+        self.assertEqual(jumlah(hasil, 'kapasitas_kursi'), {7: 1})
+
+    def test_bucket_harga_disjungtif(self):
+        # Facet harga dihitung tanpa filter harga itu sendiri
+        hasil = hitung_facets(ARMADA, {'max_harga': '400000', 'transmisi': 'manual'})
+
+        self.assertEqual(hasil['total'], 3)
+        self.assertEqual(
+            [(b['min'], b['max'], b['jumlah']) for b in hasil['harga']],
+            [(300000, 500000, 3)],
+        )
+        hasil = hitung_facets(ARMADA, {'min_harga': '500000'})
+        self.assertEqual(
+            [(b['min'], b['max'], b['jumlah']) for b in hasil['harga']],
+            [(300000, 500000, 4), (500000, 750000, 1)],
+        )
+        self.assertEqual(hasil['total'], 1)
+
+    def test_mobil_tidak_tersedia_dikecualikan(self):
+        hasil = hitung_facets(ARMADA, {'transmisi': 'matic'}, kecuali_ids=[2])
+
+        self.assertEqual(hasil['total'], 1)
+        self.assertEqual(jumlah(hasil, 'transmisi'), {'manual': 3, 'matic': 1})
+
+    def test_admin_melihat_semua_status(self):
+        hasil = hitung_facets(ARMADA, {'transmisi': 'matic'}, is_admin=True)
+
+        self.assertEqual(hasil['total'], 3)
+        self.assertEqual(jumlah(hasil, 'merk'), {'Toyota': 2, 'Honda': 1})
+
+    def test_parameter_angka_tidak_valid(self):
+        with self.assertRaises(ValidationError):
+            hitung_facets(ARMADA, {'min_kursi': 'tujuh'})
@@ -1,20 +1,28 @@
+from django.utils.dateparse import parse_date
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.utils import timezone # Pastikan import ini ada
-
 from .models import Mobil
 from .serializers import MobilSerializer, MobilListSerializer
-from pesanan.models import Pesanan 
+from .filters import filter_katalog
+from .cache import respon_katalog, snapshot_armada
+from .facets import hitung_facets
+from pesanan.availability import index_ketersediaan
+from pesanan.kalender import ENCODING_CHOICES, MAKS_HARI, kalender_armada
+from project.search import TrigramSearchFilter
+
+JUMLAH_REKOMENDASI = 12
+
 
 class MobilViewSet(viewsets.ModelViewSet):
     queryset = Mobil.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
     parser_classes = [MultiPartParser, FormParser]
     
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    # Search via index pg_trgm (?search_rank=1 untuk urut berdasarkan kemiripan)
+    filter_backends = [filters.OrderingFilter, TrigramSearchFilter]
     search_fields = ['nama_mobil', 'merk', 'plat_nomor']
     ordering_fields = ['harga_per_hari', 'created_at']
     
@@ -24,75 +32,93 @@ class MobilViewSet(viewsets.ModelViewSet):
         return MobilSerializer
     
     def get_queryset(self):
-        queryset = Mobil.objects.all()
-        user = self.request.user
-        
-        status_param = self.request.query_params.get('status')
-        if status_param:
-            queryset = queryset.filter(status=status_param)
-        else:
-            if not (user.is_authenticated and (user.is_staff or getattr(user, 'role', '') == 'admin')):
-                queryset = queryset.filter(status='aktif')
-        
-        merk = self.request.query_params.get('merk')
-        if merk:
-            queryset = queryset.filter(merk__icontains=merk)
-
-        transmisi = self.request.query_params.get('transmisi')
-        if transmisi:
-            queryset = queryset.filter(transmisi=transmisi)
-
-        min_kursi = self.request.query_params.get('min_kursi')
-        if min_kursi:
-            queryset = queryset.filter(kapasitas_kursi__gte=min_kursi)
-            
-        min_harga = self.request.query_params.get('min_harga')
-        max_harga = self.request.query_params.get('max_harga')
-        if min_harga:
-            queryset = queryset.filter(harga_per_hari__gte=min_harga)
-        if max_harga:
-            queryset = queryset.filter(harga_per_hari__lte=max_harga)
+        # Filter katalog (status, merk, transmisi, harga, dst.) ada di mobil/filters.py
+        return filter_katalog(Mobil.objects.all(), self.request.query_params, self.request.user)
 
-        popularity = self.request.query_params.get('popularity')
-        if popularity:
-            queryset = queryset.filter(popularity=popularity)
-        
-        dengan_supir = self.request.query_params.get('dengan_supir')
-        if dengan_supir is not None:
-            is_supir = dengan_supir.lower() in ['true', '1', 'yes']
-            queryset = queryset.filter(dengan_supir=is_supir)
+    def _is_admin(self):
+        user = self.request.user
+        return user.is_authenticated and (user.is_staff or getattr(user, 'role', '') == 'admin')
 
-        return queryset
+    def list(self, request, *args, **kwargs):
+        # Katalog publik di-cache per versi armada + ETag (lihat mobil/cache.py)
+        if self._is_admin():
+            return super().list(request, *args, **kwargs)
+        return respon_katalog(request, 'list', lambda: super(MobilViewSet, self).list(request, *args, **kwargs).data)
 
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
     def rekomendasi(self, request):
-        mobil_aktif = Mobil.objects.filter(status='aktif')
-        
-        # Ambil mobil selain standard
-        rekomendasi_qs = mobil_aktif.exclude(popularity='standard').order_by('-created_at')[:6]
-        
-        hasil_akhir = list(rekomendasi_qs)
-        if len(hasil_akhir) < 12:
-            sisa_slot = 12 - len(hasil_akhir)
-            standar = mobil_aktif.filter(popularity='standard').order_by('-created_at')[:sisa_slot]
-            hasil_akhir.extend(list(standar))
+        return respon_katalog(request, 'rekomendasi', lambda: self._rekomendasi(request))
+
+    def _rekomendasi(self, request):
+        # Top-K dari tabel skor (index aktif, -skor_akhir, -mobil), skor dihitung `manage.py hitung_skor_mobil`.
+        # Tie-break pakai skor__mobil_id (kolom index), bukan -id milik tabel mobil
+        hasil_akhir = (
+            Mobil.objects.filter(skor__aktif=True)
+            .order_by('-skor__skor_akhir', '-skor__mobil_id')[:JUMLAH_REKOMENDASI]
+        )
 
         # PENTING: Sertakan context agar URL gambar Cloudinary diproses sempurna
         serializer = MobilListSerializer(hasil_akhir, many=True, context={'request': request})
-        return Response(serializer.data)
+        return serializer.data
+
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    def facets(self, request):
+        """
+        Jumlah mobil per nilai filter untuk sidebar katalog (param filter sama dengan list).
+        Opsional `start` & `end` (YYYY-MM-DD): hanya mobil yang bebas di rentang itu.
+        """
+        params = request.query_params
+        is_admin = self._is_admin()
+        if 'start' in params or 'end' in params:
+            start = parse_date(params.get('start') or '')
+            end = parse_date(params.get('end') or '')
+            if not start or not end or start > end:
+                return Response({"error": "Parameter start & end wajib (YYYY-MM-DD), start <= end."}, status=400)
+            # Ketersediaan berubah mengikuti pesanan, bukan versi armada: tidak di-cache
+            terpakai = index_ketersediaan.mobil_terpakai(start, end)
+            return Response(hitung_facets(snapshot_armada(), params, is_admin, terpakai))
+
+        if is_admin:
+            return Response(hitung_facets(snapshot_armada(), params, is_admin))
+        return respon_katalog(request, 'facets', lambda: hitung_facets(snapshot_armada(), params))
+
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    def kalender(self, request):
+        """
+        Kalender sibuk banyak mobil sekaligus (pengganti 1 request `unavailable_dates` per mobil).
+        Param: `start` & `end` (YYYY-MM-DD, wajib), `ids` (mis. 1,2,3; default seluruh armada
+        yang terlihat), `encoding` = ranges | rle | bitset (lihat pesanan/kalender.py).
+        """
+        params = request.query_params
+        start = parse_date(params.get('start') or '')
+        end = parse_date(params.get('end') or '')
+        if not start or not end or start > end:
+            return Response({"error": "Parameter start & end wajib (YYYY-MM-DD), start <= end."}, status=400)
+        if (end - start).days + 1 > MAKS_HARI:
+            return Response({"error": f"Rentang maksimal {MAKS_HARI} hari."}, status=400)
+        encoding = params.get('encoding') or 'ranges'
+        if encoding not in ENCODING_CHOICES:
+            return Response({"error": f"encoding harus salah satu dari: {', '.join(ENCODING_CHOICES)}."}, status=400)
+
+        # Daftar mobil dari snapshot armada (cache per versi), bukan query tambahan
+        is_admin = self._is_admin()
+        terlihat = [m['id'] for m in snapshot_armada() if is_admin or m['status'] == 'aktif']
+        if params.get('ids'):
+            try:
+                mobil_ids = sorted({int(i) for i in params['ids'].split(',') if i.strip()})
+            except ValueError:
+                return Response({"error": "ids harus berupa daftar angka, mis. 1,2,3."}, status=400)
+            tidak_ada = sorted(set(mobil_ids) - set(terlihat))
+            if tidak_ada:
+                return Response({"error": f"Mobil tidak ditemukan: {', '.join(map(str, tidak_ada))}."}, status=400)
+        else:
+            mobil_ids = terlihat
+
+        return Response(kalender_armada(mobil_ids, start, end, encoding))
 
     @action(detail=True, methods=['get'], permission_classes=[AllowAny])
     def unavailable_dates(self, request, pk=None):
         mobil = self.get_object()
-        today = timezone.now().date()
-        
-        from django.db.models import Q
-        
-        bookings = Pesanan.objects.filter(
-            mobil=mobil
-        ).filter(
-            (Q(status__in=['pending', 'konfirmasi']) & Q(tanggal_mulai__gte=today)) |
-            (Q(status__in=['lunas', 'sedang_disewa', 'aktif']) & Q(tanggal_selesai__gte=today))
-        ).values('tanggal_mulai', 'tanggal_selesai')
         
-        return Response(list(bookings))
\ No newline at end of file
+        # Dijawab dari index ketersediaan in-memory (tanpa query ke tabel pesanan)
+        return Response(index_ketersediaan.jadwal_mobil(mobil.id))
\ No newline at end of file
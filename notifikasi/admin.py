@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import EmailOutbox
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'percobaan', 'kirim_setelah', 'created_at', 'terkirim_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('subject',)
+    readonly_fields = ('created_at', 'terkirim_at', 'error_terakhir')
+    # Isi email bisa berisi OTP / data pribadi: tidak ditampilkan di admin
+    exclude = ('pesan',)
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifikasi.outbox import kirim_semua
+
+
+class Command(BaseCommand):
+    help = "Kirim email yang mengantri di outbox (satu koneksi SMTP per batch)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Jalan terus sebagai worker (cek antrian setiap --interval detik).'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=10,
+            help='Jeda antar pengecekan dalam detik untuk mode --loop (default 10).'
+        )
+        parser.add_argument(
+            '--batch', type=int, default=None,
+            help='Jumlah email per batch (default OUTBOX_UKURAN_BATCH).'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            total = kirim_semua(options['batch'])
+            if total or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f"{total} email terkirim."))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
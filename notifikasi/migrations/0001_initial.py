@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:38
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255)),
+                ('pesan', models.TextField()),
+                ('pengirim', models.CharField(blank=True, default='', max_length=254)),
+                ('penerima', models.JSONField(default=list, help_text='List alamat email tujuan')),
+                ('status', models.CharField(choices=[('pending', 'Menunggu Dikirim'), ('terkirim', 'Terkirim'), ('gagal', 'Gagal Permanen')], default='pending', max_length=20)),
+                ('percobaan', models.PositiveSmallIntegerField(default=0)),
+                ('kirim_setelah', models.DateTimeField(default=django.utils.timezone.now, help_text='Jadwal percobaan berikutnya (backoff)')),
+                ('error_terakhir', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('terkirim_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Email Outbox',
+                'verbose_name_plural': 'Email Outbox',
+                'db_table': 'email_outbox',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'kirim_setelah'], name='email_outbo_status_15283f_idx')],
+            },
+        ),
+    ]
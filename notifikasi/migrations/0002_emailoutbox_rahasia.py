@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+def sensor_otp_lama(apps, schema_editor):
+    """Email OTP reset password yang sudah ada: tandai rahasia, hapus isinya jika sudah diproses."""
+    EmailOutbox = apps.get_model('notifikasi', 'EmailOutbox')
+    otp = EmailOutbox.objects.filter(subject__startswith='Kode Reset Password')
+    otp.update(rahasia=True)
+    otp.exclude(status='pending').update(pesan='[isi dihapus setelah diproses]')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifikasi', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='rahasia',
+            field=models.BooleanField(default=False, help_text='Isi pesan (mis. OTP) dihapus setelah terkirim / gagal permanen'),
+        ),
+        migrations.RunPython(sensor_otp_lama, migrations.RunPython.noop),
+    ]
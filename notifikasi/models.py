@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils import timezone
+
+class EmailOutbox(models.Model):
+    """
+    Antrian email (transactional outbox).
+    Ditulis dalam transaksi yang sama dengan perubahan data, lalu dikirim
+    oleh worker `manage.py kirim_outbox` (lihat outbox.py).
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Menunggu Dikirim'),
+        ('terkirim', 'Terkirim'),
+        ('gagal', 'Gagal Permanen'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    pesan = models.TextField()
+    pengirim = models.CharField(max_length=254, blank=True, default='')
+    penerima = models.JSONField(default=list, help_text="List alamat email tujuan")
+    rahasia = models.BooleanField(
+        default=False, help_text="Isi pesan (mis. OTP) dihapus setelah terkirim / gagal permanen"
+    )
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    percobaan = models.PositiveSmallIntegerField(default=0)
+    kirim_setelah = models.DateTimeField(default=timezone.now, help_text="Jadwal percobaan berikutnya (backoff)")
+    error_terakhir = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    terkirim_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'email_outbox'
+        ordering = ['-created_at']
+        verbose_name = 'Email Outbox'
+        verbose_name_plural = 'Email Outbox'
+        indexes = [
+            models.Index(fields=['status', 'kirim_setelah']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.penerima)} ({self.status})"
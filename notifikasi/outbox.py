@@ -0,0 +1,216 @@
+"""
+Transactional email outbox.
+
+- `antre_email()` hanya INSERT ke tabel email_outbox, dipanggil di dalam
+  transaksi yang sama dengan perubahan status (request tidak menunggu SMTP).
+- `kirim_batch()` mengklaim email yang jatuh tempo dalam transaksi singkat
+  (SELECT ... FOR UPDATE SKIP LOCKED, lalu `kirim_setelah` dimajukan selama
+  OUTBOX_KLAIM_DETIK), commit, baru mengirim lewat SATU koneksi SMTP di luar
+  transaksi: tidak ada row lock yang ditahan selama round-trip SMTP. Jika
+  worker mati di tengah jalan, klaimnya kedaluwarsa dan email diambil lagi.
+  Yang gagal dijadwalkan ulang dengan exponential backoff.
+- Email `rahasia=True` (OTP reset password) isinya dihapus begitu terkirim
+  atau gagal permanen; isi email juga tidak ditampilkan di admin.
+- Jika OUTBOX_KIRIM_OTOMATIS aktif, batch juga dipicu di thread latar setelah
+  commit (fallback jika worker `kirim_outbox` belum di-deploy).
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from project.instrumentasi import ukur
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# Pengganti isi email rahasia yang sudah selesai diproses
+PESAN_DISENSOR = '[isi dihapus setelah diproses]'
+
+_thread_lock = threading.Lock()
+_thread_berjalan = False
+
+
+def _setting(nama, default):
+    return getattr(settings, nama, default)
+
+
+# --- 1. ANTRI EMAIL ---
+
+def antre_email(subject, message, recipient_list, from_email=None, rahasia=False):
+    """
+    Pengganti `send_mail` yang tidak memblokir request.
+    `rahasia=True`: isi pesan dihapus dari outbox setelah terkirim / gagal permanen.
+    """
+    penerima = [email for email in recipient_list if email]
+    if not penerima:
+        return None
+
+    email = EmailOutbox.objects.create(
+        subject=subject,
+        pesan=message,
+        pengirim=from_email or settings.DEFAULT_FROM_EMAIL or '',
+        penerima=penerima,
+        rahasia=rahasia,
+    )
+    transaction.on_commit(picu_pengiriman)
+    return email
+
+
+def antre_email_massal(daftar_email):
+    """
+    Antri banyak email dalam satu INSERT.
+    `daftar_email`: iterable of dict(subject, message, recipient_list, from_email opsional).
+    """
+    objs = []
+    for item in daftar_email:
+        penerima = [email for email in item['recipient_list'] if email]
+        if not penerima:
+            continue
+        objs.append(EmailOutbox(
+            subject=item['subject'],
+            pesan=item['message'],
+            pengirim=item.get('from_email') or settings.DEFAULT_FROM_EMAIL or '',
+            penerima=penerima,
+        ))
+
+    if objs:
+        EmailOutbox.objects.bulk_create(objs)
+        transaction.on_commit(picu_pengiriman)
+    return len(objs)
+
+
+# --- 2. KIRIM BATCH (WORKER) ---
+
+def _jadwal_ulang(email, error):
+    email.percobaan += 1
+    email.error_terakhir = str(error)[:2000]
+    if email.percobaan >= _setting('OUTBOX_MAKS_PERCOBAAN', 5):
+        email.status = 'gagal'
+        return
+    # Exponential backoff: 30s, 60s, 120s, ... maksimal 1 jam
+    jeda = _setting('OUTBOX_BACKOFF_DETIK', 30) * (2 ** (email.percobaan - 1))
+    email.kirim_setelah = timezone.now() + timedelta(seconds=min(jeda, 3600))
+
+
+def _selesaikan(email):
+    """Email selesai diproses (terkirim / gagal permanen): buang isi email rahasia."""
+    if email.rahasia and email.status != 'pending':
+        email.pesan = PESAN_DISENSOR
+
+
+def _klaim(ukuran):
+    """Klaim batch dalam transaksi singkat; lock dilepas saat commit, sebelum SMTP."""
+    sekarang = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', kirim_setelah__lte=sekarang)
+            .order_by('kirim_setelah', 'id')[:ukuran]
+        )
+        if batch:
+            EmailOutbox.objects.filter(pk__in=[email.pk for email in batch]).update(
+                kirim_setelah=sekarang + timedelta(seconds=_setting('OUTBOX_KLAIM_DETIK', 300))
+            )
+    return batch
+
+
+def kirim_batch(ukuran=None):
+    """
+    Kirim satu batch email yang jatuh tempo.
+    Return tuple (terkirim, gagal).
+    """
+    ukuran = ukuran or _setting('OUTBOX_UKURAN_BATCH', 50)
+    terkirim = gagal = 0
+
+    batch = _klaim(ukuran)
+    if not batch:
+        return 0, 0
+
+    field_update = ['status', 'percobaan', 'kirim_setelah', 'error_terakhir', 'terkirim_at', 'pesan']
+    mulai = time.perf_counter()
+    koneksi = get_connection(fail_silently=False)
+    try:
+        with ukur('email'):
+            koneksi.open()
+    except Exception as e:
+        # SMTP down: seluruh batch dijadwalkan ulang
+        for email in batch:
+            _jadwal_ulang(email, e)
+            _selesaikan(email)
+        EmailOutbox.objects.bulk_update(batch, field_update)
+        logger.warning("Outbox: koneksi email gagal dibuka: %s", e)
+        return 0, len(batch)
+
+    try:
+        for email in batch:
+            try:
+                with ukur('email'):
+                    EmailMessage(
+                        subject=email.subject,
+                        body=email.pesan,
+                        from_email=email.pengirim or None,
+                        to=email.penerima,
+                        connection=koneksi,
+                    ).send()
+                email.status = 'terkirim'
+                email.terkirim_at = timezone.now()
+                email.error_terakhir = None
+                terkirim += 1
+            except Exception as e:
+                _jadwal_ulang(email, e)
+                gagal += 1
+            _selesaikan(email)
+    finally:
+        koneksi.close()
+        durasi_smtp = (time.perf_counter() - mulai) * 1000
+        # Hasil disimpan walau loop terputus; email yang belum tersentuh tetap
+        # pending dan diambil lagi setelah klaimnya kedaluwarsa
+        EmailOutbox.objects.bulk_update(batch, field_update)
+
+    # Worker / thread latar berjalan di luar request terukur: waktu SMTP dicatat di log
+    logger.info("Outbox: batch %s email, SMTP %.1fms", len(batch), durasi_smtp)
+    if gagal:
+        logger.warning("Outbox: %s terkirim, %s gagal (dijadwalkan ulang).", terkirim, gagal)
+    return terkirim, gagal
+
+
+def kirim_semua(ukuran=None):
+    """Kuras antrian yang jatuh tempo sampai habis. Return total terkirim."""
+    total = 0
+    while True:
+        terkirim, _ = kirim_batch(ukuran)
+        total += terkirim
+        if terkirim == 0:
+            return total
+
+
+# --- 3. FALLBACK THREAD LATAR ---
+
+def _kuras_di_latar():
+    global _thread_berjalan
+    try:
+        kirim_semua()
+    except Exception as e:
+        logger.warning("Outbox: pengiriman latar gagal: %s", e)
+    finally:
+        close_old_connections()
+        with _thread_lock:
+            _thread_berjalan = False
+
+
+def picu_pengiriman():
+    """Dipanggil on_commit. Maksimal satu thread pengirim per worker."""
+    global _thread_berjalan
+    if not _setting('OUTBOX_KIRIM_OTOMATIS', True):
+        return
+    with _thread_lock:
+        if _thread_berjalan:
+            return
+        _thread_berjalan = True
+    threading.Thread(target=_kuras_di_latar, name='outbox-sender', daemon=True).start()
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import EmailOutbox
+from .outbox import PESAN_DISENSOR, _klaim, antre_email, kirim_batch
+
+
+class BackendGagalKirim(BaseEmailBackend):
+    """Koneksi terbuka, tapi setiap email ditolak server."""
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('550 ditolak')
+
+
+class BackendGagalBuka(BaseEmailBackend):
+    """Server SMTP tidak bisa dihubungi."""
+
+    def open(self):
+        raise ConnectionRefusedError('SMTP down')
+
+    def send_messages(self, email_messages):
+        raise AssertionError('tidak boleh terkirim')
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    OUTBOX_KIRIM_OTOMATIS=False,
+    OUTBOX_BACKOFF_DETIK=30,
+    OUTBOX_MAKS_PERCOBAAN=3,
+)
+class KirimBatchTest(TestCase):
+    def _jatuh_tempo(self, email):
+        """Majukan waktu: jadwal ulang (backoff) dianggap sudah lewat."""
+        EmailOutbox.objects.filter(pk=email.pk).update(kirim_setelah=timezone.now() - timedelta(seconds=1))
+
+    def test_terkirim_dan_tidak_dikirim_ulang(self):
+        email = antre_email('Halo', 'isi', ['a@example.com'])
+
+        self.assertEqual(kirim_batch(), (1, 0))
+        self.assertEqual(kirim_batch(), (0, 0))
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'terkirim')
+        self.assertIsNotNone(email.terkirim_at)
+        self.assertEqual(email.pesan, 'isi')
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_isi_email_rahasia_dihapus_setelah_terkirim(self):
+        email = antre_email('Kode Reset Password', 'Kode OTP Anda adalah: 123456', ['a@example.com'], rahasia=True)
+
+        kirim_batch()
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'terkirim')
+        self.assertEqual(email.pesan, PESAN_DISENSOR)
+        self.assertIn('123456', mail.outbox[0].body)
+
+    @override_settings(EMAIL_BACKEND='notifikasi.tests.BackendGagalKirim')
+    def test_backoff_eksponensial_lalu_gagal_permanen(self):
+        email = antre_email('Kode Reset Password', 'OTP 123456', ['a@example.com'], rahasia=True)
+
+        jeda = []
+        for _ in range(2):
+            sebelum = timezone.now()
+            self.assertEqual(kirim_batch(), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual(email.status, 'pending')
+            self.assertIn('550', email.error_terakhir)
+            jeda.append((email.kirim_setelah - sebelum).total_seconds())
+            # Belum jatuh tempo: batch berikutnya tidak mengambilnya
+            self.assertEqual(kirim_batch(), (0, 0))
+            self._jatuh_tempo(email)
+
+        self.assertAlmostEqual(jeda[0], 30, delta=2)
+        self.assertAlmostEqual(jeda[1], 60, delta=2)
+        # Isi OTP tetap ada selama masih akan dicoba lagi
+        self.assertEqual(email.pesan, 'OTP 123456')
+
+        kirim_batch()
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'gagal')
+        self.assertEqual(email.percobaan, 3)
+        self.assertEqual(email.pesan, PESAN_DISENSOR)
+
+    @override_settings(EMAIL_BACKEND='notifikasi.tests.BackendGagalBuka')
+    def test_koneksi_gagal_menjadwalkan_ulang_seluruh_batch(self):
+        antre_email('A', 'isi', ['a@example.com'])
+        antre_email('B', 'isi', ['b@example.com'])
+
+        self.assertEqual(kirim_batch(), (0, 2))
+
+        for email in EmailOutbox.objects.all():
+            self.assertEqual(email.status, 'pending')
+            self.assertEqual(email.percobaan, 1)
+            self.assertGreater(email.kirim_setelah, timezone.now())
+
+    def test_email_yang_diklaim_tidak_diambil_worker_lain(self):
+        antre_email('A', 'isi', ['a@example.com'])
+
+        self.assertEqual(len(_klaim(10)), 1)
+        # Klaim di-commit sebelum SMTP: worker lain melihat jadwalnya sudah dimajukan
+        self.assertEqual(_klaim(10), [])
+
+    def test_email_tanpa_penerima_tidak_diantre(self):
+        self.assertIsNone(antre_email('Halo', 'isi', ['', None]))
+        self.assertFalse(EmailOutbox.objects.exists())
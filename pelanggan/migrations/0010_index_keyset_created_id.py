@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pelanggan', '0009_rename_bukti_ktp_pelanggan_foto_ktp'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pelanggan',
+            index=models.Index(fields=['created_at', 'id'], name='pelanggan_created_id_idx'),
+        ),
+    ]
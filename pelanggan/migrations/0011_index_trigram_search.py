@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:46
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pelanggan', '0010_index_keyset_created_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # pg_trgm untuk index GIN gin_trgm_ops (IF NOT EXISTS, aman diulang)
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='pelanggan',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nama'), name='gin_trgm_ops'), name='pelanggan_nama_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='pelanggan',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('ktp'), name='gin_trgm_ops'), name='pelanggan_ktp_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='pelanggan',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('no_hp'), name='gin_trgm_ops'), name='pelanggan_no_hp_trgm'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 import os   
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.conf import settings
 from users.validators import validate_indonesian_nik
 
@@ -59,6 +61,14 @@ class Pelanggan(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Pelanggan'
         verbose_name_plural = 'Data Pelanggan'
+        indexes = [
+            # Keyset pagination (created_at, id)
+            models.Index(fields=['created_at', 'id'], name='pelanggan_created_id_idx'),
+            # Search (icontains = UPPER(kolom) LIKE '%x%') via pg_trgm
+            GinIndex(OpClass(Upper('nama'), name='gin_trgm_ops'), name='pelanggan_nama_trgm'),
+            GinIndex(OpClass(Upper('ktp'), name='gin_trgm_ops'), name='pelanggan_ktp_trgm'),
+            GinIndex(OpClass(Upper('no_hp'), name='gin_trgm_ops'), name='pelanggan_no_hp_trgm'),
+        ]
 
     def __str__(self):
         tipe = "Online" if self.user else "Offline"
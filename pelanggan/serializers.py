@@ -21,7 +21,8 @@ class PelangganSerializer(serializers.ModelSerializer):
         read_only_fields = ['user', 'created_at', 'foto_ktp_url', 'foto_sim_url']
 
     def get_status_akun(self, obj):
-        return "Online" if obj.user else "Offline"
+        # Cukup cek FK-nya, tanpa memuat objek user (hindari N+1 di list)
+        return "Online" if obj.user_id else "Offline"
 
     # --- PERBAIKAN DI SINI ---
     # Nama method harus: get_<nama_field>
@@ -6,17 +6,20 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 from .models import Pelanggan
 from .serializers import PelangganSerializer
+from project.pagination import KeysetPagination
+from project.search import TrigramSearchFilter
 
 class PelangganViewSet(viewsets.ModelViewSet):
     queryset = Pelanggan.objects.all()
     serializer_class = PelangganSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination  # ?page= (lama) atau ?paginasi=cursor
     
     # --- TAMBAHKAN INI AGAR BISA TERIMA FILE GAMBAR ---
     parser_classes = (MultiPartParser, FormParser, JSONParser)
     
-    # Fitur Search untuk Admin (Cari nama/KTP)
-    filter_backends = [filters.SearchFilter]
+    # Fitur Search untuk Admin (Cari nama/KTP), dilayani index pg_trgm
+    filter_backends = [TrigramSearchFilter]
     search_fields = ['nama', 'ktp', 'no_hp']
 
     def get_queryset(self):
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pembayaran', '0002_initial'),
+        ('pesanan', '0006_index_keyset_created_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pembayaran',
+            index=models.Index(fields=['created_at', 'id'], name='pembayaran_created_id_idx'),
+        ),
+    ]
@@ -43,6 +43,10 @@ class Pembayaran(models.Model):
         db_table = 'pembayaran'
         verbose_name = 'Pembayaran'
         verbose_name_plural = 'Data Pembayaran'
+        indexes = [
+            # Keyset pagination (created_at, id)
+            models.Index(fields=['created_at', 'id'], name='pembayaran_created_id_idx'),
+        ]
 
     def __str__(self):
         return f"Pay for {self.pesanan.kode_booking} - {self.status}"
\ No newline at end of file
@@ -1,7 +1,11 @@
+import logging
+
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import Pembayaran
 
+logger = logging.getLogger(__name__)
+
 @receiver(post_save, sender=Pembayaran)
 def update_status_pesanan(sender, instance, created, **kwargs):
     """
@@ -18,14 +22,14 @@ def update_status_pesanan(sender, instance, created, **kwargs):
             if pesanan.status not in ['selesai', 'batal']:
                 pesanan.status = 'konfirmasi'
                 pesanan.save()
-                print(f"✅ SIGNAL: Pesanan {pesanan.kode_booking} otomatis di-update ke KONFIRMASI.")
+                logger.info("Pesanan %s otomatis di-update ke KONFIRMASI.", pesanan.kode_booking)
 
         # LOGIKA 2: Jika Pembayaran DITOLAK/GAGAL -> Pesanan kembali PENDING
         elif instance.status == 'gagal':
             if pesanan.status == 'konfirmasi':
                 pesanan.status = 'pending'
                 pesanan.save()
-                print(f"⚠️ SIGNAL: Pembayaran gagal. Pesanan {pesanan.kode_booking} kembali ke PENDING.")
+                logger.warning("Pembayaran gagal. Pesanan %s kembali ke PENDING.", pesanan.kode_booking)
                 
-    except Exception as e:
-        print(f"❌ SIGNAL ERROR: {e}")
\ No newline at end of file
+    except Exception:
+        logger.exception("Gagal sinkronisasi status pesanan dari pembayaran %s", instance.pk)
\ No newline at end of file
@@ -5,15 +5,20 @@ from rest_framework.exceptions import PermissionDenied
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Pembayaran
 from .serializers import PembayaranSerializer
+from project.idempotency import IdempotentCreateMixin
+from project.pagination import KeysetPagination
+from project.search import TrigramSearchFilter
 
-class PembayaranViewSet(viewsets.ModelViewSet):
+class PembayaranViewSet(IdempotentCreateMixin, viewsets.ModelViewSet):
+    # POST dengan header Idempotency-Key aman di-retry (lihat project/idempotency.py)
     queryset = Pembayaran.objects.all()
     serializer_class = PembayaranSerializer
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser] # Support Upload File (Gambar Bukti)
+    pagination_class = KeysetPagination  # ?page= (lama) atau ?paginasi=cursor
 
     # --- KONFIGURASI FILTER & SEARCH ---
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, TrigramSearchFilter]
     
     # Filter dropdown (misal: /api/pembayaran/?status=pending)
     filterset_fields = ['status', 'metode']
@@ -45,11 +50,8 @@ class PembayaranViewSet(viewsets.ModelViewSet):
         if user.is_staff or getattr(user, 'role', '') == 'admin':
             return base_qs.all()
         
-        # Cek jika Customer (Punya profil pelanggan)
-        if hasattr(user, 'pelanggan'):
-            return base_qs.filter(pesanan__pelanggan__user=user)
-            
-        return base_qs.none()
+        # Customer: lewat join ke profil pelanggan (tanpa profil -> hasil kosong)
+        return base_qs.filter(pesanan__pelanggan__user=user)
 
     def perform_create(self, serializer):
         """
@@ -1,9 +1,22 @@
 from django.contrib import admin
-from .models import Pesanan
+from .models import Pesanan, RiwayatPembatalanOtomatis, AkrualDenda
 
 @admin.register(Pesanan)
 class PesananAdmin(admin.ModelAdmin):
     list_display = ('kode_booking', 'pelanggan', 'mobil', 'tanggal_mulai', 'status', 'type_pesanan', 'harga_total')
     list_filter = ('status', 'type_pesanan', 'created_at')
     search_fields = ('kode_booking', 'pelanggan__nama')
-    readonly_fields = ('kode_booking', 'total_hari', 'harga_total', 'created_at')
\ No newline at end of file
+    readonly_fields = ('kode_booking', 'total_hari', 'harga_total', 'created_at')
+
+@admin.register(RiwayatPembatalanOtomatis)
+class RiwayatPembatalanOtomatisAdmin(admin.ModelAdmin):
+    list_display = ('dijalankan_pada', 'pemicu', 'jumlah_dibatalkan', 'durasi_ms')
+    list_filter = ('pemicu',)
+    readonly_fields = ('dijalankan_pada', 'pemicu', 'jumlah_dibatalkan', 'durasi_ms')
+
+@admin.register(AkrualDenda)
+class AkrualDendaAdmin(admin.ModelAdmin):
+    list_display = ('dihitung_pada', 'pesanan', 'jam_terlambat', 'tambahan_denda', 'total_denda')
+    search_fields = ('pesanan__kode_booking',)
+    readonly_fields = ('dihitung_pada', 'pesanan', 'jam_terlambat', 'tambahan_denda', 'total_denda')
+
@@ -1,6 +1,21 @@
+import logging
+
 from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 class PesananConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pesanan'
+
+    def ready(self):
+        # Signal untuk menjaga index ketersediaan tetap sinkron
+        import pesanan.signals
+
+        if not settings.DEBUG and 'LocMemCache' in settings.CACHES['default']['BACKEND']:
+            logger.warning(
+                "REDIS_URL tidak diisi: cache per proses (LocMem). Index ketersediaan & versi katalog "
+                "antar worker hanya sinkron lewat TTL (KETERSEDIAAN_INDEX_TTL, KATALOG_CACHE_TTL)."
+            )
@@ -0,0 +1,192 @@
+"""
+Index ketersediaan mobil (in-memory, per worker gunicorn).
+
+Menyimpan interval booking yang masih memblokir mobil (hari ini ke depan)
+per mobil, sehingga `cek_ketersediaan` dan `unavailable_dates` bisa dijawab
+tanpa query ke tabel `pesanan`.
+
+- Dibangun sekali dengan 1 query, lalu diperbarui incremental dari signal
+  `post_save` / `post_delete` Pesanan (setelah transaksi commit).
+- Antar worker disinkronkan lewat "generasi" di Django cache: setiap perubahan
+  menaikkan generasi, worker lain yang melihat generasi berbeda akan rebuild.
+  Generasi bersifat global, bukan per mobil: satu perubahan pesanan dari
+  worker mana pun membuat SEMUA worker me-rebuild seluruh index (1 query)
+  pada request berikutnya.
+  Sinkronisasi ini butuh cache bersama (Redis, settings 13. CACHE); tanpa
+  REDIS_URL (LocMem per proses) worker lain hanya melihat perubahan lewat
+  TTL rebuild yang dipendekkan.
+- Update massal (`queryset.update()`) tidak memicu signal, jadi pemanggilnya
+  wajib memanggil `index_ketersediaan.invalidasi()`.
+"""
+import datetime
+import threading
+import time
+from bisect import bisect_right, insort
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+# Status yang memblokir mobil (sama dengan logic cek_ketersediaan lama)
+# - Menunggu: hanya memblokir jika tanggal mulainya hari ini / masa depan
+# - Berjalan: memblokir selama masa sewanya belum lewat
+STATUS_MENUNGGU = ('pending', 'konfirmasi')
+STATUS_BERJALAN = ('lunas', 'sedang_disewa', 'aktif')
+STATUS_MEMBLOKIR = STATUS_MENUNGGU + STATUS_BERJALAN
+
+CACHE_KEY_GENERASI = 'pesanan:ketersediaan:generasi'
+
+
+def _generasi_bersama():
+    generasi = cache.get(CACHE_KEY_GENERASI)
+    if generasi is None:
+        cache.add(CACHE_KEY_GENERASI, 1, timeout=None)
+        generasi = cache.get(CACHE_KEY_GENERASI, 1)
+    return generasi
+
+
+def _naikkan_generasi():
+    try:
+        return cache.incr(CACHE_KEY_GENERASI)
+    except ValueError:
+        # Key belum ada / sudah ter-evict
+        cache.add(CACHE_KEY_GENERASI, 1, timeout=None)
+        return cache.incr(CACHE_KEY_GENERASI)
+
+
+def memblokir(status, tanggal_mulai, tanggal_selesai, today):
+    """Apakah sebuah booking masih dianggap memblokir mobil pada `today`."""
+    if status in STATUS_MENUNGGU:
+        return tanggal_mulai >= today
+    if status in STATUS_BERJALAN:
+        return tanggal_selesai >= today
+    return False
+
+
+class IndexKetersediaan:
+    def __init__(self):
+        self._lock = threading.RLock()
+        # mobil_id -> list[(tanggal_mulai, tanggal_selesai, pesanan_id, status)], urut tanggal_mulai
+        self._per_mobil = {}
+        # pesanan_id -> mobil_id (untuk update/hapus tanpa scan)
+        self._lokasi = {}
+        self._tanggal_bangun = None
+        self._waktu_bangun = 0.0
+        self._generasi = None
+
+    # --- 1. BUILD & SINKRONISASI ---
+
+    def _ttl(self):
+        return getattr(settings, 'KETERSEDIAAN_INDEX_TTL', 300)
+
+    def _bangun(self, today, generasi):
+        from .models import Pesanan
+
+        rows = Pesanan.objects.filter(
+            status__in=STATUS_MEMBLOKIR,
+            tanggal_selesai__gte=today,
+        ).values_list('id', 'mobil_id', 'tanggal_mulai', 'tanggal_selesai', 'status')
+
+        per_mobil = {}
+        lokasi = {}
+        for pesanan_id, mobil_id, mulai, selesai, status in rows:
+            per_mobil.setdefault(mobil_id, []).append((mulai, selesai, pesanan_id, status))
+            lokasi[pesanan_id] = mobil_id
+
+        for intervals in per_mobil.values():
+            intervals.sort()
+
+        self._per_mobil = per_mobil
+        self._lokasi = lokasi
+        self._tanggal_bangun = today
+        self._waktu_bangun = time.monotonic()
+        self._generasi = generasi
+
+    def _pastikan_segar(self):
+        today = timezone.now().date()
+        generasi = _generasi_bersama()
+        with self._lock:
+            basi = (
+                self._tanggal_bangun != today
+                or self._generasi != generasi
+                or time.monotonic() - self._waktu_bangun > self._ttl()
+            )
+            if basi:
+                self._bangun(today, generasi)
+        return today
+
+    def invalidasi(self):
+        """Paksa semua worker (termasuk worker ini) rebuild saat dibaca berikutnya."""
+        _naikkan_generasi()
+        with self._lock:
+            self._generasi = None
+
+    # --- 2. UPDATE INCREMENTAL (dipanggil dari signals) ---
+
+    def _hapus_lokal(self, pesanan_id):
+        mobil_id = self._lokasi.pop(pesanan_id, None)
+        if mobil_id is None:
+            return
+        intervals = self._per_mobil.get(mobil_id, [])
+        self._per_mobil[mobil_id] = [i for i in intervals if i[2] != pesanan_id]
+
+    def _terapkan(self, perubahan):
+        with self._lock:
+            # Dibaca & dinaikkan di dalam lock: thread lain di worker ini tidak bisa
+            # menyelip di antaranya dan membuat generasi lokal tampak tetap segar
+            generasi_lama = self._generasi
+            generasi_baru = _naikkan_generasi()
+            if self._tanggal_bangun is None:
+                # Belum pernah dibangun, nanti otomatis ikut saat build pertama
+                return
+            perubahan()
+            # Jika ada worker lain yang juga menulis di antaranya, lebih aman rebuild
+            if generasi_lama is not None and generasi_baru == generasi_lama + 1:
+                self._generasi = generasi_baru
+            else:
+                self._generasi = None
+
+    def perbarui(self, pesanan_id, mobil_id, tanggal_mulai, tanggal_selesai, status):
+        def perubahan():
+            self._hapus_lokal(pesanan_id)
+            if status in STATUS_MEMBLOKIR and tanggal_selesai >= self._tanggal_bangun:
+                insort(
+                    self._per_mobil.setdefault(mobil_id, []),
+                    (tanggal_mulai, tanggal_selesai, pesanan_id, status),
+                )
+                self._lokasi[pesanan_id] = mobil_id
+
+        self._terapkan(perubahan)
+
+    def hapus(self, pesanan_id):
+        self._terapkan(lambda: self._hapus_lokal(pesanan_id))
+
+    # --- 3. QUERY ---
+
+    def mobil_terpakai(self, start, end):
+        """Set mobil_id yang punya booking memblokir & overlap dengan [start, end]."""
+        today = self._pastikan_segar()
+        terpakai = set()
+        with self._lock:
+            for mobil_id, intervals in self._per_mobil.items():
+                # Hanya interval dengan tanggal_mulai <= end yang mungkin overlap
+                batas = bisect_right(intervals, (end, datetime.date.max))
+                for mulai, selesai, _, status in intervals[:batas]:
+                    if selesai >= start and memblokir(status, mulai, selesai, today):
+                        terpakai.add(mobil_id)
+                        break
+        return terpakai
+
+    def jadwal_mobil(self, mobil_id):
+        """Daftar tanggal sibuk satu mobil (format sama dengan response lama)."""
+        today = self._pastikan_segar()
+        with self._lock:
+            intervals = list(self._per_mobil.get(mobil_id, []))
+        return [
+            {'tanggal_mulai': mulai, 'tanggal_selesai': selesai}
+            for mulai, selesai, _, status in intervals
+            if memblokir(status, mulai, selesai, today)
+        ]
+
+
+index_ketersediaan = IndexKetersediaan()
@@ -0,0 +1,117 @@
+"""
+Akrual denda keterlambatan berdasarkan `Mobil.denda_per_jam`.
+
+Pesanan yang masih disewa (status 'aktif' / 'sedang_disewa') dan sudah lewat
+akhir hari `tanggal_selesai` (zona waktu lokal) dihitung ulang dendanya:
+    denda = jam terlambat * denda_per_jam
+Satu statement SQL (CTE): cari yang terlambat -> UPDATE denda -> INSERT riwayat
+`AkrualDenda` untuk baris yang bertambah. Tidak ada loop per baris di Python.
+
+Dijalankan oleh `python manage.py akrual_denda` (cron / worker `--loop`).
+Denda final tetap ditentukan saat admin menekan `selesai`.
+"""
+import datetime
+import logging
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Func, IntegerField
+from django.utils import timezone
+
+from mobil.models import Mobil
+from .expiry import ambil_advisory_lock
+from .models import AkrualDenda, Pesanan, STATUS_DISEWA
+
+logger = logging.getLogger(__name__)
+
+ADVISORY_LOCK_KEY = 720_431_002
+
+SQL_AKRUAL = """
+WITH terlambat AS (
+    SELECT p.id, p.denda AS denda_lama, m.denda_per_jam,
+           FLOOR(EXTRACT(EPOCH FROM (
+               %(sekarang)s - ((p.tanggal_selesai + 1)::timestamp AT TIME ZONE %(zona)s)
+           )) / 3600)::integer AS jam
+    FROM {pesanan} p
+    JOIN {mobil} m ON m.id = p.mobil_id
+    WHERE p.status = ANY(%(status)s) AND p.tanggal_selesai < %(hari_ini)s
+),
+diperbarui AS (
+    UPDATE {pesanan} p
+    SET denda = t.jam * t.denda_per_jam, updated_at = %(sekarang)s
+    FROM terlambat t
+    WHERE p.id = t.id AND t.jam * t.denda_per_jam > p.denda
+    RETURNING p.id, t.jam, t.denda_lama, p.denda
+),
+dicatat AS (
+    INSERT INTO {akrual} (pesanan_id, jam_terlambat, tambahan_denda, total_denda, dihitung_pada)
+    SELECT id, jam, denda - denda_lama, denda, %(sekarang)s FROM diperbarui
+    RETURNING tambahan_denda
+)
+SELECT COUNT(*), COALESCE(SUM(tambahan_denda), 0) FROM dicatat
+""".format(
+    pesanan=Pesanan._meta.db_table,
+    mobil=Mobil._meta.db_table,
+    akrual=AkrualDenda._meta.db_table,
+)
+
+
+def batas_kembali(tanggal_selesai):
+    """Batas pengembalian: akhir hari tanggal_selesai (00:00 hari berikutnya, waktu lokal)."""
+    return timezone.make_aware(
+        datetime.datetime.combine(tanggal_selesai + datetime.timedelta(days=1), datetime.time.min)
+    )
+
+
+def jam_terlambat(tanggal_selesai, sekarang=None):
+    """Versi Python dari perhitungan jam di SQL_AKRUAL (untuk tampilan)."""
+    selisih = (sekarang or timezone.now()) - batas_kembali(tanggal_selesai)
+    return max(int(selisih.total_seconds() // 3600), 0)
+
+
+class JamTerlambat(Func):
+    """Ekspresi ORM jam terlambat (rumus sama dengan SQL_AKRUAL), minimal 0."""
+    output_field = IntegerField()
+
+    def __init__(self, tanggal_selesai, sekarang, **extra):
+        self.sekarang = sekarang
+        super().__init__(tanggal_selesai, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql_tanggal, params = compiler.compile(self.source_expressions[0])
+        sql = (
+            "GREATEST(FLOOR(EXTRACT(EPOCH FROM (%s - ((" + sql_tanggal + " + 1)::timestamp AT TIME ZONE %s)))"
+            " / 3600), 0)::integer"
+        )
+        return sql, (self.sekarang, *params, settings.TIME_ZONE)
+
+
+def akrualkan_denda():
+    """
+    Return (jumlah pesanan yang dendanya bertambah, total tambahan denda),
+    atau None jika proses lain sedang berjalan.
+    """
+    mulai = time.monotonic()
+    sekarang = timezone.now()
+
+    with transaction.atomic():
+        if not ambil_advisory_lock(ADVISORY_LOCK_KEY):
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(SQL_AKRUAL, {
+                'sekarang': sekarang,
+                'zona': settings.TIME_ZONE,
+                'status': list(STATUS_DISEWA),
+                'hari_ini': timezone.localdate(sekarang),
+            })
+            jumlah, total_tambahan = cursor.fetchone()
+
+    if jumlah:
+        logger.info(
+            "Akrual denda: %s pesanan, tambahan Rp %s (%s ms).",
+            jumlah, total_tambahan, int((time.monotonic() - mulai) * 1000),
+        )
+    return jumlah, Decimal(total_tambahan)
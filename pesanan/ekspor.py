@@ -0,0 +1,169 @@
+"""
+Writer streaming untuk ekspor laporan (CSV & XLSX).
+
+Keduanya berupa generator yang menghasilkan potongan bytes baris demi baris,
+dipakai dengan StreamingHttpResponse + queryset.iterator() (server-side cursor
+di PostgreSQL), jadi memori tetap datar walau ekspor bertahun-tahun data.
+
+XLSX ditulis langsung sebagai ZIP streaming (tanpa openpyxl / tanpa membangun
+workbook di memori): sheet XML dikompres dan dikirim sambil jalan.
+"""
+import csv
+import datetime
+import re
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.utils import timezone
+
+# Karakter kontrol yang tidak valid di XML
+_KARAKTER_ILEGAL = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Awalan sel yang dieksekusi Excel / Sheets sebagai formula (CSV injection)
+_AWALAN_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+
+def format_nilai(nilai):
+    """Normalisasi nilai untuk CSV (datetime ke waktu lokal, None ke kosong)."""
+    if nilai is None:
+        return ''
+    if isinstance(nilai, datetime.datetime):
+        if timezone.is_aware(nilai):
+            nilai = timezone.localtime(nilai)
+        return nilai.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(nilai, datetime.date):
+        return nilai.isoformat()
+    return nilai
+
+
+# --- 1. CSV ---
+
+class _Echo:
+    """File-like object yang langsung mengembalikan data yang ditulis."""
+    def write(self, value):
+        return value
+
+
+def sel_csv(nilai):
+    """
+    format_nilai + netralisasi formula: teks berawalan = + - @ diberi awalan `'`
+    (nama pelanggan / catatan admin berasal dari input user). Angka dibiarkan.
+    """
+    nilai = format_nilai(nilai)
+    if isinstance(nilai, str) and nilai.startswith(_AWALAN_FORMULA):
+        return "'" + nilai
+    return nilai
+
+
+def stream_csv(header, rows):
+    writer = csv.writer(_Echo())
+    # BOM agar Excel membaca UTF-8 dengan benar
+    yield '﻿' + writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([sel_csv(v) for v in row])
+
+
+# --- 2. XLSX ---
+
+class _BufferStreaming:
+    """Target tulis ZipFile yang tidak bisa di-seek; isinya dikuras per potongan."""
+    def __init__(self):
+        self._potongan = []
+
+    def write(self, data):
+        self._potongan.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def kuras(self):
+        data = b''.join(self._potongan)
+        self._potongan = []
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    '<borders count="1"><border/></borders>'
+    '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+    '<cellXfs count="1"><xf xfId="0"/></cellXfs>'
+    '</styleSheet>'
+)
+
+
+def _workbook(nama_sheet):
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{escape(nama_sheet)}" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    )
+
+
+def _sel_xlsx(nilai):
+    if nilai is None or nilai == '':
+        return '<c/>'
+    if isinstance(nilai, bool):
+        return f'<c t="b"><v>{int(nilai)}</v></c>'
+    if isinstance(nilai, (int, float, Decimal)):
+        return f'<c><v>{nilai}</v></c>'
+    teks = _KARAKTER_ILEGAL.sub('', str(format_nilai(nilai)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(teks)}</t></is></c>'
+
+
+def stream_xlsx(header, rows, nama_sheet='Data', baris_per_potongan=500):
+    buffer = _BufferStreaming()
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _RELS)
+        zf.writestr('xl/workbook.xml', _workbook(nama_sheet))
+        zf.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        zf.writestr('xl/styles.xml', _STYLES)
+        yield buffer.kuras()
+
+        with zf.open('xl/worksheets/sheet1.xml', mode='w', force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(('<row>' + ''.join(_sel_xlsx(h) for h in header) + '</row>').encode('utf-8'))
+
+            for nomor, row in enumerate(rows, start=1):
+                sheet.write(('<row>' + ''.join(_sel_xlsx(v) for v in row) + '</row>').encode('utf-8'))
+                if nomor % baris_per_potongan == 0:
+                    data = buffer.kuras()
+                    if data:
+                        yield data
+
+            sheet.write(b'</sheetData></worksheet>')
+
+    yield buffer.kuras()
@@ -0,0 +1,74 @@
+"""
+Pembatalan otomatis pesanan kadaluarsa ('pending'/'konfirmasi' yang tanggal
+mulainya sudah lewat).
+
+Dijalankan oleh:
+- `python manage.py batalkan_pesanan_kadaluarsa` (cron / worker `--loop`)
+- Fallback `AutoCancelZombieOrdersMiddleware`, maksimal sekali per interval per worker
+
+Hanya satu sweep yang boleh jalan bersamaan (PostgreSQL advisory lock).
+"""
+import logging
+import time
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from rekap.services import catat_perubahan_status_massal
+from .availability import index_ketersediaan
+from .models import Pesanan, RiwayatPembatalanOtomatis
+
+logger = logging.getLogger(__name__)
+
+STATUS_KADALUARSA = ['pending', 'konfirmasi']
+
+# Kunci advisory lock PostgreSQL (angka bebas, asal unik di database ini)
+ADVISORY_LOCK_KEY = 720_431_001
+
+
+def ambil_advisory_lock(kunci=ADVISORY_LOCK_KEY):
+    """Transaction-level lock, otomatis lepas saat transaksi selesai."""
+    if connection.vendor != 'postgresql':
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [kunci])
+        return cursor.fetchone()[0]
+
+
+def batalkan_pesanan_kadaluarsa(pemicu='command'):
+    """
+    Batalkan pesanan kadaluarsa dalam satu UPDATE massal.
+
+    Return jumlah pesanan yang dibatalkan, atau None jika sweep lain
+    sedang berjalan (lock tidak didapat).
+    """
+    mulai = time.monotonic()
+    today = timezone.now().date()
+
+    with transaction.atomic():
+        if not ambil_advisory_lock():
+            return None
+
+        kadaluarsa = Pesanan.objects.filter(
+            status__in=STATUS_KADALUARSA,
+            tanggal_mulai__lt=today
+        )
+        # update() massal tidak memicu signal rekap, jadi selisihnya dicatat dulu
+        catat_perubahan_status_massal(kadaluarsa, 'batal')
+        jumlah = kadaluarsa.update(status='batal', updated_at=timezone.now())
+
+        # Fallback middleware jalan sering, jadi hanya dicatat jika ada yang dibatalkan
+        if jumlah > 0 or pemicu == 'command':
+            RiwayatPembatalanOtomatis.objects.create(
+                pemicu=pemicu,
+                jumlah_dibatalkan=jumlah,
+                durasi_ms=int((time.monotonic() - mulai) * 1000),
+            )
+
+        if jumlah > 0:
+            # update() massal tidak memicu signal, index harus di-refresh manual
+            transaction.on_commit(index_ketersediaan.invalidasi)
+
+    if jumlah > 0:
+        logger.info("%s pesanan kadaluarsa dibatalkan otomatis (%s).", jumlah, pemicu)
+    return jumlah
@@ -0,0 +1,91 @@
+"""
+Perhitungan harga sewa.
+
+Satu sumber rumus untuk create pesanan (`calculate_price`) dan endpoint
+`simulasi_harga`, supaya harga yang tampil di katalog = harga saat booking.
+"""
+from decimal import Decimal
+
+import numpy as np
+
+# Matriks dihitung dalam bilangan bulat agar eksak seperti Decimal:
+# subtotal dalam sen, potongan & total dalam 1e-6 rupiah (sen x persen 2 desimal)
+SEN_KE_MIKRO = 10_000
+BATAS_INT64 = 2 ** 63 - 1
+
+
+def durasi_sewa(tanggal_mulai, tanggal_selesai):
+    """Jumlah hari sewa (inklusif kedua ujung)."""
+    return (tanggal_selesai - tanggal_mulai).days + 1
+
+
+def hitung_harga(harga_mobil, harga_supir, durasi, promo=None):
+    """
+    Rincian harga satu pesanan.
+    `promo` harus sudah dicek validitasnya (`promo.is_valid`) oleh pemanggil.
+    """
+    subtotal = (harga_mobil + (harga_supir or 0)) * durasi
+    potongan = Decimal(promo.hitung_potongan(subtotal)) if promo else Decimal(0)
+    return {
+        'subtotal': subtotal,
+        'potongan': potongan,
+        'total': max(subtotal - potongan, Decimal(0)),
+    }
+
+
+def _sen(nilai):
+    """Rupiah (Decimal 2 desimal / int) -> int sen."""
+    return int(Decimal(nilai) * 100)
+
+
+def _rupiah(nilai, desimal):
+    """int dalam satuan 10^-desimal rupiah -> Decimal; 2 desimal jika pas."""
+    hasil = Decimal(int(nilai)).scaleb(-desimal)
+    ringkas = hasil.quantize(Decimal('0.01'))
+    return ringkas if ringkas == hasil else hasil
+
+
+def _potongan_matriks(subtotal, promo):
+    """Versi array dari `Promo.hitung_potongan` (subtotal dalam sen, hasil dalam 1e-6 rupiah)."""
+    if promo.tipe_diskon == 'nominal':
+        potongan = np.full_like(subtotal, _sen(promo.nilai_diskon) * SEN_KE_MIKRO)
+    elif promo.tipe_diskon == 'persen':
+        potongan = subtotal * _sen(promo.nilai_diskon)
+        if promo.max_potongan > 0:
+            potongan = np.minimum(potongan, _sen(promo.max_potongan) * SEN_KE_MIKRO)
+    else:
+        potongan = np.zeros_like(subtotal)
+    potongan = np.minimum(potongan, subtotal * SEN_KE_MIKRO)
+    return np.where(subtotal < _sen(promo.min_transaksi), 0, potongan)
+
+
+def matriks_harga(daftar_harga_mobil, daftar_rentang, harga_supir=0, promo=None):
+    """
+    Matriks harga [mobil][rentang], tiap sel sama dengan `hitung_harga`.
+    Subtotal = outer product (harga mobil + supir) x durasi, potongan promo &
+    total juga operasi array NumPy. Semua dalam int64 (sen / 1e-6 rupiah),
+    jadi eksak tanpa float; nilai yang bisa overflow memakai array objek
+    (int Python) dengan rumus yang sama.
+    """
+    daftar_durasi = [durasi_sewa(mulai, selesai) for mulai, selesai in daftar_rentang]
+    if not daftar_harga_mobil or not daftar_durasi:
+        return [[] for _ in daftar_harga_mobil]
+
+    harga_sen = [_sen(harga) + _sen(harga_supir or 0) for harga in daftar_harga_mobil]
+    pengali = SEN_KE_MIKRO
+    if promo and promo.tipe_diskon == 'persen':
+        pengali = max(pengali, _sen(promo.nilai_diskon))
+    aman = max(harga_sen) * max(daftar_durasi) * pengali <= BATAS_INT64
+    dtype = np.int64 if aman else object
+
+    subtotal = np.outer(np.array(harga_sen, dtype=dtype), np.array(daftar_durasi, dtype=dtype))
+    potongan = _potongan_matriks(subtotal, promo) if promo else np.zeros_like(subtotal)
+    total = np.maximum(subtotal * SEN_KE_MIKRO - potongan, 0)
+
+    return [
+        [
+            {'subtotal': _rupiah(s, 2), 'potongan': _rupiah(p, 6), 'total': _rupiah(t, 6)}
+            for s, p, t in zip(baris_subtotal, baris_potongan, baris_total)
+        ]
+        for baris_subtotal, baris_potongan, baris_total in zip(subtotal.tolist(), potongan.tolist(), total.tolist())
+    ]
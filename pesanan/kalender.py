@@ -0,0 +1,104 @@
+"""
+Kalender ketersediaan armada (banyak mobil sekaligus) untuk satu jendela tanggal.
+
+- 1 query: semua booking yang overlap jendela, urut (mobil_id, tanggal_mulai)
+  dari database, lalu satu sweep linear menggabungkan interval yang tumpang
+  tindih / bersambung (hari terakhir + 1 = hari mulai berikutnya) per mobil.
+- Booking dihitung sibuk jika statusnya terpakai (STATUS_TERPAKAI, termasuk
+  riwayat `selesai` untuk jendela di masa lalu) atau `pending` yang belum mulai
+  (sama dengan aturan `memblokir` di availability.py).
+- Tiga encoding response per mobil:
+    ranges : [["2026-11-01", "2026-11-03"], ...]  (inklusif)
+    rle    : [bebas, sibuk, bebas, ...] panjang run dalam hari, selalu diawali
+             run bebas (boleh 0), jumlahnya = jumlah hari jendela
+    bitset : hex, bit ke-i (LSB dulu per byte) = hari ke-i sejak `start` sibuk
+"""
+import datetime
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Pesanan
+from .utilisasi import STATUS_TERPAKAI
+
+ENCODING_CHOICES = ['ranges', 'rle', 'bitset']
+
+# Jendela maksimum satu request (hari)
+MAKS_HARI = 366
+
+
+def interval_sibuk(mobil_ids, start, end):
+    """
+    dict mobil_id -> list[(hari_mulai, hari_selesai)] sebagai offset hari dari
+    `start` (inklusif, sudah dipotong ke jendela), tergabung & tidak overlap.
+    """
+    today = timezone.localdate()
+    rows = (
+        Pesanan.objects.filter(
+            Q(status__in=STATUS_TERPAKAI) | Q(status='pending', tanggal_mulai__gte=today),
+            mobil_id__in=mobil_ids,
+            tanggal_mulai__lte=end,
+            tanggal_selesai__gte=start,
+        )
+        .order_by('mobil_id', 'tanggal_mulai')
+        .values_list('mobil_id', 'tanggal_mulai', 'tanggal_selesai')
+    )
+
+    n_hari = (end - start).days + 1
+    hasil = {mobil_id: [] for mobil_id in mobil_ids}
+    for mobil_id, mulai, selesai in rows.iterator(chunk_size=2000):
+        awal = max((mulai - start).days, 0)
+        akhir = min((selesai - start).days, n_hari - 1)
+        daftar = hasil[mobil_id]
+        # Input urut tanggal_mulai -> cukup bandingkan dengan interval terakhir
+        if daftar and awal <= daftar[-1][1] + 1:
+            if akhir > daftar[-1][1]:
+                daftar[-1] = (daftar[-1][0], akhir)
+        else:
+            daftar.append((awal, akhir))
+    return hasil
+
+
+def encode_ranges(intervals, start):
+    return [
+        [(start + datetime.timedelta(days=a)).isoformat(), (start + datetime.timedelta(days=b)).isoformat()]
+        for a, b in intervals
+    ]
+
+
+def encode_rle(intervals, n_hari):
+    runs = []
+    posisi = 0
+    for a, b in intervals:
+        runs.append(a - posisi)
+        runs.append(b - a + 1)
+        posisi = b + 1
+    if posisi < n_hari or not runs:
+        runs.append(n_hari - posisi)
+    return runs
+
+
+def encode_bitset(intervals, n_hari):
+    bits = bytearray((n_hari + 7) // 8)
+    for a, b in intervals:
+        for hari in range(a, b + 1):
+            bits[hari >> 3] |= 1 << (hari & 7)
+    return bits.hex()
+
+
+def kalender_armada(mobil_ids, start, end, encoding='ranges'):
+    n_hari = (end - start).days + 1
+    sibuk = interval_sibuk(mobil_ids, start, end)
+    if encoding == 'rle':
+        data = {mobil_id: encode_rle(iv, n_hari) for mobil_id, iv in sibuk.items()}
+    elif encoding == 'bitset':
+        data = {mobil_id: encode_bitset(iv, n_hari) for mobil_id, iv in sibuk.items()}
+    else:
+        data = {mobil_id: encode_ranges(iv, start) for mobil_id, iv in sibuk.items()}
+    return {
+        'start': start,
+        'end': end,
+        'hari': n_hari,
+        'encoding': encoding,
+        'mobil': data,
+    }
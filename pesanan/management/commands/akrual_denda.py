@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from pesanan.denda import akrualkan_denda
+
+
+class Command(BaseCommand):
+    help = "Hitung denda keterlambatan (denda_per_jam) untuk pesanan yang masih disewa melewati tanggal selesai."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Jalan terus sebagai worker (akrual setiap --interval detik).'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=900,
+            help='Jeda antar akrual dalam detik untuk mode --loop (default 900).'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            hasil = akrualkan_denda()
+            if hasil is None:
+                self.stdout.write(self.style.WARNING("Akrual lain sedang berjalan, dilewati."))
+            else:
+                jumlah, total_tambahan = hasil
+                self.stdout.write(self.style.SUCCESS(
+                    f"{jumlah} pesanan terlambat diperbarui, tambahan denda Rp {total_tambahan:,.0f}."
+                ))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,271 @@
+import datetime
+import json
+import math
+import re
+import sys
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import Resolver404, resolve
+from django.utils.dateparse import parse_date, parse_datetime
+
+# `INFO 2025-10-22 16:11:52,190 basehttp "GET /admin/ HTTP/1.1" 200 13328`
+RE_AKSES = re.compile(
+    r'^\w+ (?P<waktu>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),\d+ basehttp '
+    r'"(?P<method>[A-Z]+) (?P<path>\S+) [^"]*" (?P<status>\d{3}) (?P<bytes>\d+|-)'
+)
+# `INFO 2025-10-22 16:11:52,190 instrumentasi GET /api/mobil/ 200 12.3ms db=5/1.4ms`
+# (format `verbose` di settings LOGGING). Prefix level/waktu/modul opsional: log
+# yang dikumpulkan dari stdout platform bisa hanya berisi pesannya saja.
+RE_TIMING = re.compile(
+    r'^(?:\w+ (?P<waktu>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),\d+ instrumentasi )?'
+    r'(?P<method>[A-Z]+) (?P<path>/\S*) (?P<status>\d{3}) (?P<ms>[\d.]+)ms\b'
+)
+RE_REGEX_GROUP = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+RE_CONVERTER = re.compile(r'<(?:\w+:)?(\w+)>')
+RE_SEGMEN_ID = re.compile(r'/(\d+|[0-9a-fA-F-]{32,36})(?=/|$)')
+
+# Histogram log-bucket: lebar tiap bucket 5%, jadi memori per endpoint
+# terbatas (~300 bucket untuk 1 ms - 1 jam) dan galat persentil <= ~2.5%
+RASIO_BUCKET = 1.05
+LOG_RASIO = math.log(RASIO_BUCKET)
+
+
+@lru_cache(maxsize=4096)
+def normalisasi_path(path):
+    """`/api/mobil/8/unavailable_dates/?x=1` -> `/api/mobil/{pk}/unavailable_dates/`."""
+    path = path.split('?', 1)[0]
+    static_url = '/' + settings.STATIC_URL.strip('/') + '/'
+    if path.startswith(static_url):
+        return static_url + '*'
+    try:
+        route = resolve(path).route
+    except Resolver404:
+        return RE_SEGMEN_ID.sub('/{id}', path)
+    route = RE_REGEX_GROUP.sub(r'{\1}', route)
+    route = RE_CONVERTER.sub(r'{\1}', route)
+    return '/' + route.lstrip('^').rstrip('$')
+
+
+class StatEndpoint:
+    __slots__ = ('akses', 'bytes_akses', 'status_akses', 'sampel', 'bytes_sampel', 'status_sampel',
+                 'bucket', 'total_ms', 'maks_ms')
+
+    def __init__(self):
+        self.akses = self.bytes_akses = 0
+        self.sampel = self.bytes_sampel = 0
+        self.status_akses = {}
+        self.status_sampel = {}
+        self.bucket = {}
+        self.total_ms = self.maks_ms = 0.0
+
+    @staticmethod
+    def _catat_status(tabel, status):
+        kelas = f'{status // 100}xx'
+        tabel[kelas] = tabel.get(kelas, 0) + 1
+
+    def catat_akses(self, status, ukuran):
+        self.akses += 1
+        self.bytes_akses += ukuran
+        self._catat_status(self.status_akses, status)
+
+    def catat_timing(self, ms, status, ukuran=0):
+        self.sampel += 1
+        self.bytes_sampel += ukuran
+        self._catat_status(self.status_sampel, status)
+        self.total_ms += ms
+        self.maks_ms = max(self.maks_ms, ms)
+        idx = math.floor(math.log(ms) / LOG_RASIO) if ms > 0 else -1_000
+        self.bucket[idx] = self.bucket.get(idx, 0) + 1
+
+    def persentil(self, p):
+        if not self.sampel:
+            return None
+        target = p / 100 * self.sampel
+        kumulatif = 0
+        for idx in sorted(self.bucket):
+            kumulatif += self.bucket[idx]
+            if kumulatif >= target:
+                if idx == -1_000:
+                    return 0.0
+                # Titik tengah geometris bucket, tidak melebihi maksimum teramati
+                return min(RASIO_BUCKET ** (idx + 0.5), self.maks_ms)
+        return self.maks_ms
+
+    def hasil(self, endpoint):
+        # Jumlah request & bytes dari access log (lengkap); jika tidak ada
+        # (mis. di gunicorn), pakai baris timing yang ter-sampling
+        requests = self.akses or self.sampel
+        return {
+            'endpoint': endpoint,
+            'requests': requests,
+            'sampel_latency': self.sampel,
+            'p50_ms': _bulat(self.persentil(50)),
+            'p95_ms': _bulat(self.persentil(95)),
+            'p99_ms': _bulat(self.persentil(99)),
+            'rata2_ms': _bulat(self.total_ms / self.sampel) if self.sampel else None,
+            'maks_ms': _bulat(self.maks_ms) if self.sampel else None,
+            'bytes': self.bytes_akses if self.akses else self.bytes_sampel,
+            'status': self.status_akses if self.akses else self.status_sampel,
+        }
+
+
+def _bulat(nilai):
+    return None if nilai is None else round(nilai, 1)
+
+
+def _parse_batas(teks, akhir=False):
+    if not teks:
+        return None
+    waktu = parse_datetime(teks)
+    if waktu:
+        return waktu.replace(tzinfo=None)
+    tanggal = parse_date(teks)
+    if not tanggal:
+        raise CommandError(f"Format waktu tidak dikenal: {teks} (pakai YYYY-MM-DD atau YYYY-MM-DD HH:MM).")
+    return datetime.datetime.combine(tanggal, datetime.time.max if akhir else datetime.time.min)
+
+
+def _parse_json(baris):
+    """Baris log terstruktur (JSON per baris), field instrumentasi boleh di top-level atau di key `instrumentasi`."""
+    try:
+        data = json.loads(baris)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    data = {**data, **(data.get('instrumentasi') or {})}
+    if 'path' not in data or 'method' not in data:
+        return None
+    waktu = data.get('waktu') or data.get('asctime') or data.get('timestamp')
+    waktu = parse_datetime(str(waktu).replace(',', '.')) if waktu else None
+    return {
+        'waktu': waktu.replace(tzinfo=None) if waktu else None,
+        'method': data['method'],
+        'path': data['path'],
+        'status': int(data.get('status') or 0),
+        'ms': data.get('total_ms'),
+        'bytes': int(data.get('bytes') or 0),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Analisis log akses (baris `basehttp`, `instrumentasi`, atau JSON per baris): "
+        "p50/p95/p99 latency, jumlah request & bytes per endpoint. Dibaca streaming, memori konstan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', nargs='?', default=getattr(settings, 'LOG_FILE', None) or '-',
+                            help="File log (default settings LOG_FILE, '-' / tanpa LOG_FILE = stdin).")
+        parser.add_argument('--dari', help='Awal jendela waktu (YYYY-MM-DD atau YYYY-MM-DD HH:MM).')
+        parser.add_argument('--sampai', help='Akhir jendela waktu (YYYY-MM-DD atau YYYY-MM-DD HH:MM).')
+        parser.add_argument('--jam', type=float, help='Hanya N jam terakhir (relatif ke waktu sekarang).')
+        parser.add_argument('--tanpa-static', action='store_true', help='Abaikan request ke STATIC_URL.')
+        parser.add_argument('--urut', choices=['requests', 'p95', 'p99', 'bytes'], default='requests')
+        parser.add_argument('--limit', type=int, default=30)
+        parser.add_argument('--format', choices=['tabel', 'json'], default='tabel')
+
+    def handle(self, *args, **options):
+        dari = _parse_batas(options['dari'])
+        sampai = _parse_batas(options['sampai'], akhir=True)
+        if options['jam']:
+            dari = datetime.datetime.now() - datetime.timedelta(hours=options['jam'])
+
+        stat = {}
+        dibaca = cocok = 0
+        static_prefix = '/' + settings.STATIC_URL.strip('/') + '/'
+
+        sumber = sys.stdin if options['file'] == '-' else self._buka(options['file'])
+        try:
+            for baris in sumber:
+                dibaca += 1
+                entri = self._parse(baris)
+                if entri is None:
+                    continue
+                waktu = entri['waktu']
+                if waktu is not None and ((dari and waktu < dari) or (sampai and waktu > sampai)):
+                    continue
+                if options['tanpa_static'] and entri['path'].startswith(static_prefix):
+                    continue
+                cocok += 1
+                endpoint = f"{entri['method']} {normalisasi_path(entri['path'])}"
+                s = stat.get(endpoint)
+                if s is None:
+                    s = stat[endpoint] = StatEndpoint()
+                if entri['ms'] is None:
+                    s.catat_akses(entri['status'], entri['bytes'])
+                else:
+                    s.catat_timing(float(entri['ms']), entri['status'], entri['bytes'])
+        finally:
+            if sumber is not sys.stdin:
+                sumber.close()
+
+        hasil = [s.hasil(endpoint) for endpoint, s in stat.items()]
+        kunci = {
+            'requests': lambda h: h['requests'],
+            'p95': lambda h: h['p95_ms'] or 0,
+            'p99': lambda h: h['p99_ms'] or 0,
+            'bytes': lambda h: h['bytes'],
+        }[options['urut']]
+        hasil.sort(key=kunci, reverse=True)
+        hasil = hasil[:options['limit']]
+
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps({
+                'file': options['file'],
+                'jendela': {'dari': dari.isoformat() if dari else None, 'sampai': sampai.isoformat() if sampai else None},
+                'baris_dibaca': dibaca,
+                'baris_cocok': cocok,
+                'endpoint': hasil,
+            }, indent=2))
+            return
+
+        self._tabel(hasil)
+        self.stdout.write(f"\n{cocok} dari {dibaca} baris dianalisis, {len(stat)} endpoint.")
+        if stat and not any(s.sampel for s in stat.values()):
+            self.stdout.write(self.style.WARNING(
+                "Tidak ada data latency: baris `basehttp` tidak mencatat durasi. "
+                "Aktifkan log `project.instrumentasi` (INSTRUMENTASI_SAMPLE_RATE) untuk p50/p95/p99."
+            ))
+
+    def _buka(self, path):
+        try:
+            return open(path, encoding='utf-8', errors='replace')
+        except OSError as e:
+            raise CommandError(f"Tidak bisa membuka {path}: {e}")
+
+    def _parse(self, baris):
+        if baris.startswith('{'):
+            return _parse_json(baris)
+        m = RE_TIMING.match(baris)
+        if m:
+            ms, ukuran = m['ms'], 0
+        else:
+            m = RE_AKSES.match(baris)
+            if not m:
+                return None
+            ms, ukuran = None, 0 if m['bytes'] == '-' else int(m['bytes'])
+        return {
+            'waktu': datetime.datetime.strptime(m['waktu'], '%Y-%m-%d %H:%M:%S') if m['waktu'] else None,
+            'method': m['method'],
+            'path': m['path'],
+            'status': int(m['status']),
+            'ms': ms,
+            'bytes': ukuran,
+        }
+
+    def _tabel(self, hasil):
+        def fmt(nilai):
+            return '-' if nilai is None else f'{nilai:.1f}'
+
+        self.stdout.write(
+            f"{'ENDPOINT':<60} {'REQ':>7} {'SAMPEL':>7} {'P50ms':>8} {'P95ms':>8} {'P99ms':>8} {'MAKSms':>8} {'BYTES':>12}"
+        )
+        for h in hasil:
+            self.stdout.write(
+                f"{h['endpoint'][:60]:<60} {h['requests']:>7} {h['sampel_latency']:>7} "
+                f"{fmt(h['p50_ms']):>8} {fmt(h['p95_ms']):>8} {fmt(h['p99_ms']):>8} "
+                f"{fmt(h['maks_ms']):>8} {h['bytes']:>12}"
+            )
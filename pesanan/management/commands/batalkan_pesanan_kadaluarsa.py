@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from pesanan.expiry import batalkan_pesanan_kadaluarsa
+
+
+class Command(BaseCommand):
+    help = "Batalkan pesanan 'pending'/'konfirmasi' yang tanggal mulainya sudah lewat."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Jalan terus sebagai worker (sweep setiap --interval detik).'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=300,
+            help='Jeda antar sweep dalam detik untuk mode --loop (default 300).'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            jumlah = batalkan_pesanan_kadaluarsa(pemicu='command')
+            if jumlah is None:
+                self.stdout.write(self.style.WARNING("Sweep lain sedang berjalan, dilewati."))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{jumlah} pesanan kadaluarsa dibatalkan."))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,272 @@
+import datetime
+import json
+import statistics
+import subprocess
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from mobil.cache import naikkan_versi_katalog
+from mobil.models import Mobil
+from pesanan.models import Pesanan
+
+User = get_user_model()
+
+PASSWORD_BENCHMARK = 'benchmark-123'
+
+
+def _hari(n):
+    return (timezone.localdate() + datetime.timedelta(days=n)).isoformat()
+
+
+# Skenario per route. `budget` = batas jumlah query; melebihi -> suite gagal.
+# `dingin`: cache katalog (mobil/cache.py) dibuang sebelum tiap run terukur, supaya
+# query serializer tetap diukur (cache hit = 0 query, N+1 tidak akan terlihat).
+# `url_kwargs` / `params` / `data` boleh callable(ctx) agar nilainya dihitung per run.
+# Request customer/admin memakai header `Authorization: Bearer` sungguhan, jadi
+# budget-nya termasuk 1 query lookup user oleh JWTAuthentication.
+SKENARIO = [
+    # --- Katalog (publik) ---
+    {'nama': 'mobil-list', 'peran': 'anon', 'budget': 2, 'dingin': True},
+    {'nama': 'mobil-list', 'label': 'mobil-list (filter)', 'peran': 'anon', 'budget': 2, 'dingin': True,
+     'params': {'jenis': 'MPV', 'transmisi': 'matic', 'search': 'avanza'}},
+    {'nama': 'mobil-detail', 'peran': 'anon', 'budget': 1, 'url_kwargs': lambda ctx: {'pk': ctx['mobil_id']}},
+    {'nama': 'mobil-rekomendasi', 'peran': 'anon', 'budget': 1, 'dingin': True},
+    {'nama': 'mobil-facets', 'peran': 'anon', 'budget': 1, 'dingin': True, 'params': {'transmisi': 'matic'}},
+    {'nama': 'mobil-unavailable-dates', 'peran': 'anon', 'budget': 1,
+     'url_kwargs': lambda ctx: {'pk': ctx['mobil_id']}},
+    {'nama': 'mobil-kalender', 'label': 'mobil-kalender (armada)', 'peran': 'anon', 'budget': 1,
+     'params': lambda ctx: {'start': _hari(0), 'end': _hari(60), 'encoding': 'rle'}},
+    {'nama': 'pesanan-cek-ketersediaan', 'peran': 'anon', 'budget': 1,
+     'params': lambda ctx: {'start': _hari(7), 'end': _hari(10)}},
+    {'nama': 'pesanan-simulasi-harga', 'method': 'post', 'peran': 'anon', 'budget': 2,
+     'data': lambda ctx: {'mobil_ids': ctx['mobil_ids'][:10],
+                          'rentang': [{'tanggal_mulai': _hari(7), 'tanggal_selesai': _hari(9)}]}},
+    {'nama': 'promo-list', 'peran': 'anon', 'budget': 2},
+    {'nama': 'konten-public-hero', 'peran': 'anon', 'budget': 1},
+
+    # --- Auth ---
+    {'nama': 'auth_login', 'method': 'post', 'peran': 'anon', 'budget': 3,
+     'data': lambda ctx: {'username': ctx['customer'].username, 'password': PASSWORD_BENCHMARK}},
+    # Rotasi + blacklist simplejwt: cek blacklist, user, outstanding token lama & baru
+    {'nama': 'token_refresh', 'method': 'post', 'peran': 'anon', 'budget': 13,
+     'data': lambda ctx: {'refresh': str(RefreshToken.for_user(ctx['customer']))}},
+
+    # --- Customer ---
+    {'nama': 'pesanan-list', 'label': 'pesanan-list (customer)', 'peran': 'customer', 'budget': 3},
+    {'nama': 'pesanan-detail', 'label': 'pesanan-detail (customer)', 'peran': 'customer', 'budget': 3,
+     'url_kwargs': lambda ctx: {'pk': ctx['pesanan_id']}},
+    {'nama': 'pembayaran-list', 'label': 'pembayaran-list (customer)', 'peran': 'customer', 'budget': 3},
+
+    # --- Admin ---
+    {'nama': 'pesanan-list', 'label': 'pesanan-list (admin)', 'peran': 'admin', 'budget': 3},
+    {'nama': 'pesanan-list', 'label': 'pesanan-list (admin, search)', 'peran': 'admin', 'budget': 3,
+     'params': {'search': 'andi'}},
+    {'nama': 'pesanan-detail', 'label': 'pesanan-detail (admin)', 'peran': 'admin', 'budget': 3,
+     'url_kwargs': lambda ctx: {'pk': ctx['pesanan_id']}},
+    {'nama': 'pesanan-terlambat', 'peran': 'admin', 'budget': 3},
+    {'nama': 'pembayaran-list', 'label': 'pembayaran-list (admin)', 'peran': 'admin', 'budget': 3},
+    {'nama': 'pelanggan-list', 'peran': 'admin', 'budget': 3},
+    {'nama': 'supir-list', 'peran': 'admin', 'budget': 3},
+    {'nama': 'supir-ketersediaan', 'peran': 'admin', 'budget': 3,
+     'params': lambda ctx: {'start': _hari(7), 'end': _hari(10)}},
+    {'nama': 'user-list', 'peran': 'admin', 'budget': 3},
+    {'nama': 'admin-dashboard-stats', 'peran': 'admin', 'budget': 8},
+    {'nama': 'dashboard-report', 'peran': 'admin', 'budget': 4},
+    {'nama': 'utilisasi-armada', 'peran': 'admin', 'budget': 3},
+    {'nama': 'ekspor-pesanan', 'peran': 'admin', 'budget': 2,
+     'params': lambda ctx: {'dari': _hari(-30), 'sampai': _hari(0)}},
+]
+
+
+def _nilai(nilai, ctx):
+    return nilai(ctx) if callable(nilai) else nilai
+
+
+def _ukuran(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def _commit_git():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark endpoint API (waktu, jumlah query, ukuran response) terhadap data yang ada "
+        "(mis. hasil `seed_rental`). Gagal jika ada route yang melebihi budget query-nya."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ulang', type=int, default=5, help='Jumlah run terukur per route (setelah 1 run pemanasan).')
+        parser.add_argument('--hanya', help='Hanya route yang labelnya mengandung teks ini.')
+        parser.add_argument('--output', help='Tulis hasil JSON ke file ini.')
+        parser.add_argument('--bandingkan', help='File JSON hasil sebelumnya, tampilkan selisihnya.')
+
+    def handle(self, *args, **options):
+        skenario = [s for s in SKENARIO if not options['hanya'] or options['hanya'] in s.get('label', s['nama'])]
+        if not skenario:
+            raise CommandError("Tidak ada skenario yang cocok dengan --hanya.")
+
+        # Email ke locmem, host 'testserver' diizinkan
+        setup_test_environment()
+        try:
+            # Semua perubahan selama benchmark (user sementara, last_login,
+            # token blacklist, ...) di-rollback di akhir
+            with transaction.atomic():
+                hasil = self._jalankan(skenario, max(options['ulang'], 1))
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            teardown_test_environment()
+
+        laporan = {
+            'commit': _commit_git(),
+            'waktu': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'jumlah_pesanan': Pesanan.objects.count(),
+            'ulang': options['ulang'],
+            'route': hasil,
+        }
+        sebelumnya = self._baca_pembanding(options['bandingkan'])
+        self._tabel(hasil, sebelumnya)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(laporan, f, indent=2)
+            self.stdout.write(f"Hasil ditulis ke {options['output']}")
+
+        melebihi = [h for h in hasil if not h['lolos']]
+        if melebihi:
+            raise CommandError("Route gagal (budget query terlampaui / status error): " + ', '.join(
+                f"{h['label']} ({h['query']}/{h['budget']} query, status {h['status']})" for h in melebihi
+            ))
+        self.stdout.write(self.style.SUCCESS(f"Semua {len(hasil)} route dalam budget query."))
+
+    # --- 1. PERSIAPAN ---
+
+    def _konteks(self):
+        pesanan = (
+            Pesanan.objects.filter(pelanggan__user__isnull=False)
+            .select_related('pelanggan__user').order_by('-id').first()
+        )
+        if pesanan is None:
+            raise CommandError("Belum ada pesanan milik customer. Jalankan `manage.py seed_rental` dulu.")
+        customer = pesanan.pelanggan.user
+        customer.set_password(PASSWORD_BENCHMARK)
+        customer.save(update_fields=['password'])
+
+        admin = User.objects.create_user(
+            username='benchmark_admin', email='benchmark_admin@example.com',
+            role='admin', is_staff=True,
+        )
+        mobil_ids = list(Mobil.objects.filter(status='aktif').order_by('id').values_list('id', flat=True)[:50])
+        # Satu client per peran: handler & middleware (mis. sweep pesanan kadaluarsa
+        # yang dibatasi per interval) dibuat sekali, sama seperti worker sungguhan.
+        # Token JWT asli (bukan force_authenticate) agar lookup user ikut terhitung.
+        klien = {'anon': APIClient(), 'customer': APIClient(), 'admin': APIClient()}
+        klien['customer'].credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(customer)}')
+        klien['admin'].credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}')
+        return {
+            'klien': klien,
+            'customer': customer,
+            'admin': admin,
+            'pesanan_id': pesanan.pk,
+            'mobil_id': mobil_ids[0] if mobil_ids else pesanan.mobil_id,
+            'mobil_ids': mobil_ids or [pesanan.mobil_id],
+        }
+
+    # --- 2. EKSEKUSI ---
+
+    def _siapkan(self, s, ctx):
+        """Siapkan request di luar pengukuran (mis. membuat refresh token juga menulis ke DB)."""
+        client = ctx['klien'][s['peran']]
+        url = reverse(s['nama'], kwargs=_nilai(s.get('url_kwargs'), ctx))
+        method = s.get('method', 'get')
+        if method == 'get':
+            params = _nilai(s.get('params'), ctx) or {}
+            return lambda: client.get(url, params)
+        body = json.dumps(_nilai(s.get('data'), ctx) or {})
+        return lambda: client.generic(method.upper(), url, body, content_type='application/json')
+
+    def _jalankan(self, skenario, ulang):
+        ctx = self._konteks()
+        hasil = []
+        for s in skenario:
+            label = s.get('label', s['nama'])
+            self._siapkan(s, ctx)()  # pemanasan: index ketersediaan, sweep middleware, cache non-katalog
+
+            waktu, query, ukuran, status = [], [], 0, None
+            for _ in range(ulang):
+                kirim = self._siapkan(s, ctx)
+                if s.get('dingin'):
+                    naikkan_versi_katalog()
+                with CaptureQueriesContext(connection) as ctx_query:
+                    mulai = time.perf_counter()
+                    response = kirim()
+                    ukuran = _ukuran(response)
+                    waktu.append((time.perf_counter() - mulai) * 1000)
+                query.append(len(ctx_query))
+                status = response.status_code
+
+            hasil.append({
+                'label': label,
+                'route': s['nama'],
+                'method': s.get('method', 'get').upper(),
+                'status': status,
+                'median_ms': round(statistics.median(waktu), 2),
+                'min_ms': round(min(waktu), 2),
+                'maks_ms': round(max(waktu), 2),
+                'query': max(query),
+                'budget': s['budget'],
+                'bytes': ukuran,
+                'lolos': max(query) <= s['budget'] and status < 400,
+            })
+        return hasil
+
+    # --- 3. LAPORAN ---
+
+    def _baca_pembanding(self, path):
+        if not path:
+            return {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                return {h['label']: h for h in json.load(f)['route']}
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Tidak bisa membaca {path}: {e}")
+
+    def _tabel(self, hasil, sebelumnya):
+        self.stdout.write(
+            f"{'ROUTE':<34} {'STATUS':>6} {'MEDIAN ms':>10} {'QUERY':>11} {'BYTES':>10}  {'VS SEBELUMNYA':<20}"
+        )
+        for h in hasil:
+            lama = sebelumnya.get(h['label'])
+            banding = ''
+            if lama:
+                banding = f"{h['median_ms'] - lama['median_ms']:+.1f} ms, {h['query'] - lama['query']:+d} query"
+            baris = (
+                f"{h['label'][:34]:<34} {h['status']:>6} {h['median_ms']:>10.1f} "
+                f"{h['query']:>5}/{h['budget']:<5} {h['bytes']:>10}  {banding:<20}"
+            )
+            self.stdout.write(baris if h['lolos'] else self.style.ERROR(baris))
@@ -0,0 +1,74 @@
+import contextlib
+import datetime
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from mobil.models import Mobil
+from pelanggan.models import Pelanggan
+from promo.models import Promo
+from supir.models import Supir
+from pesanan.models import Pesanan
+from pesanan.serializers import PesananSerializer, PesananListSerializer
+from pesanan.views import PesananViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Bandingkan biaya per baris PesananSerializer (lama) vs PesananListSerializer "
+        "untuk endpoint list. Default memakai data in-memory; --db memakai data asli."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jumlah', type=int, default=10000, help='Jumlah pesanan (default 10000).')
+        parser.add_argument('--db', action='store_true', help='Ukur query + serialisasi dari database.')
+
+    # --- Data dummy in-memory (tanpa database) ---
+    def _data_dummy(self, jumlah):
+        now = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        mobil = Mobil(id=1, nama_mobil='Avanza', merk='Toyota', jenis='MPV', plat_nomor='BA 1234 XX',
+                      harga_per_hari=Decimal('350000'), created_at=now, updated_at=now)
+        supir = Supir(id=1, nama='Budi', no_hp='0812', created_at=now, updated_at=now)
+        promo = Promo(id=1, kode='HEMAT', nama_promo='Hemat', nilai_diskon=Decimal('50000'),
+                      berlaku_mulai=now, berlaku_sampai=now)
+        pelanggan = Pelanggan(id=1, nama='Andi', no_hp='0813', created_at=now)
+        hasil = []
+        for i in range(jumlah):
+            hasil.append(Pesanan(
+                id=i + 1, kode_booking=f'TRX-{i:06d}', pelanggan=pelanggan, mobil=mobil,
+                supir=supir, promo=promo,
+                tanggal_mulai=datetime.date(2025, 1, 1), tanggal_selesai=datetime.date(2025, 1, 3),
+                total_hari=3, harga_total=Decimal('1050000'), created_at=now,
+            ))
+        return hasil
+
+    def _ukur(self, label, ambil_data, serializer_class, pakai_db):
+        capture = CaptureQueriesContext(connection) if pakai_db else contextlib.nullcontext([])
+        with capture as queries:
+            mulai = time.perf_counter()
+            data = serializer_class(ambil_data(), many=True).data
+            durasi = time.perf_counter() - mulai
+        baris = max(len(data), 1)
+        self.stdout.write(
+            f"{label:<28} {len(data):>7} baris  {durasi * 1000:>9.1f} ms  "
+            f"{durasi * 1e6 / baris:>8.1f} us/baris  {len(queries)} query"
+        )
+        return durasi / baris
+
+    def handle(self, *args, **options):
+        jumlah = options['jumlah']
+
+        if options['db']:
+            base_qs = Pesanan.objects.select_related('pelanggan', 'mobil', 'supir', 'promo')
+            ambil_lama = lambda: list(base_qs[:jumlah])
+            ambil_baru = lambda: list(base_qs.only(*PesananViewSet.LIST_FIELDS)[:jumlah])
+        else:
+            dummy = self._data_dummy(jumlah)
+            ambil_lama = ambil_baru = lambda: dummy
+
+        lama = self._ukur('PesananSerializer (lama)', ambil_lama, PesananSerializer, options['db'])
+        baru = self._ukur('PesananListSerializer', ambil_baru, PesananListSerializer, options['db'])
+        self.stdout.write(self.style.SUCCESS(f"Biaya per baris turun {lama / baru:.1f}x"))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from project.idempotency import hapus_key_kadaluarsa
+
+
+class Command(BaseCommand):
+    help = "Hapus Idempotency-Key yang lebih tua dari IDEMPOTENCY_TTL."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Jalan terus sebagai worker (bersihkan setiap --interval detik).'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=3600,
+            help='Jeda antar pembersihan dalam detik untuk mode --loop (default 3600).'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            jumlah = hapus_key_kadaluarsa()
+            self.stdout.write(self.style.SUCCESS(f"{jumlah} Idempotency-Key kadaluarsa dihapus."))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,356 @@
+import datetime
+import heapq
+import math
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from mobil.cache import naikkan_versi_katalog
+from mobil.models import Mobil
+from mobil.skor import perbarui_skor
+from pelanggan.models import Pelanggan
+from pembayaran.models import Pembayaran
+from promo.models import Promo
+from rekap.services import rebuild as rebuild_rekap
+from supir.models import Supir
+from users.validators import validate_indonesian_nik
+from pesanan.availability import index_ketersediaan
+from pesanan.harga import hitung_harga
+from pesanan.models import Pesanan
+
+User = get_user_model()
+
+NAMA_DEPAN = ['Andi', 'Budi', 'Citra', 'Dewi', 'Eko', 'Fajar', 'Gita', 'Hendra', 'Indah', 'Joko',
+              'Kurnia', 'Lestari', 'Made', 'Nadia', 'Oki', 'Putri', 'Rahmat', 'Sari', 'Taufik', 'Wulan',
+              'Yusuf', 'Zainal', 'Rizky', 'Ayu', 'Fauzan', 'Nurul', 'Hadi', 'Mega', 'Arif', 'Dian']
+NAMA_BELAKANG = ['Saputra', 'Wijaya', 'Pratama', 'Lestari', 'Hidayat', 'Nasution', 'Siregar', 'Putra',
+                 'Santoso', 'Rahmawati', 'Syahputra', 'Harahap', 'Gunawan', 'Kusuma', 'Chaniago',
+                 'Piliang', 'Tanjung', 'Koto', 'Sikumbang', 'Jambak']
+# (merk, nama, jenis, kursi, transmisi, harga/hari)
+KATALOG_MOBIL = [
+    ('Toyota', 'Avanza', 'MPV', 7, 'manual', 350000),
+    ('Toyota', 'Innova Reborn', 'MPV', 7, 'matic', 550000),
+    ('Toyota', 'Fortuner', 'SUV', 7, 'matic', 1200000),
+    ('Toyota', 'Hiace Commuter', 'Minibus', 15, 'manual', 1300000),
+    ('Daihatsu', 'Xenia', 'MPV', 7, 'manual', 325000),
+    ('Daihatsu', 'Terios', 'SUV', 7, 'manual', 400000),
+    ('Honda', 'Brio', 'Hatchback', 5, 'matic', 300000),
+    ('Honda', 'HR-V', 'SUV', 5, 'matic', 600000),
+    ('Honda', 'City', 'Sedan', 5, 'matic', 500000),
+    ('Mitsubishi', 'Xpander', 'MPV', 7, 'matic', 450000),
+    ('Mitsubishi', 'Pajero Sport', 'SUV', 7, 'matic', 1300000),
+    ('Suzuki', 'Ertiga', 'MPV', 7, 'manual', 350000),
+    ('Isuzu', 'Elf', 'Minibus', 19, 'manual', 1100000),
+]
+PERUSAHAAN = ['PT Semen Padang', 'PT Bank Nagari', 'CV Minang Jaya', 'PT Pelindo Teluk Bayur',
+              'Dinas Pariwisata Sumbar', 'PT Andalas Konstruksi', 'Universitas Andalas']
+
+# Rata-rata siklus satu booking per mobil: durasi ~3 hari + jeda ~3 hari
+SIKLUS_RATA2_HARI = 6
+
+
+@contextmanager
+def waktu_manual(*models):
+    """Matikan auto_now/auto_now_add sementara agar created_at historis bisa diisi."""
+    fields = [
+        f for model in models for f in model._meta.concrete_fields
+        if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)
+    ]
+    lama = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in lama:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Isi database dengan data sintetis (user, pelanggan, mobil, supir, promo, pesanan, "
+        "pembayaran) untuk load testing. Deterministik dari --seed; pesanan tidak pernah bentrok."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pesanan', type=int, default=10000, help='Jumlah pesanan (default 10000).')
+        parser.add_argument('--pelanggan', type=int, default=2000)
+        parser.add_argument('--mobil', type=int, default=50,
+                            help='Jumlah mobil minimum; dinaikkan otomatis jika pesanan tidak muat di jendela waktu.')
+        parser.add_argument('--supir', type=int, default=30)
+        parser.add_argument('--promo', type=int, default=20)
+        parser.add_argument('--hari-lalu', type=int, default=730, help='Jendela riwayat (hari ke belakang).')
+        parser.add_argument('--hari-depan', type=int, default=60, help='Jendela booking mendatang.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='seed', help='Penanda data seed (username, plat, kode).')
+        parser.add_argument('--batch', type=int, default=5000, help='Ukuran batch bulk_create.')
+
+    def handle(self, *args, **options):
+        self.opsi = options
+        self.prefix = options['prefix'].lower()
+        self.kode = self.prefix.upper()[:4]
+        self.rng = np.random.default_rng(options['seed'])
+        self.today = timezone.localdate()
+        self.tz = timezone.get_current_timezone()
+        self.sekarang = timezone.now()
+
+        if User.objects.filter(username__startswith=f'{self.prefix}_').exists():
+            raise CommandError(
+                f"Data seed dengan prefix '{self.prefix}' sudah ada. Pakai --prefix lain atau database kosong."
+            )
+
+        jendela = options['hari_lalu'] + options['hari_depan']
+        kapasitas = max(jendela // SIKLUS_RATA2_HARI, 1)
+        n_mobil = max(options['mobil'], math.ceil(options['pesanan'] / kapasitas))
+        if n_mobil > options['mobil']:
+            self.stdout.write(f"Jumlah mobil dinaikkan ke {n_mobil} agar {options['pesanan']} pesanan muat "
+                              f"dalam {jendela} hari tanpa bentrok.")
+
+        mulai = time.perf_counter()
+        with transaction.atomic(), waktu_manual(User, Pelanggan, Mobil, Supir, Promo, Pesanan, Pembayaran):
+            pelanggan = self._langkah('pelanggan', self._buat_pelanggan, options['pelanggan'])
+            mobil = self._langkah('mobil', self._buat_mobil, n_mobil)
+            supir = self._langkah('supir', self._buat_supir, options['supir'])
+            promo = self._langkah('promo', self._buat_promo, options['promo'])
+            self._langkah('pesanan', self._buat_pesanan, options['pesanan'], pelanggan, mobil, supir, promo)
+
+        # bulk_create tidak memicu signal: sinkronkan rekap, skor rekomendasi, index ketersediaan & cache katalog
+        self._langkah('rekap', lambda: rebuild_rekap())
+        self._langkah('skor', lambda: perbarui_skor(penuh=True))
+        index_ketersediaan.invalidasi()
+        naikkan_versi_katalog()
+
+        self.stdout.write(self.style.SUCCESS(f"Seed selesai dalam {time.perf_counter() - mulai:.1f} detik."))
+
+    def _langkah(self, nama, fungsi, *args):
+        mulai = time.perf_counter()
+        hasil = fungsi(*args)
+        if isinstance(hasil, list):
+            hasil_teks = f" ({len(hasil)} baris)"
+        elif isinstance(hasil, int):
+            hasil_teks = f" ({hasil} baris)"
+        else:
+            hasil_teks = ''
+        self.stdout.write(f"  {nama:<10}{hasil_teks} {time.perf_counter() - mulai:.1f} detik")
+        return hasil
+
+    def _bulk(self, model, objs):
+        return model.objects.bulk_create(objs, batch_size=self.opsi['batch'])
+
+    def _waktu(self, tanggal, detik):
+        return datetime.datetime.combine(tanggal, datetime.time(), tzinfo=self.tz) + datetime.timedelta(seconds=int(detik))
+
+    def _nama(self, i):
+        return f"{NAMA_DEPAN[i % len(NAMA_DEPAN)]} {NAMA_BELAKANG[(i // len(NAMA_DEPAN)) % len(NAMA_BELAKANG)]}"
+
+    # --- 1. MASTER DATA ---
+
+    def _nik(self, i, lahir, wanita):
+        """PP KK CC (kode wilayah, unik per blok 10.000) + DDMMYY (+40 wanita) + nomor urut."""
+        blok, urut = divmod(i, 10000)
+        hari = lahir.day + (40 if wanita else 0)
+        nik = f"{130101 + blok:06d}{hari:02d}{lahir.month:02d}{lahir.year % 100:02d}{urut:04d}"
+        validate_indonesian_nik(nik)
+        return nik
+
+    def _buat_pelanggan(self, jumlah):
+        rng = self.rng
+        password = make_password('rental123', salt=f'{self.prefix}{self.opsi["seed"]}')
+        awal = self.today - datetime.timedelta(days=self.opsi['hari_lalu'])
+        daftar = rng.integers(0, self.opsi['hari_lalu'] + 1, jumlah)
+        detik = rng.integers(0, 86400, jumlah)
+        online = rng.random(jumlah) < 0.7
+        lahir = rng.integers(0, (datetime.date(2005, 12, 31) - datetime.date(1960, 1, 1)).days, jumlah)
+        wanita = rng.random(jumlah) < 0.5
+
+        users = []
+        for i in range(jumlah):
+            if online[i]:
+                dibuat = self._waktu(awal + datetime.timedelta(days=int(daftar[i])), detik[i])
+                nama = self._nama(i).split()
+                users.append(User(
+                    username=f'{self.prefix}_u{i}', email=f'{self.prefix}_u{i}@example.com',
+                    first_name=nama[0], last_name=nama[1], role='customer',
+                    password=password, date_joined=dibuat,
+                ))
+        users = iter(self._bulk(User, users))
+
+        objs = []
+        for i in range(jumlah):
+            dibuat = self._waktu(awal + datetime.timedelta(days=int(daftar[i])), detik[i])
+            objs.append(Pelanggan(
+                user=next(users) if online[i] else None,
+                nama=self._nama(i),
+                no_hp=f'08{1200000000 + i:010d}',
+                alamat='Padang, Sumatera Barat',
+                ktp=self._nik(i, datetime.date(1960, 1, 1) + datetime.timedelta(days=int(lahir[i])), wanita[i]),
+                created_at=dibuat, updated_at=dibuat,
+            ))
+        return self._bulk(Pelanggan, objs)
+
+    def _buat_mobil(self, jumlah):
+        # Semua mobil sudah terdaftar sebelum jendela riwayat dimulai
+        dibuat = self._waktu(self.today - datetime.timedelta(days=self.opsi['hari_lalu'] + 1), 8 * 3600)
+        model = self.rng.integers(0, len(KATALOG_MOBIL), jumlah)
+        status = self.rng.choice(['aktif', 'servis', 'nonaktif'], jumlah, p=[0.9, 0.07, 0.03])
+        objs = []
+        for i in range(jumlah):
+            merk, nama, jenis, kursi, transmisi, harga = KATALOG_MOBIL[model[i]]
+            objs.append(Mobil(
+                nama_mobil=nama, merk=merk, jenis=jenis, kapasitas_kursi=kursi, transmisi=transmisi,
+                plat_nomor=f'BA {i} {self.kode}', tahun=2015 + i % 10,
+                harga_per_hari=Decimal(harga), dengan_supir=kursi >= 15,
+                status=str(status[i]), created_at=dibuat, updated_at=dibuat,
+            ))
+        return self._bulk(Mobil, objs)
+
+    def _buat_supir(self, jumlah):
+        dibuat = self._waktu(self.today - datetime.timedelta(days=self.opsi['hari_lalu'] + 1), 8 * 3600)
+        objs = [
+            Supir(
+                nama=self._nama(i * 7 + 3), no_hp=f'08{1300000000 + i:010d}',
+                harga_per_hari=Decimal(150000 + (i % 3) * 25000),
+                status='off' if i % 10 == 9 else 'tersedia',
+                created_at=dibuat, updated_at=dibuat,
+            )
+            for i in range(jumlah)
+        ]
+        return self._bulk(Supir, objs)
+
+    def _buat_promo(self, jumlah):
+        objs = []
+        for i in range(jumlah):
+            mulai = self.today - datetime.timedelta(days=int(self.rng.integers(0, self.opsi['hari_lalu'] + 1)))
+            dibuat = self._waktu(mulai, 0)
+            persen = i % 2 == 0
+            objs.append(Promo(
+                kode=f'{self.kode}{i:04d}', nama_promo=f'Promo {i}',
+                tipe_diskon='persen' if persen else 'nominal',
+                nilai_diskon=Decimal(10 + (i % 3) * 5) if persen else Decimal(50000 + (i % 4) * 25000),
+                max_potongan=Decimal(200000) if persen else Decimal(0),
+                berlaku_mulai=dibuat, berlaku_sampai=dibuat + datetime.timedelta(days=90),
+                created_at=dibuat, updated_at=dibuat,
+            ))
+        return self._bulk(Promo, objs)
+
+    # --- 2. PESANAN & PEMBAYARAN ---
+
+    def _jadwal(self, jumlah, n_mobil):
+        """
+        Rentang tanggal per mobil, berurutan tanpa overlap (vektor NumPy).
+        Return (idx_mobil, mulai, selesai) dengan tanggal sebagai offset hari dari awal jendela.
+        """
+        rng = self.rng
+        per_mobil = math.ceil(jumlah / n_mobil)
+        idx_mobil = np.repeat(np.arange(n_mobil), per_mobil)[:jumlah]
+        durasi = np.minimum(rng.geometric(0.35, jumlah), 14)
+        jeda = rng.integers(0, 2 * SIKLUS_RATA2_HARI - 5, jumlah)
+        siklus = durasi + jeda
+
+        # Offset kumulatif di dalam tiap mobil: cumsum global dikurangi cumsum di awal mobil
+        kumulatif = np.cumsum(siklus)
+        awal_grup = np.minimum(np.searchsorted(idx_mobil, np.arange(n_mobil)), jumlah - 1)
+        dasar = (kumulatif - siklus)[awal_grup]
+        mulai = kumulatif - siklus - dasar[idx_mobil] + jeda + rng.integers(0, 7, n_mobil)[idx_mobil]
+        return idx_mobil, mulai, mulai + durasi - 1
+
+    def _penugasan_supir(self, perlu, mulai, selesai, n_supir):
+        """Sweep urut tanggal mulai + min-heap tanggal bebas supir, jadi supir tidak pernah bentrok."""
+        hasil = np.full(len(mulai), -1, dtype=np.int64)
+        if not n_supir:
+            return hasil
+        bebas = [(-1, s) for s in range(n_supir) if s % 10 != 9]  # supir 'off' tidak ditugaskan
+        heapq.heapify(bebas)
+        for i in np.flatnonzero(perlu)[np.argsort(mulai[perlu], kind='stable')]:
+            if bebas and bebas[0][0] < mulai[i]:
+                _, s = heapq.heapreplace(bebas, (int(selesai[i]), bebas[0][1]))
+                hasil[i] = s
+        return hasil
+
+    def _buat_pesanan(self, jumlah, pelanggan, mobil, supir, promo):
+        rng = self.rng
+        awal = self.today - datetime.timedelta(days=self.opsi['hari_lalu'])
+        hari_ini = self.opsi['hari_lalu']
+
+        idx_mobil, mulai, selesai = self._jadwal(jumlah, len(mobil))
+        dengan_supir = np.array([m.dengan_supir for m in mobil], dtype=bool)[idx_mobil]
+        perlu_supir = dengan_supir | (rng.random(jumlah) < 0.15)
+        idx_supir = self._penugasan_supir(perlu_supir, mulai, selesai, len(supir))
+        idx_pelanggan = rng.integers(0, len(pelanggan), jumlah)
+        idx_promo = np.where(rng.random(jumlah) < 0.1, rng.integers(0, max(len(promo), 1), jumlah), -1)
+        if not promo:
+            idx_promo[:] = -1
+        lead = rng.integers(0, 21, jumlah)
+        detik = rng.integers(6 * 3600, 22 * 3600, jumlah)
+        acak = rng.random(jumlah)
+        korporat = rng.random(jumlah) < 0.05
+        offline = rng.random(jumlah) < 0.25
+        metode_cash = rng.random(jumlah) < 0.2
+
+        # Status mengikuti posisi tanggal terhadap hari ini
+        status = np.where(
+            selesai < hari_ini, np.where(acak < 0.85, 'selesai', 'batal'),
+            np.where(mulai <= hari_ini, np.where(acak < 0.9, 'aktif', 'batal'),
+                     np.where(acak < 0.5, 'konfirmasi', np.where(acak < 0.8, 'pending', 'batal'))),
+        )
+
+        pemakaian_promo = {}
+        total_pembayaran = 0
+        for awal_batch in range(0, jumlah, self.opsi['batch']):
+            objs = []
+            for i in range(awal_batch, min(awal_batch + self.opsi['batch'], jumlah)):
+                m = mobil[idx_mobil[i]]
+                s = supir[idx_supir[i]] if idx_supir[i] >= 0 else None
+                p = promo[idx_promo[i]] if idx_promo[i] >= 0 else None
+                tgl_mulai = awal + datetime.timedelta(days=int(mulai[i]))
+                tgl_selesai = awal + datetime.timedelta(days=int(selesai[i]))
+                durasi = int(selesai[i] - mulai[i]) + 1
+                harga = hitung_harga(m.harga_per_hari, s.harga_per_hari if s else 0, durasi, p)
+                if p:
+                    pemakaian_promo[p.pk] = pemakaian_promo.get(p.pk, 0) + 1
+                dibuat = min(self._waktu(tgl_mulai - datetime.timedelta(days=int(lead[i])), detik[i]), self.sekarang)
+                objs.append(Pesanan(
+                    kode_booking=f'{self.kode}-{i:010d}',
+                    pelanggan=pelanggan[idx_pelanggan[i]], mobil=m, supir=s, promo=p,
+                    tanggal_mulai=tgl_mulai, tanggal_selesai=tgl_selesai, total_hari=durasi,
+                    harga_total=harga['total'], status=str(status[i]),
+                    type_pesanan='offline' if offline[i] else 'online',
+                    is_corporate=bool(korporat[i]),
+                    perusahaan_nama=PERUSAHAAN[i % len(PERUSAHAAN)] if korporat[i] else None,
+                    created_at=dibuat, updated_at=dibuat,
+                ))
+            objs = self._bulk(Pesanan, objs)
+            total_pembayaran += len(self._bulk(Pembayaran, self._pembayaran(objs, acak, metode_cash, awal_batch)))
+
+        for p in promo:
+            p.sudah_digunakan = pemakaian_promo.get(p.pk, 0)
+        Promo.objects.bulk_update(promo, ['sudah_digunakan'], batch_size=self.opsi['batch'])
+        self.stdout.write(f"  pembayaran ({total_pembayaran} baris)")
+        return jumlah
+
+    def _pembayaran(self, daftar_pesanan, acak, metode_cash, offset):
+        objs = []
+        for j, p in enumerate(daftar_pesanan):
+            r = acak[offset + j]
+            if p.status in ('konfirmasi', 'aktif', 'selesai'):
+                status = 'lunas'
+            elif p.status == 'pending' and r < 0.65:
+                status = 'pending'
+            elif p.status == 'batal' and r >= 0.95:
+                status = 'gagal'
+            else:
+                continue
+            dibayar = min(p.created_at + datetime.timedelta(hours=2), self.sekarang)
+            objs.append(Pembayaran(
+                pesanan=p, jumlah=p.harga_total, status=status,
+                metode='cash' if metode_cash[offset + j] else 'transfer',
+                created_at=dibayar, updated_at=dibayar,
+            ))
+        return objs
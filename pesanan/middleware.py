@@ -1,33 +1,46 @@
-from django.utils import timezone
-from .models import Pesanan
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+from .expiry import batalkan_pesanan_kadaluarsa
+
+logger = logging.getLogger(__name__)
 
 class AutoCancelZombieOrdersMiddleware:
+    """
+    Fallback pembatalan pesanan zombie jika scheduler belum di-deploy.
+
+    Sweep utama ada di `manage.py batalkan_pesanan_kadaluarsa`. Middleware ini
+    hanya menjalankan sweep yang sama maksimal sekali per
+    PESANAN_EXPIRY_FALLBACK_INTERVAL detik per worker (0 = nonaktif).
+    """
     def __init__(self, get_response):
         self.get_response = get_response
+        self._lock = threading.Lock()
+        self._terakhir_jalan = None
+
+    def _perlu_jalan(self, interval):
+        sekarang = time.monotonic()
+        with self._lock:
+            if self._terakhir_jalan is not None and sekarang - self._terakhir_jalan < interval:
+                return False
+            self._terakhir_jalan = sekarang
+            return True
 
     def __call__(self, request):
-        # --- LOGIKA AUTO CANCEL ---
         # Kita jalankan ini hanya jika request mengarah ke API (agar efisien)
         # dan hanya method GET (saat user mengambil data)
-        if request.path.startswith('/api/') and request.method == 'GET':
-            try:
-                today = timezone.now().date()
-                
-                # Update massal (Query SQL langsung, sangat cepat)
-                # Cari yang 'pending'/'konfirmasi' TAPI tanggal mulainya < hari ini
-                rows_updated = Pesanan.objects.filter(
-                    status__in=['pending', 'konfirmasi'],
-                    tanggal_mulai__lt=today
-                ).update(status='batal')
-                
-                # Opsional: Print di terminal backend kalau ada yang dicancel (untuk debug)
-                if rows_updated > 0:
-                    print(f"Middleware: {rows_updated} pesanan zombie dibatalkan otomatis.")
-                    
-            except Exception as e:
-                # Jangan sampai error di sini bikin website down
-                print(f"Middleware Error: {e}")
+        interval = getattr(settings, 'PESANAN_EXPIRY_FALLBACK_INTERVAL', 600)
+        if interval and request.path.startswith('/api/') and request.method == 'GET':
+            if self._perlu_jalan(interval):
+                try:
+                    batalkan_pesanan_kadaluarsa(pemicu='middleware')
+                except Exception as e:
+                    # Jangan sampai error di sini bikin website down
+                    logger.warning("Middleware auto-cancel gagal: %s", e)
 
         # Lanjutkan request ke view yang dituju
         response = self.get_response(request)
-        return response
\ No newline at end of file
+        return response
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pesanan', '0003_pesanan_bukti_ktp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RiwayatPembatalanOtomatis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pemicu', models.CharField(choices=[('command', 'Management Command / Scheduler'), ('middleware', 'Fallback Middleware')], default='command', max_length=20)),
+                ('jumlah_dibatalkan', models.PositiveIntegerField(default=0)),
+                ('durasi_ms', models.PositiveIntegerField(default=0)),
+                ('dijalankan_pada', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Riwayat Pembatalan Otomatis',
+                'verbose_name_plural': 'Riwayat Pembatalan Otomatis',
+                'db_table': 'pesanan_pembatalan_otomatis',
+                'ordering': ['-dijalankan_pada'],
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:37
+
+import django.contrib.postgres.constraints
+import pesanan.models
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+STATUS_BLOKIR = ['pending', 'konfirmasi', 'lunas', 'sedang_disewa', 'aktif']
+
+
+def cek_jadwal_bentrok(apps, schema_editor):
+    """
+    Tolak migrasi jika data lama sudah bentrok; AddConstraint akan gagal dengan
+    error PostgreSQL yang sulit dibaca. Sengaja TIDAK memindahkan pesanan ke
+    status lain secara otomatis: yang "kalah" bisa saja sudah lunas, jadi admin
+    harus memutuskan sendiri (batalkan / ganti mobil / ganti supir) lalu ulangi migrate.
+    """
+    Pesanan = apps.get_model('pesanan', 'Pesanan')
+    rows = Pesanan.objects.filter(status__in=STATUS_BLOKIR).order_by('tanggal_mulai', 'id').values_list(
+        'kode_booking', 'mobil_id', 'supir_id', 'tanggal_mulai', 'tanggal_selesai'
+    )
+
+    bentrok = []
+    terakhir = {}  # (jenis, id) -> (kode_booking, tanggal_selesai) yang paling jauh
+    for kode, mobil_id, supir_id, mulai, selesai in rows:
+        for kunci in (('mobil', mobil_id), ('supir', supir_id)):
+            if kunci[1] is None:
+                continue
+            sebelumnya = terakhir.get(kunci)
+            # Rentang inklusif: selesai == mulai berikutnya sudah dianggap bentrok
+            if sebelumnya and mulai <= sebelumnya[1]:
+                bentrok.append(f"{kunci[0]} #{kunci[1]}: {sebelumnya[0]} & {kode}")
+            if not sebelumnya or selesai > sebelumnya[1]:
+                terakhir[kunci] = (kode, selesai)
+
+    if bentrok:
+        raise RuntimeError(
+            "Pesanan aktif dengan jadwal bentrok, selesaikan dulu sebelum migrate:\n  "
+            + "\n  ".join(bentrok)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobil', '0006_alter_mobil_gambar'),
+        ('pelanggan', '0009_rename_bukti_ktp_pelanggan_foto_ktp'),
+        ('pesanan', '0004_riwayatpembatalanotomatis'),
+        ('promo', '0002_remove_promo_nominal_potongan_promo_kuota_and_more'),
+        ('supir', '0001_initial'),
+    ]
+
+    operations = [
+        # btree_gist dibutuhkan agar kolom integer (mobil_id/supir_id) bisa masuk index GiST
+        BtreeGistExtension(),
+        migrations.RunPython(cek_jadwal_bentrok, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='pesanan',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('status__in', ['pending', 'konfirmasi', 'lunas', 'sedang_disewa', 'aktif'])), expressions=[('mobil', '='), (pesanan.models.RentangTanggal('tanggal_mulai', 'tanggal_selesai'), '&&')], name='pesanan_mobil_tidak_bentrok', violation_error_message='Mobil tidak tersedia pada tanggal tersebut.'),
+        ),
+        migrations.AddConstraint(
+            model_name='pesanan',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('status__in', ['pending', 'konfirmasi', 'lunas', 'sedang_disewa', 'aktif']), ('supir__isnull', False)), expressions=[('supir', '='), (pesanan.models.RentangTanggal('tanggal_mulai', 'tanggal_selesai'), '&&')], name='pesanan_supir_tidak_bentrok', violation_error_message='Supir sedang bertugas di tanggal tersebut.'),
+        ),
+    ]
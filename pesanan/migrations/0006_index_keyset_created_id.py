@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobil', '0006_alter_mobil_gambar'),
+        ('pelanggan', '0010_index_keyset_created_id'),
+        ('pesanan', '0005_exclusion_constraint_jadwal'),
+        ('promo', '0002_remove_promo_nominal_potongan_promo_kuota_and_more'),
+        ('supir', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pesanan',
+            index=models.Index(fields=['created_at', 'id'], name='pesanan_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:46
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobil', '0007_index_trigram_search'),
+        ('pelanggan', '0011_index_trigram_search'),
+        ('pesanan', '0006_index_keyset_created_id'),
+        ('promo', '0002_remove_promo_nominal_potongan_promo_kuota_and_more'),
+        ('supir', '0001_initial'),
+    ]
+
+    operations = [
+        # pg_trgm untuk index GIN gin_trgm_ops (IF NOT EXISTS, aman diulang)
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='pesanan',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('kode_booking'), name='gin_trgm_ops'), name='pesanan_kode_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='pesanan',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('perusahaan_nama'), name='gin_trgm_ops'), name='pesanan_perusahaan_trgm'),
+        ),
+    ]
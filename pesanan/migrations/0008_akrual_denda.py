@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobil', '0007_index_trigram_search'),
+        ('pelanggan', '0011_index_trigram_search'),
+        ('pesanan', '0007_index_trigram_search'),
+        ('promo', '0002_remove_promo_nominal_potongan_promo_kuota_and_more'),
+        ('supir', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AkrualDenda',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jam_terlambat', models.PositiveIntegerField()),
+                ('tambahan_denda', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('total_denda', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('dihitung_pada', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Akrual Denda',
+                'verbose_name_plural': 'Riwayat Akrual Denda',
+                'db_table': 'pesanan_akrual_denda',
+                'ordering': ['-dihitung_pada'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pesanan',
+            index=models.Index(condition=models.Q(('status__in', ['aktif', 'sedang_disewa'])), fields=['tanggal_selesai'], name='pesanan_disewa_selesai_idx'),
+        ),
+        migrations.AddField(
+            model_name='akrualdenda',
+            name='pesanan',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='akrual_denda', to='pesanan.pesanan'),
+        ),
+    ]
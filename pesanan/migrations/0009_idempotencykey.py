@@ -0,0 +1,38 @@
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Ambil alih IdempotencyKey dari app users (hanya state, tabel sudah ada)."""
+
+    dependencies = [
+        ('pesanan', '0008_akrual_denda'),
+        ('users', '0004_pindah_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='IdempotencyKey',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('pemilik', models.CharField(help_text="ID user atau 'anon'", max_length=64)),
+                        ('scope', models.CharField(help_text='Nama ViewSet', max_length=100)),
+                        ('key', models.CharField(help_text='SHA-256 dari header Idempotency-Key', max_length=64)),
+                        ('sidik', models.CharField(help_text='SHA-256 isi request', max_length=64)),
+                        ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                        ('data', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                        ('headers', models.JSONField(blank=True, default=dict)),
+                        ('created_at', models.DateTimeField(auto_now_add=True)),
+                    ],
+                    options={
+                        'db_table': 'idempotency_key',
+                        'indexes': [models.Index(fields=['created_at'], name='idempotency_created_ed22e2_idx')],
+                        'constraints': [models.UniqueConstraint(fields=('pemilik', 'scope', 'key'), name='idempotency_key_unik')],
+                    },
+                ),
+            ],
+            database_operations=[],
+        ),
+    ]
@@ -1,5 +1,11 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import Func, Q, Value
 from django.core.exceptions import ValidationError
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, RangeOperators
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 from pelanggan.models import Pelanggan
 from mobil.models import Mobil
 from supir.models import Supir
@@ -9,6 +15,50 @@ import string
 import urllib.parse
 from datetime import timedelta
 
+# Status yang memblokir jadwal mobil/supir (dijaga oleh exclusion constraint)
+STATUS_BLOKIR_JADWAL = ['pending', 'konfirmasi', 'lunas', 'sedang_disewa', 'aktif']
+
+# Status saat mobil sedang dibawa pelanggan (dasar akrual denda keterlambatan)
+STATUS_DISEWA = ['aktif', 'sedang_disewa']
+
+CONSTRAINT_BENTROK_MOBIL = 'pesanan_mobil_tidak_bentrok'
+CONSTRAINT_BENTROK_SUPIR = 'pesanan_supir_tidak_bentrok'
+
+
+class RentangTanggal(Func):
+    """DATERANGE(mulai, selesai, '[]') -> rentang inklusif di kedua ujung (sewa harian)."""
+    function = 'DATERANGE'
+    output_field = DateRangeField()
+
+    def __init__(self, mulai, selesai, **extra):
+        super().__init__(mulai, selesai, Value('[]'), **extra)
+
+
+class SelisihHari(Func):
+    """
+    (tanggal_a - tanggal_b) dalam hari; di PostgreSQL date - date = integer.
+    Hanya PostgreSQL: di SQLite operator `-` pada teks tanggal mengurangkan
+    angka tahunnya saja, hasilnya bukan jumlah hari.
+    """
+    template = '(%(expressions)s)'
+    arg_joiner = ' - '
+    output_field = models.IntegerField()
+
+
+def jenis_bentrok(error):
+    """
+    Terjemahkan IntegrityError dari exclusion constraint jadi 'mobil' / 'supir'.
+    Return None jika error bukan karena bentrok jadwal.
+    """
+    diag = getattr(getattr(error, '__cause__', None), 'diag', None)
+    nama = getattr(diag, 'constraint_name', None) or str(error)
+    if CONSTRAINT_BENTROK_MOBIL in nama:
+        return 'mobil'
+    if CONSTRAINT_BENTROK_SUPIR in nama:
+        return 'supir'
+    return None
+
+
 class Pesanan(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Menunggu Pembayaran'),
@@ -70,28 +120,49 @@ class Pesanan(models.Model):
             models.Index(fields=['tanggal_mulai', 'tanggal_selesai']),
             models.Index(fields=['status']),
             models.Index(fields=['kode_booking']),
+            # Keyset pagination (created_at, id)
+            models.Index(fields=['created_at', 'id'], name='pesanan_created_id_idx'),
+            # Daftar pesanan terlambat (partial index, hanya baris yang sedang disewa)
+            models.Index(
+                fields=['tanggal_selesai'],
+                condition=Q(status__in=STATUS_DISEWA),
+                name='pesanan_disewa_selesai_idx',
+            ),
+            # Search (icontains = UPPER(kolom) LIKE '%x%') via pg_trgm
+            GinIndex(OpClass(Upper('kode_booking'), name='gin_trgm_ops'), name='pesanan_kode_trgm'),
+            GinIndex(OpClass(Upper('perusahaan_nama'), name='gin_trgm_ops'), name='pesanan_perusahaan_trgm'),
+        ]
+        constraints = [
+            # Anti double-booking di level database (race-safe, butuh ekstensi btree_gist)
+            ExclusionConstraint(
+                name=CONSTRAINT_BENTROK_MOBIL,
+                expressions=[
+                    ('mobil', RangeOperators.EQUAL),
+                    (RentangTanggal('tanggal_mulai', 'tanggal_selesai'), RangeOperators.OVERLAPS),
+                ],
+                condition=Q(status__in=STATUS_BLOKIR_JADWAL),
+                violation_error_message="Mobil tidak tersedia pada tanggal tersebut.",
+            ),
+            ExclusionConstraint(
+                name=CONSTRAINT_BENTROK_SUPIR,
+                expressions=[
+                    ('supir', RangeOperators.EQUAL),
+                    (RentangTanggal('tanggal_mulai', 'tanggal_selesai'), RangeOperators.OVERLAPS),
+                ],
+                condition=Q(status__in=STATUS_BLOKIR_JADWAL, supir__isnull=False),
+                violation_error_message="Supir sedang bertugas di tanggal tersebut.",
+            ),
         ]
     
     def __str__(self):
         return f"{self.kode_booking} - {self.pelanggan.nama}"
     
     def clean(self):
-        """Validasi Anti-Bentrok & Tanggal"""
+        """Validasi Tanggal (anti-bentrok dijaga exclusion constraint di Meta)"""
         if self.tanggal_mulai and self.tanggal_selesai:
             if self.tanggal_mulai > self.tanggal_selesai:
                 raise ValidationError("Tanggal selesai harus setelah tanggal mulai.")
 
-            # Cek Tabrakan Jadwal (Exclude diri sendiri saat edit)
-            overlap = Pesanan.objects.filter(
-                mobil=self.mobil,
-                status__in=['pending', 'konfirmasi', 'aktif'], # Status yg memblokir mobil
-                tanggal_mulai__lte=self.tanggal_selesai,
-                tanggal_selesai__gte=self.tanggal_mulai
-            ).exclude(pk=self.pk)
-
-            if overlap.exists():
-                raise ValidationError(f"Mobil {self.mobil.nama_mobil} tidak tersedia pada tanggal tersebut.")
-
     def save(self, *args, **kwargs):
         # 1. Generate Kode Booking (TRX-HURUFANGKA)
         if not self.kode_booking:
@@ -128,4 +199,75 @@ class Pesanan(models.Model):
             f"Tgl: {self.tanggal_mulai} s/d {self.tanggal_selesai}\n"
             f"Total: Rp {self.harga_total:,.0f}\n"
         )
-        return f"https://wa.me/{phone_number}?text={urllib.parse.quote(message)}"
\ No newline at end of file
+        return f"https://wa.me/{phone_number}?text={urllib.parse.quote(message)}"
+
+class RiwayatPembatalanOtomatis(models.Model):
+    """Log setiap sweep pembatalan pesanan kadaluarsa (lihat expiry.py)."""
+    PEMICU_CHOICES = [
+        ('command', 'Management Command / Scheduler'),
+        ('middleware', 'Fallback Middleware'),
+    ]
+
+    pemicu = models.CharField(max_length=20, choices=PEMICU_CHOICES, default='command')
+    jumlah_dibatalkan = models.PositiveIntegerField(default=0)
+    durasi_ms = models.PositiveIntegerField(default=0)
+    dijalankan_pada = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'pesanan_pembatalan_otomatis'
+        ordering = ['-dijalankan_pada']
+        verbose_name = 'Riwayat Pembatalan Otomatis'
+        verbose_name_plural = 'Riwayat Pembatalan Otomatis'
+
+    def __str__(self):
+        return f"{self.dijalankan_pada:%Y-%m-%d %H:%M} - {self.jumlah_dibatalkan} dibatalkan ({self.pemicu})"
+
+
+class AkrualDenda(models.Model):
+    """Riwayat akrual denda keterlambatan per pesanan (lihat denda.py)."""
+    pesanan = models.ForeignKey(Pesanan, on_delete=models.CASCADE, related_name='akrual_denda')
+    jam_terlambat = models.PositiveIntegerField()
+    tambahan_denda = models.DecimalField(max_digits=12, decimal_places=2)
+    total_denda = models.DecimalField(max_digits=12, decimal_places=2)
+    dihitung_pada = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'pesanan_akrual_denda'
+        ordering = ['-dihitung_pada']
+        verbose_name = 'Akrual Denda'
+        verbose_name_plural = 'Riwayat Akrual Denda'
+
+    def __str__(self):
+        return f"{self.pesanan_id} - {self.jam_terlambat} jam (Rp {self.total_denda:,.0f})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Header `Idempotency-Key` yang sudah dipakai (project/idempotency.py) oleh
+    create pesanan & pembayaran. Dihapus setelah IDEMPOTENCY_TTL detik
+    (`manage.py hapus_idempotency_kadaluarsa`, index created_at).
+    Ditulis dalam transaksi yang sama dengan create-nya: unique constraint
+    menjamin hanya satu request per (pemilik, scope, key) yang benar-benar dibuat,
+    di worker mana pun request itu masuk.
+    """
+    pemilik = models.CharField(max_length=64, help_text="ID user atau 'anon'")
+    scope = models.CharField(max_length=100, help_text="Nama ViewSet")
+    key = models.CharField(max_length=64, help_text="SHA-256 dari header Idempotency-Key")
+    sidik = models.CharField(max_length=64, help_text="SHA-256 isi request")
+
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    data = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    headers = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'idempotency_key'
+        constraints = [
+            models.UniqueConstraint(fields=['pemilik', 'scope', 'key'], name='idempotency_key_unik'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.pemilik} {self.key[:12]}"
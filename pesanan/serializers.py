@@ -1,14 +1,55 @@
 from rest_framework import serializers
-from django.db.models import Q
-from .models import Pesanan
+from django.db import IntegrityError, transaction
+from .models import Pesanan, STATUS_BLOKIR_JADWAL, jenis_bentrok
+from .harga import durasi_sewa, hitung_harga
 from pelanggan.models import Pelanggan
 from pelanggan.serializers import PelangganSerializer
 from mobil.serializers import MobilSerializer
 from supir.serializers import SupirSerializer
 from promo.serializers import PromoSerializer
 
+# --- 0. HELPER BENTROK JADWAL ---
+class BentrokJadwalMixin:
+    """
+    Cek bentrok jadwal dijaga exclusion constraint di database (lihat Pesanan.Meta),
+    jadi tidak ada query pre-check. Mixin ini menerjemahkan IntegrityError dari
+    constraint menjadi pesan validasi yang sama seperti sebelumnya.
+    """
+
+    def _error_bentrok(self, error, mobil, supir, start, end, exclude_id=None):
+        jenis = jenis_bentrok(error)
+
+        if jenis == 'mobil':
+            # Query detail hanya di jalur gagal, untuk pesan yang informatif
+            detail = Pesanan.objects.filter(
+                mobil=mobil,
+                status__in=STATUS_BLOKIR_JADWAL,
+                tanggal_mulai__lte=end,
+                tanggal_selesai__gte=start
+            ).exclude(id=exclude_id).only('tanggal_mulai', 'tanggal_selesai').first()
+            msg = f"Mobil {mobil.nama_mobil} tidak tersedia."
+            if detail:
+                msg += f" Sudah dibooking tanggal {detail.tanggal_mulai} s/d {detail.tanggal_selesai}."
+            return serializers.ValidationError({"mobil": msg})
+
+        if jenis == 'supir':
+            return serializers.ValidationError({"supir": f"Supir {supir.nama} sedang bertugas di tanggal tersebut."})
+
+        return None
+
+    def _simpan_anti_bentrok(self, simpan, mobil, supir, start, end, exclude_id=None):
+        try:
+            # Savepoint agar transaksi luar tetap bisa dipakai setelah IntegrityError
+            with transaction.atomic():
+                return simpan()
+        except IntegrityError as e:
+            error = self._error_bentrok(e, mobil, supir, start, end, exclude_id)
+            if error is None:
+                raise
+            raise error
+
 # --- 1. SERIALIZER READ (Menampilkan Data) ---
-class PesananSerializer(serializers.ModelSerializer):
+class PesananSerializer(BentrokJadwalMixin, serializers.ModelSerializer):
     pelanggan_detail = PelangganSerializer(source='pelanggan', read_only=True)
     mobil_detail = MobilSerializer(source='mobil', read_only=True)
     supir_detail = SupirSerializer(source='supir', read_only=True)
@@ -29,8 +70,44 @@ class PesananSerializer(serializers.ModelSerializer):
             'perusahaan_alamat', 'perusahaan_pic', 'perusahaan_pic_kontak'
         ]
 
+    def update(self, instance, validated_data):
+        return self._simpan_anti_bentrok(
+            lambda: super(PesananSerializer, self).update(instance, validated_data),
+            mobil=instance.mobil,
+            supir=instance.supir,
+            start=validated_data.get('tanggal_mulai', instance.tanggal_mulai),
+            end=validated_data.get('tanggal_selesai', instance.tanggal_selesai),
+            exclude_id=instance.id,
+        )
+
+# --- 1B. SERIALIZER LIST (Ringan, tanpa nested) ---
+class PesananListSerializer(serializers.ModelSerializer):
+    """
+    Representasi datar untuk endpoint list. Tanpa nested serializer,
+    tanpa build URL gambar/KTP, dan tanpa link WA (hanya ada di detail).
+    Kolom yang dibaca harus sinkron dengan PesananViewSet.LIST_FIELDS.
+    """
+    pelanggan_nama = serializers.CharField(source='pelanggan.nama', read_only=True)
+    mobil_nama = serializers.CharField(source='mobil.nama_mobil', read_only=True)
+    mobil_plat_nomor = serializers.CharField(source='mobil.plat_nomor', read_only=True)
+    supir_nama = serializers.CharField(source='supir.nama', read_only=True)
+    promo_kode = serializers.CharField(source='promo.kode', read_only=True)
+
+    class Meta:
+        model = Pesanan
+        fields = [
+            'id', 'kode_booking',
+            'pelanggan', 'pelanggan_nama',
+            'mobil', 'mobil_nama', 'mobil_plat_nomor',
+            'supir', 'supir_nama', 'promo', 'promo_kode',
+            'tanggal_mulai', 'tanggal_selesai', 'total_hari',
+            'harga_total', 'denda', 'status', 'type_pesanan',
+            'is_corporate', 'perusahaan_nama', 'created_at',
+        ]
+        read_only_fields = fields
+
 # --- 2. SERIALIZER CREATE BASE (Logic Utama) ---
-class BaseCreatePesananSerializer(serializers.ModelSerializer):
+class BaseCreatePesananSerializer(BentrokJadwalMixin, serializers.ModelSerializer):
     tanggal_mulai = serializers.DateField()
     tanggal_selesai = serializers.DateField()
     
@@ -45,54 +122,14 @@ class BaseCreatePesananSerializer(serializers.ModelSerializer):
     def validate(self, data):
         start = data.get('tanggal_mulai')
         end = data.get('tanggal_selesai')
-        mobil = data.get('mobil')
-        supir = data.get('supir')
 
         # 1. Validasi Tanggal Dasar
         if start and end and start > end:
             raise serializers.ValidationError({"tanggal_selesai": "Tanggal selesai tidak boleh sebelum tanggal mulai."})
 
-        # --- LOGIKA CEK BENTROK MOBIL ---
-        # Kita cari pesanan lain yang:
-        # A. Mobilnya sama
-        # B. Statusnya Masih Aktif (Bukan Batal/Selesai)
-        # C. Tanggalnya tumpang tindih (Overlap)
-        
-        # Daftar status yang dianggap "Booking Aktif"
-        status_aktif = ['pending', 'konfirmasi', 'lunas', 'sedang_disewa', 'aktif']
-
-        if mobil and start and end:
-            bentrok_mobil = Pesanan.objects.filter(
-                mobil=mobil,
-                status__in=status_aktif
-            ).filter(
-                # Rumus Overlap: (StartA <= EndB) AND (EndA >= StartB)
-                Q(tanggal_mulai__lte=end) & Q(tanggal_selesai__gte=start)
-            )
-
-            # PENTING: Jika sedang Edit (Update), jangan cek diri sendiri
-            if self.instance:
-                bentrok_mobil = bentrok_mobil.exclude(id=self.instance.id)
-
-            if bentrok_mobil.exists():
-                detail = bentrok_mobil.first()
-                msg = f"Mobil {mobil.nama_mobil} tidak tersedia. Sudah dibooking tanggal {detail.tanggal_mulai} s/d {detail.tanggal_selesai}."
-                raise serializers.ValidationError({"mobil": msg})
-
-        # --- LOGIKA CEK BENTROK SUPIR (Jika Ada) ---
-        if supir and start and end:
-            bentrok_supir = Pesanan.objects.filter(
-                supir=supir,
-                status__in=status_aktif
-            ).filter(
-                Q(tanggal_mulai__lte=end) & Q(tanggal_selesai__gte=start)
-            )
-
-            if self.instance:
-                bentrok_supir = bentrok_supir.exclude(id=self.instance.id)
-
-            if bentrok_supir.exists():
-                raise serializers.ValidationError({"supir": f"Supir {supir.nama} sedang bertugas di tanggal tersebut."})
+        # Cek bentrok mobil & supir TIDAK dilakukan di sini (tanpa query).
+        # Exclusion constraint di database yang menolak INSERT yang overlap,
+        # lalu diterjemahkan ke {"mobil": ...} / {"supir": ...} di _buat_pesanan().
 
         # Validasi Data Corporate
         if data.get('is_corporate'):
@@ -108,20 +145,28 @@ class BaseCreatePesananSerializer(serializers.ModelSerializer):
         start = validated_data['tanggal_mulai']
         end = validated_data['tanggal_selesai']
         
-        durasi = (end - start).days + 1
-        total = mobil.harga_per_hari * durasi
-        
-        if supir:
-            total += (supir.harga_per_hari * durasi)
-            
-        if promo:
-             # Cek validitas promo method aman
-             if hasattr(promo, 'is_valid_now') and promo.is_valid_now:
-                total -= promo.nominal_potongan
-             elif hasattr(promo, 'is_valid') and promo.is_valid:
-                total -= promo.nominal_potongan
-            
-        return max(total, 0)
+        # Rumus sama dengan endpoint simulasi_harga (lihat harga.py).
+        # PERUBAHAN PERILAKU: dulu potongan = promo.nominal_potongan (flat; field itu
+        # sudah dihapus di promo 0002 sehingga create berpromo error). Sekarang
+        # mengikuti Promo.hitung_potongan seperti /api/promo/cek_kode/: promo persen
+        # (+ max_potongan) dihitung dari subtotal & min_transaksi ikut berlaku.
+        rincian = hitung_harga(
+            mobil.harga_per_hari,
+            supir.harga_per_hari if supir else 0,
+            durasi_sewa(start, end),
+            promo if promo and promo.is_valid else None,
+        )
+        return rincian['total']
+
+    def _buat_pesanan(self, **data):
+        """Satu INSERT; bentrok jadwal ditangkap dari exclusion constraint."""
+        return self._simpan_anti_bentrok(
+            lambda: Pesanan.objects.create(**data),
+            mobil=data['mobil'],
+            supir=data.get('supir'),
+            start=data['tanggal_mulai'],
+            end=data['tanggal_selesai'],
+        )
 
 # --- 3. CREATE ONLINE ---
 class CreatePesananSerializer(BaseCreatePesananSerializer):
@@ -137,7 +182,7 @@ class CreatePesananSerializer(BaseCreatePesananSerializer):
             
         harga = self.calculate_price(validated_data)
         
-        return Pesanan.objects.create(
+        return self._buat_pesanan(
             pelanggan=user.pelanggan,
             harga_total=harga,
             type_pesanan='online',
@@ -158,9 +203,51 @@ class AdminCreatePesananSerializer(BaseCreatePesananSerializer):
     def create(self, validated_data):
         harga = self.calculate_price(validated_data)
         
-        return Pesanan.objects.create(
+        return self._buat_pesanan(
             harga_total=harga,
             type_pesanan='offline',
             status='konfirmasi', # Default offline langsung konfirmasi
             **validated_data
-        )
\ No newline at end of file
+        )
+
+
+class AksiMassalSerializer(serializers.Serializer):
+    """Input endpoint aksi_massal: daftar id pesanan + transisi tujuan."""
+    AKSI_CHOICES = ['konfirmasi', 'aktifkan', 'selesai', 'batal']
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500
+    )
+    aksi = serializers.ChoiceField(choices=AKSI_CHOICES)
+
+
+class RentangSewaSerializer(serializers.Serializer):
+    tanggal_mulai = serializers.DateField()
+    tanggal_selesai = serializers.DateField()
+
+    def validate(self, data):
+        if data['tanggal_mulai'] > data['tanggal_selesai']:
+            raise serializers.ValidationError({"tanggal_selesai": "Tanggal selesai tidak boleh sebelum tanggal mulai."})
+        return data
+
+
+class SimulasiHargaSerializer(serializers.Serializer):
+    """
+    Input endpoint simulasi_harga. Mobil dipilih lewat `mobil_ids` ATAU
+    `katalog` (filter yang sama dengan list mobil: merk, transmisi, min_harga, ...).
+    """
+    MAKS_MOBIL = 100
+
+    mobil_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, max_length=MAKS_MOBIL
+    )
+    katalog = serializers.DictField(child=serializers.CharField(), required=False)
+    rentang = serializers.ListField(child=RentangSewaSerializer(), min_length=1, max_length=12)
+    supir = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    kode_promo = serializers.CharField(required=False, allow_blank=True)
+
+    def validate(self, data):
+        if not data.get('mobil_ids') and data.get('katalog') is None:
+            raise serializers.ValidationError("Isi mobil_ids atau katalog.")
+        return data
+
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Pesanan
+from .availability import index_ketersediaan
+
+@receiver(post_save, sender=Pesanan)
+def sinkron_index_ketersediaan(sender, instance, **kwargs):
+    """
+    Perbarui index ketersediaan setiap kali Pesanan di-save
+    (create, ubah tanggal, ubah status). Dijalankan setelah commit
+    agar rollback tidak meninggalkan data hantu di index.
+    """
+    data = (
+        instance.pk, instance.mobil_id,
+        instance.tanggal_mulai, instance.tanggal_selesai, instance.status,
+    )
+    transaction.on_commit(lambda: index_ketersediaan.perbarui(*data))
+
+@receiver(post_delete, sender=Pesanan)
+def hapus_dari_index_ketersediaan(sender, instance, **kwargs):
+    pesanan_id = instance.pk
+    transaction.on_commit(lambda: index_ketersediaan.hapus(pesanan_id))
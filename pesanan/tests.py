@@ -1,3 +1,359 @@
-from django.test import TestCase
+import datetime
+from decimal import Decimal
+from io import StringIO
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from mobil.models import Mobil
+from pelanggan.models import Pelanggan
+from promo.models import Promo
+from supir.models import Supir
+from .harga import durasi_sewa, hitung_harga, matriks_harga
+from .kalender import encode_bitset, encode_ranges, encode_rle, interval_sibuk, kalender_armada
+from .models import CONSTRAINT_BENTROK_MOBIL, CONSTRAINT_BENTROK_SUPIR, IdempotencyKey, Pesanan, jenis_bentrok
+from .serializers import CreatePesananSerializer
+
+User = get_user_model()
+
+
+def buat_mobil(plat, harga=300000):
+    return Mobil.objects.create(
+        nama_mobil='Avanza', merk='Toyota', jenis='MPV', plat_nomor=plat, tahun=2020,
+        transmisi='manual', kapasitas_kursi=7, harga_per_hari=harga,
+    )
+
+
+def buat_pelanggan(username):
+    user = User.objects.create_user(username=username, password='rahasia123', email=f'{username}@example.com')
+    return Pelanggan.objects.create(user=user, nama=username.title(), no_hp='081200000000')
+
+
+# --- 1. TERJEMAHAN EXCLUSION CONSTRAINT ---
+
+class ErrorDriver(Exception):
+    """Tiruan error psycopg: nama constraint ada di `diag.constraint_name`."""
+
+    def __init__(self, constraint_name):
+        super().__init__(constraint_name)
+        self.diag = SimpleNamespace(constraint_name=constraint_name)
+
+
+class JenisBentrokTest(SimpleTestCase):
+    def _error(self, constraint_name=None, pesan=''):
+        error = IntegrityError(pesan)
+        if constraint_name:
+            # Django membungkus error driver sebagai __cause__
+            error.__cause__ = ErrorDriver(constraint_name)
+        return error
+
+    def test_dari_diag_constraint_name(self):
+        self.assertEqual(jenis_bentrok(self._error(CONSTRAINT_BENTROK_MOBIL)), 'mobil')
+        self.assertEqual(jenis_bentrok(self._error(CONSTRAINT_BENTROK_SUPIR)), 'supir')
+
+    def test_fallback_ke_pesan_error(self):
+        pesan = f'conflicting key value violates exclusion constraint "{CONSTRAINT_BENTROK_SUPIR}"'
+        self.assertEqual(jenis_bentrok(self._error(pesan=pesan)), 'supir')
+
+    def test_error_lain_bukan_bentrok(self):
+        self.assertIsNone(jenis_bentrok(self._error('pesanan_kode_booking_key')))
+        self.assertIsNone(jenis_bentrok(self._error(pesan='duplicate key value violates unique constraint')))
+
+
+# --- 2. IDEMPOTENCY-KEY ---
+
+class IdempotencyPesananTest(TestCase):
+    def setUp(self):
+        self.mobil = buat_mobil('BA 1 TES')
+        self.pelanggan = buat_pelanggan('budi')
+        self.client = APIClient()
+        self.client.force_authenticate(self.pelanggan.user)
+        mulai = timezone.localdate() + datetime.timedelta(days=3)
+        self.body = {
+            'mobil': self.mobil.id,
+            'tanggal_mulai': str(mulai),
+            'tanggal_selesai': str(mulai + datetime.timedelta(days=1)),
+        }
+
+    def _post(self, body, key):
+        return self.client.post('/api/pesanan/', body, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_menerima_response_tersimpan(self):
+        pertama = self._post(self.body, 'key-1')
+        self.assertEqual(pertama.status_code, 201)
+
+        kedua = self._post(self.body, 'key-1')
+
+        self.assertEqual(kedua.status_code, 201)
+        self.assertEqual(kedua.json(), pertama.json())
+        self.assertEqual(kedua.headers.get('Idempotency-Replayed'), 'true')
+        self.assertEqual(Pesanan.objects.count(), 1)
+
+    def test_key_sama_isi_berbeda_ditolak(self):
+        self.assertEqual(self._post(self.body, 'key-1').status_code, 201)
+
+        body_lain = dict(self.body, tanggal_selesai=self.body['tanggal_mulai'])
+        response = self._post(body_lain, 'key-1')
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Pesanan.objects.count(), 1)
+
+    def test_response_gagal_tidak_menyimpan_key(self):
+        body_salah = {'mobil': self.mobil.id}
+
+        self.assertEqual(self._post(body_salah, 'key-2').status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        # Retry diproses ulang (bukan replay), kali ini dengan data lengkap
+        response = self._post(self.body, 'key-2')
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(response.headers.get('Idempotency-Replayed'))
+
+    def test_key_per_user(self):
+        self.assertEqual(self._post(self.body, 'key-1').status_code, 201)
+
+        lain = APIClient()
+        lain.force_authenticate(buat_pelanggan('sari').user)
+        body = dict(self.body, tanggal_mulai=str(timezone.localdate() + datetime.timedelta(days=10)),
+                    tanggal_selesai=str(timezone.localdate() + datetime.timedelta(days=11)))
+        response = lain.post('/api/pesanan/', body, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(response.headers.get('Idempotency-Replayed'))
+        self.assertEqual(Pesanan.objects.count(), 2)
+
+    @override_settings(IDEMPOTENCY_TTL=60)
+    def test_key_kadaluarsa_dihapus_command(self):
+        self.assertEqual(self._post(self.body, 'key-1').status_code, 201)
+        body_lain = dict(self.body, tanggal_mulai=str(timezone.localdate() + datetime.timedelta(days=10)),
+                         tanggal_selesai=str(timezone.localdate() + datetime.timedelta(days=11)))
+        self.assertEqual(self._post(body_lain, 'key-2').status_code, 201)
+        IdempotencyKey.objects.filter(key=IdempotencyKey.objects.first().key).update(
+            created_at=timezone.now() - datetime.timedelta(seconds=61)
+        )
+
+        call_command('hapus_idempotency_kadaluarsa', stdout=StringIO())
+
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+
+# --- 3. SEED DATA ---
+
+class SeedRentalTest(TestCase):
+    def _tumpang_tindih(self, rentang):
+        """Pasangan rentang (mulai, selesai) inklusif yang overlap, per kunci."""
+        bentrok = []
+        for kunci, daftar in rentang.items():
+            daftar.sort()
+            for (_, selesai_a), (mulai_b, _) in zip(daftar, daftar[1:]):
+                if mulai_b <= selesai_a:
+                    bentrok.append(kunci)
+        return bentrok
+
+    def test_pesanan_seed_tidak_pernah_bentrok(self):
+        call_command(
+            'seed_rental', pesanan=400, pelanggan=30, mobil=4, supir=4, promo=3,
+            hari_lalu=90, hari_depan=20, seed=7, stdout=StringIO(),
+        )
+
+        self.assertEqual(Pesanan.objects.count(), 400)
+        per_mobil, per_supir = {}, {}
+        for mobil_id, supir_id, mulai, selesai in Pesanan.objects.values_list(
+            'mobil_id', 'supir_id', 'tanggal_mulai', 'tanggal_selesai'
+        ):
+            self.assertLessEqual(mulai, selesai)
+            per_mobil.setdefault(mobil_id, []).append((mulai, selesai))
+            if supir_id:
+                per_supir.setdefault(supir_id, []).append((mulai, selesai))
+
+        self.assertGreater(len(per_mobil), 4)  # mobil ditambah otomatis agar 400 pesanan muat
+        self.assertTrue(per_supir)
+        self.assertEqual(self._tumpang_tindih(per_mobil), [])
+        self.assertEqual(self._tumpang_tindih(per_supir), [])
+        self.assertFalse(Pesanan.objects.filter(supir__status='off').exists())
+        self.assertEqual(Supir.objects.count(), 4)
+
+
+# --- 4. KALENDER ARMADA ---
+
+class EncodingKalenderTest(SimpleTestCase):
+    def test_rle_diawali_run_bebas_dan_jumlahnya_sama_dengan_jendela(self):
+        self.assertEqual(encode_rle([(0, 0), (2, 9), (19, 20)], 31), [0, 1, 1, 8, 9, 2, 10])
+        self.assertEqual(encode_rle([(29, 30)], 31), [29, 2])
+        self.assertEqual(encode_rle([], 31), [31])
+        self.assertEqual(sum(encode_rle([(3, 4), (10, 12)], 20)), 20)
+
+    def test_bitset_lsb_dulu_per_byte(self):
+        # Hari 0, 2-3 dan 8 sibuk: byte0 = 0b00001101, byte1 = 0b00000001
+        self.assertEqual(encode_bitset([(0, 0), (2, 3), (8, 8)], 10), '0d01')
+        self.assertEqual(encode_bitset([], 9), '0000')
+
+    def test_ranges_inklusif(self):
+        start = datetime.date(2030, 1, 1)
+        self.assertEqual(encode_ranges([(2, 4)], start), [['2030-01-03', '2030-01-05']])
+
+
+class IntervalSibukTest(TestCase):
+    def setUp(self):
+        self.pelanggan = buat_pelanggan('budi')
+        self.mobil = buat_mobil('BA 1 TES')
+        self.mobil_kosong = buat_mobil('BA 2 TES')
+        self.start = datetime.date(2030, 1, 1)
+        self.end = datetime.date(2030, 1, 31)
+
+    def _pesanan(self, mulai, selesai, status):
+        return Pesanan.objects.create(
+            pelanggan=self.pelanggan, mobil=self.mobil, status=status,
+            tanggal_mulai=datetime.date.fromisoformat(mulai), tanggal_selesai=datetime.date.fromisoformat(selesai),
+        )
+
+    def test_sweep_menggabungkan_overlap_dan_interval_bersambung(self):
+        # 'selesai' tidak dijaga exclusion constraint, jadi boleh overlap di data
+        self._pesanan('2029-12-30', '2030-01-01', 'selesai')  # terpotong ke hari 0
+        self._pesanan('2030-01-03', '2030-01-05', 'selesai')
+        self._pesanan('2030-01-04', '2030-01-08', 'selesai')  # overlap -> 2..7
+        self._pesanan('2030-01-09', '2030-01-10', 'konfirmasi')  # bersambung -> 2..9
+        self._pesanan('2030-01-20', '2030-01-21', 'pending')
+        self._pesanan('2030-01-24', '2030-01-26', 'batal')  # tidak memblokir
+        self._pesanan('2030-01-30', '2030-02-03', 'konfirmasi')  # terpotong ke hari 30
+
+        hasil = interval_sibuk([self.mobil.id, self.mobil_kosong.id], self.start, self.end)
+
+        self.assertEqual(hasil[self.mobil.id], [(0, 0), (2, 9), (19, 20), (29, 30)])
+        self.assertEqual(hasil[self.mobil_kosong.id], [])
+
+    def test_pending_yang_sudah_lewat_tidak_memblokir(self):
+        kemarin = timezone.localdate() - datetime.timedelta(days=1)
+        Pesanan.objects.create(
+            pelanggan=self.pelanggan, mobil=self.mobil, status='pending',
+            tanggal_mulai=kemarin, tanggal_selesai=kemarin + datetime.timedelta(days=2),
+        )
+
+        hasil = interval_sibuk([self.mobil.id], kemarin, kemarin + datetime.timedelta(days=5))
+
+        self.assertEqual(hasil[self.mobil.id], [])
+
+    def test_ketiga_encoding_konsisten(self):
+        self._pesanan('2030-01-03', '2030-01-05', 'konfirmasi')
+
+        ranges = kalender_armada([self.mobil.id], self.start, self.end, 'ranges')
+        rle = kalender_armada([self.mobil.id], self.start, self.end, 'rle')
+        bitset = kalender_armada([self.mobil.id], self.start, self.end, 'bitset')
+
+        self.assertEqual(ranges['hari'], 31)
+        self.assertEqual(ranges['mobil'][self.mobil.id], [['2030-01-03', '2030-01-05']])
+        self.assertEqual(rle['mobil'][self.mobil.id], [2, 3, 26])
+        self.assertEqual(bitset['mobil'][self.mobil.id], '1c000000')
+
+
+# --- 5. HARGA ---
+
+class MatriksHargaTest(SimpleTestCase):
+    RENTANG = [
+        (datetime.date(2030, 1, 1), datetime.date(2030, 1, 1)),
+        (datetime.date(2030, 1, 1), datetime.date(2030, 1, 3)),
+        (datetime.date(2030, 1, 1), datetime.date(2030, 1, 30)),
+    ]
+    HARGA = [Decimal('250000'), Decimal('333333.33'), Decimal('1250000.50')]
+
+    def _sama_dengan_hitung_harga(self, harga_supir, promo):
+        matriks = matriks_harga(self.HARGA, self.RENTANG, harga_supir, promo)
+        for harga, baris in zip(self.HARGA, matriks):
+            for (mulai, selesai), sel in zip(self.RENTANG, baris):
+                self.assertEqual(sel, hitung_harga(harga, harga_supir, durasi_sewa(mulai, selesai), promo))
+
+    def test_tanpa_promo(self):
+        self._sama_dengan_hitung_harga(0, None)
+        self._sama_dengan_hitung_harga(Decimal('150000'), None)
+
+    def test_promo_nominal_persen_dan_batasnya(self):
+        promo_list = [
+            Promo(tipe_diskon='nominal', nilai_diskon=Decimal('100000'), min_transaksi=Decimal('500000')),
+            Promo(tipe_diskon='nominal', nilai_diskon=Decimal('99999999')),
+            Promo(tipe_diskon='persen', nilai_diskon=Decimal('12.5')),
+            Promo(tipe_diskon='persen', nilai_diskon=Decimal('33.33'), max_potongan=Decimal('750000')),
+        ]
+        for promo in promo_list:
+            with self.subTest(tipe=promo.tipe_diskon, nilai=promo.nilai_diskon):
+                self._sama_dengan_hitung_harga(Decimal('150000'), promo)
+
+    def test_nilai_besar_tidak_overflow(self):
+        matriks = matriks_harga([Decimal('9999999999.99')], [(datetime.date(2030, 1, 1), datetime.date(2039, 12, 31))])
+        self.assertEqual(matriks[0][0]['total'], Decimal('9999999999.99') * 3652)
+
+
+class SimulasiHargaTest(TestCase):
+    def test_filter_katalog_bukan_angka_400(self):
+        body = {
+            'katalog': {'min_kursi': 'abc'},
+            'rentang': [{'tanggal_mulai': '2030-01-01', 'tanggal_selesai': '2030-01-02'}],
+        }
+
+        response = APIClient().post('/api/pesanan/simulasi_harga/', body, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('min_kursi', response.json())
+
+
+class CalculatePriceTest(TestCase):
+    def setUp(self):
+        self.mobil = buat_mobil('BA 1 TES', harga=300000)
+        sekarang = timezone.now()
+        self.berlaku = {'berlaku_mulai': sekarang - datetime.timedelta(days=1),
+                        'berlaku_sampai': sekarang + datetime.timedelta(days=1)}
+        mulai = datetime.date(2030, 1, 1)
+        self.data = {'mobil': self.mobil, 'tanggal_mulai': mulai, 'tanggal_selesai': mulai + datetime.timedelta(days=1)}
+
+    def _harga(self, **promo):
+        promo = Promo.objects.create(kode=f"P{Promo.objects.count()}", nama_promo='Promo', **self.berlaku, **promo)
+        return CreatePesananSerializer().calculate_price(dict(self.data, promo=promo))
+
+    def test_promo_mengikuti_hitung_potongan(self):
+        # Subtotal 2 hari x 300.000 = 600.000
+        self.assertEqual(self._harga(tipe_diskon='persen', nilai_diskon=10), Decimal('540000'))
+        self.assertEqual(self._harga(tipe_diskon='persen', nilai_diskon=50, max_potongan=100000), Decimal('500000'))
+        self.assertEqual(self._harga(tipe_diskon='nominal', nilai_diskon=50000), Decimal('550000'))
+        # Syarat minimal transaksi tidak terpenuhi -> tanpa potongan
+        self.assertEqual(
+            self._harga(tipe_diskon='nominal', nilai_diskon=50000, min_transaksi=1000000), Decimal('600000')
+        )
+
+
+# --- 6. PAGINASI CURSOR ---
+
+class PaginasiCursorTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'rahasia123'))
+        pelanggan = buat_pelanggan('budi')
+        mobil = buat_mobil('BA 1 TES')
+        mulai = datetime.date(2030, 1, 1)
+        for i in range(3):
+            Pesanan.objects.create(
+                pelanggan=pelanggan, mobil=mobil, harga_total=100000 * (3 - i),
+                tanggal_mulai=mulai + datetime.timedelta(days=i * 5),
+                tanggal_selesai=mulai + datetime.timedelta(days=i * 5 + 1),
+            )
+
+    def test_ordering_lain_ditolak_di_mode_cursor(self):
+        response = self.client.get('/api/pesanan/', {'paginasi': 'cursor', 'ordering': 'harga_total'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.json())
+
+    def test_ordering_bawaan_tetap_boleh(self):
+        response = self.client.get('/api/pesanan/', {'paginasi': 'cursor', 'ordering': '-created_at'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 3)
+
+    def test_ordering_lain_dengan_page_number(self):
+        response = self.client.get('/api/pesanan/', {'ordering': 'harga_total'})
+
+        self.assertEqual(response.status_code, 200)
+        harga = [Decimal(p['harga_total']) for p in response.json()['results']]
+        self.assertEqual(harga, sorted(harga))
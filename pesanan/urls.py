@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import PesananViewSet
-from .views_report import DashboardReportView
+from .views_report import DashboardReportView, EksporPesananView, EksporPembayaranView, UtilisasiArmadaView
 from .views_dashboard import AdminDashboardStatsView 
 
 router = DefaultRouter()
@@ -15,6 +15,14 @@ urlpatterns = [
     # Endpoint untuk Laporan Lengkap (PDF/Excel)
     # URL: /api/pesanan/reports/dashboard/
     path('reports/dashboard/', DashboardReportView.as_view(), name='dashboard-report'),
+
+    # Ekspor Data Streaming (CSV/XLSX) untuk Finance
+    # URL: /api/pesanan/reports/ekspor/pesanan/?tipe=xlsx&dari=2025-01-01&sampai=2025-12-31
+    path('reports/ekspor/pesanan/', EksporPesananView.as_view(), name='ekspor-pesanan'),
+    path('reports/ekspor/pembayaran/', EksporPembayaranView.as_view(), name='ekspor-pembayaran'),
+
+    # Utilisasi Armada (hari tersewa per mobil/jenis/periode + mobil menganggur)
+    path('reports/utilisasi/', UtilisasiArmadaView.as_view(), name='utilisasi-armada'),
     
     # Endpoint CRUD Pesanan (Bawaan Router)
     path('', include(router.urls)),
@@ -0,0 +1,167 @@
+"""
+Utilisasi armada: berapa hari tiap mobil benar-benar tersewa dalam suatu periode.
+
+Interval booking dimuat sekali ke array NumPy, lalu semua agregat (per mobil,
+per jenis, deret waktu harian/mingguan/bulanan, ranking mobil menganggur)
+dihitung dengan operasi vektor (bincount / cumsum), tanpa loop per booking.
+Interval dipotong (clip) ke batas periode.
+
+Offset hari dihitung di database dengan SelisihHari (date - date), jadi modul
+ini hanya berjalan benar di PostgreSQL.
+"""
+import numpy as np
+from django.db.models import F, Value
+from django.utils import timezone
+
+from mobil.models import Mobil
+from .models import Pesanan, SelisihHari
+
+# Status yang dihitung sebagai "mobil terpakai" (pending & batal tidak dihitung)
+STATUS_TERPAKAI = ['konfirmasi', 'lunas', 'sedang_disewa', 'aktif', 'selesai']
+
+PERIODE_CHOICES = ['hari', 'minggu', 'bulan']
+
+
+def _persen(pembilang, penyebut):
+    """Persentase elemen-per-elemen, 0 jika penyebut 0."""
+    pembilang = np.asarray(pembilang, dtype=np.float64)
+    penyebut = np.asarray(penyebut, dtype=np.float64)
+    hasil = np.zeros_like(pembilang)
+    np.divide(pembilang, penyebut, out=hasil, where=penyebut > 0)
+    return np.round(hasil * 100, 2)
+
+
+def _kunci_periode(hari, periode):
+    """Label bucket untuk setiap hari (datetime64[D]) dalam periode."""
+    if periode == 'bulan':
+        return hari.astype('datetime64[M]')
+    if periode == 'minggu':
+        # 1970-01-01 = Kamis, geser ke Senin awal minggu (ISO)
+        return hari - ((hari.astype(np.int64) + 3) % 7).astype('timedelta64[D]')
+    return hari
+
+
+def hitung_utilisasi(dari, sampai, periode='bulan', limit=10):
+    n_hari = (sampai - dari).days + 1
+    awal = np.datetime64(dari, 'D')
+
+    # --- 1. MOBIL ---
+    mobil = list(
+        Mobil.objects.order_by('id')
+        .values_list('id', 'nama_mobil', 'plat_nomor', 'jenis', 'status', 'created_at')
+    )
+    n_mobil = len(mobil)
+    mobil_ids = np.fromiter((m[0] for m in mobil), dtype=np.int64, count=n_mobil)
+    terdaftar = np.array([timezone.localdate(m[5]) for m in mobil], dtype='datetime64[D]')
+    mulai_tersedia = np.clip((terdaftar - awal).astype(np.int64), 0, n_hari)
+
+    # --- 2. BOOKING (1 query, langsung jadi array) ---
+    # Tanggal diambil sebagai offset hari (integer) dari `dari`, lebih murah
+    # daripada membuat objek date per baris
+    rows = list(
+        Pesanan.objects.filter(
+            status__in=STATUS_TERPAKAI,
+            tanggal_mulai__lte=sampai,
+            tanggal_selesai__gte=dari,
+        ).annotate(
+            hari_mulai=SelisihHari(F('tanggal_mulai'), Value(dari)),
+            hari_selesai=SelisihHari(F('tanggal_selesai'), Value(dari)),
+        ).values_list('mobil_id', 'hari_mulai', 'hari_selesai')
+    )
+    data = np.array(rows, dtype=np.int64).reshape(-1, 3)
+    idx_mobil = np.searchsorted(mobil_ids, data[:, 0])
+    mulai = np.maximum(data[:, 1], 0)
+    selesai = np.minimum(data[:, 2], n_hari - 1)
+    durasi = selesai - mulai + 1
+
+    # Hari tersedia dihitung sejak mobil terdaftar, atau sejak booking pertamanya
+    # jika lebih awal (data lama yang diimpor setelah mobil dibuat)
+    np.minimum.at(mulai_tersedia, idx_mobil, mulai)
+    hari_tersedia = n_hari - mulai_tersedia
+
+    # --- 3. PER MOBIL ---
+    hari_tersewa = np.bincount(idx_mobil, weights=durasi, minlength=n_mobil)
+    hari_tersewa = np.minimum(hari_tersewa, hari_tersedia).astype(np.int64)
+    utilisasi = _persen(hari_tersewa, hari_tersedia)
+
+    # Hari sejak sewa terakhir berakhir (dalam periode); belum pernah tersewa = seluruh hari tersedia
+    selesai_terakhir = np.full(n_mobil, -1, dtype=np.int64)
+    np.maximum.at(selesai_terakhir, idx_mobil, selesai)
+    hari_menganggur = np.where(selesai_terakhir >= 0, (n_hari - 1) - selesai_terakhir, hari_tersedia)
+
+    # --- 4. PER JENIS ---
+    jenis = np.array([m[3] or '-' for m in mobil], dtype=object)
+    daftar_jenis, idx_jenis = np.unique(jenis, return_inverse=True)
+    tersewa_jenis = np.bincount(idx_jenis, weights=hari_tersewa, minlength=len(daftar_jenis))
+    tersedia_jenis = np.bincount(idx_jenis, weights=hari_tersedia, minlength=len(daftar_jenis))
+    jumlah_jenis = np.bincount(idx_jenis, minlength=len(daftar_jenis))
+
+    # --- 5. DERET WAKTU (difference array -> mobil tersewa per hari) ---
+    selisih = (
+        np.bincount(mulai, minlength=n_hari + 1)
+        - np.bincount(selesai + 1, minlength=n_hari + 1)
+    )
+    tersewa_harian = np.cumsum(selisih)[:n_hari]
+    tersedia_harian = np.cumsum(np.bincount(mulai_tersedia, minlength=n_hari + 1))[:n_hari]
+    tersewa_harian = np.minimum(tersewa_harian, tersedia_harian)
+
+    kunci = _kunci_periode(awal + np.arange(n_hari), periode)
+    label, idx_periode = np.unique(kunci, return_inverse=True)
+    tersewa_periode = np.bincount(idx_periode, weights=tersewa_harian, minlength=len(label))
+    tersedia_periode = np.bincount(idx_periode, weights=tersedia_harian, minlength=len(label))
+    utilisasi_periode = _persen(tersewa_periode, tersedia_periode)
+
+    # --- 6. SUSUN RESPONSE ---
+    per_mobil = [
+        {
+            'mobil_id': m[0],
+            'nama_mobil': m[1],
+            'plat_nomor': m[2],
+            'jenis': m[3],
+            'status': m[4],
+            'hari_tersedia': int(hari_tersedia[i]),
+            'hari_tersewa': int(hari_tersewa[i]),
+            'utilisasi': float(utilisasi[i]),
+            'hari_menganggur': int(hari_menganggur[i]),
+        }
+        for i, m in enumerate(mobil)
+    ]
+
+    # Ranking menganggur: hanya mobil aktif, utilisasi terendah lalu paling lama menganggur
+    aktif = np.array([m[4] == 'aktif' for m in mobil], dtype=bool)
+    urutan = np.lexsort((-hari_menganggur, utilisasi))
+    menganggur = [per_mobil[i] for i in urutan if aktif[i] and hari_tersedia[i] > 0][:limit]
+
+    total_tersewa = int(hari_tersewa.sum())
+    total_tersedia = int(hari_tersedia.sum())
+    return {
+        'periode': {'dari': dari, 'sampai': sampai, 'jumlah_hari': n_hari, 'granularitas': periode},
+        'ringkasan': {
+            'jumlah_mobil': n_mobil,
+            'jumlah_booking': len(rows),
+            'hari_tersedia': total_tersedia,
+            'hari_tersewa': total_tersewa,
+            'utilisasi': float(_persen(total_tersewa, total_tersedia)),
+        },
+        'per_jenis': [
+            {
+                'jenis': str(daftar_jenis[j]),
+                'jumlah_mobil': int(jumlah_jenis[j]),
+                'hari_tersedia': int(tersedia_jenis[j]),
+                'hari_tersewa': int(tersewa_jenis[j]),
+                'utilisasi': float(u),
+            }
+            for j, u in enumerate(_persen(tersewa_jenis, tersedia_jenis))
+        ],
+        'deret_waktu': [
+            {
+                'periode': str(label[k]),
+                'hari_tersedia': int(tersedia_periode[k]),
+                'hari_tersewa': int(tersewa_periode[k]),
+                'utilisasi': float(utilisasi_periode[k]),
+            }
+            for k in range(len(label))
+        ],
+        'per_mobil': sorted(per_mobil, key=lambda x: -x['utilisasi']),
+        'mobil_menganggur': menganggur,
+    }
@@ -2,106 +2,160 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
-from django.core.mail import send_mail
+import hashlib
+import json
+
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, CharField, DecimalField, F, Func, OuterRef, Q, Subquery, TextField, Value, When
+from django.db.models.functions import Cast, Coalesce, Concat
 from django.utils import timezone
-from django.db.models import Q
+from django.utils.dateparse import parse_date
 
-from .models import Pesanan
+from .models import Pesanan, SelisihHari, AkrualDenda, STATUS_DISEWA
+from .availability import index_ketersediaan
+from .harga import durasi_sewa, matriks_harga
+from .denda import JamTerlambat
+from mobil.filters import filter_katalog
 from mobil.models import Mobil
 from mobil.serializers import MobilSerializer
-from .serializers import PesananSerializer, CreatePesananSerializer, AdminCreatePesananSerializer
+from notifikasi.outbox import antre_email, antre_email_massal
+from promo.models import Promo
+from supir.models import Supir
+from project.idempotency import IdempotentCreateMixin
+from project.pagination import KeysetPagination
+from project.search import TrigramSearchFilter
+from rekap.services import catat_perubahan_status_massal
+from .serializers import (
+    PesananSerializer, PesananListSerializer, CreatePesananSerializer, AdminCreatePesananSerializer,
+    AksiMassalSerializer, SimulasiHargaSerializer,
+)
 
-class PesananViewSet(viewsets.ModelViewSet):
+class PesananViewSet(IdempotentCreateMixin, viewsets.ModelViewSet):
+    # POST dengan header Idempotency-Key aman di-retry (lihat project/idempotency.py)
     queryset = Pesanan.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination  # ?page= (lama) atau ?paginasi=cursor
     
     # --- FITUR SEARCH & FILTER ---
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # Search via index pg_trgm (?search_rank=1 untuk urut berdasarkan kemiripan)
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, TrigramSearchFilter]
     filterset_fields = ['status', 'type_pesanan', 'is_corporate']
     search_fields = ['kode_booking', 'pelanggan__nama', 'perusahaan_nama', 'mobil__nama_mobil']
     ordering_fields = ['created_at', 'tanggal_mulai', 'harga_total']
     ordering = ['-created_at']
 
+    # Aturan transisi untuk aksi_massal (sama dengan tombol per pesanan):
+    # aksi -> (status tujuan, syarat status asal, pesan jika ditolak)
+    TRANSISI_MASSAL = {
+        'konfirmasi': ('konfirmasi', lambda s: s not in ['selesai', 'batal'], 'Pesanan sudah selesai/batal'),
+        'aktifkan': ('aktif', lambda s: s == 'konfirmasi', 'Pesanan belum dikonfirmasi'),
+        'selesai': ('selesai', lambda s: s != 'batal', 'Pesanan sudah dibatalkan'),
+        'batal': ('batal', lambda s: s != 'selesai', 'Pesanan sudah selesai'),
+    }
+
+    # Kolom yang dibaca untuk list (sinkron dengan PesananListSerializer)
+    LIST_FIELDS = [
+        'id', 'kode_booking', 'tanggal_mulai', 'tanggal_selesai', 'total_hari',
+        'harga_total', 'denda', 'status', 'type_pesanan', 'is_corporate',
+        'perusahaan_nama', 'created_at',
+        'pelanggan__id', 'pelanggan__nama',
+        'mobil__id', 'mobil__nama_mobil', 'mobil__plat_nomor',
+        'supir__id', 'supir__nama',
+        'promo__id', 'promo__kode',
+    ]
+
     def get_serializer_class(self):
         if self.action == 'create':
             if self.request.user.is_staff:
                 return AdminCreatePesananSerializer
             return CreatePesananSerializer
+        if self.action == 'list':
+            # List pakai representasi datar; detail lengkap hanya di retrieve
+            return PesananListSerializer
         return PesananSerializer
     
     def get_queryset(self):
         user = self.request.user
         base_qs = Pesanan.objects.select_related('pelanggan', 'mobil', 'supir', 'promo')
+        if self.action == 'list':
+            base_qs = base_qs.only(*self.LIST_FIELDS)
         if user.is_staff or getattr(user, 'role', '') == 'admin':
             return base_qs.all()
-        if hasattr(user, 'pelanggan'):
-            return base_qs.filter(pelanggan=user.pelanggan)
-        return base_qs.none()
+        # Tanpa hasattr(user, 'pelanggan') (1 query ekstra); user tanpa profil pelanggan -> kosong
+        return base_qs.filter(pelanggan__user=user)
 
     # --- 1. LOGIKA SAAT MEMBUAT PESANAN (CREATE) ---
     def perform_create(self, serializer):
-        instance = serializer.save()
-        
+        # Email tidak dikirim di sini, hanya masuk antrian outbox dalam transaksi
+        # yang sama (dikirim worker `kirim_outbox`), jadi request tidak menunggu SMTP.
+        with transaction.atomic():
+            instance = serializer.save()
+            self._antre_email_pesanan_baru(instance)
+
+    def _antre_email_pesanan_baru(self, instance):
         # A. Email ke Admin (Notifikasi Order Baru)
         if instance.type_pesanan == 'online':
-            try:
-                subject_admin = f"🔔 Pesanan Baru: {instance.kode_booking}"
-                msg_admin = f"""
-                Halo Admin,
-                Ada pesanan baru masuk!
-                
-                Kode: {instance.kode_booking}
-                Mobil: {instance.mobil.nama_mobil}
-                Customer: {instance.pelanggan.nama if instance.pelanggan else 'Corporate'}
-                Total: Rp {instance.harga_total:,.0f}
-                
-                Cek dashboard sekarang.
-                """
-                send_mail(subject_admin, msg_admin, settings.EMAIL_HOST_USER, [settings.EMAIL_HOST_USER], fail_silently=True)
-            except Exception as e:
-                print(f"Gagal email admin: {e}")
+            subject_admin = f"🔔 Pesanan Baru: {instance.kode_booking}"
+            msg_admin = f"""
+            Halo Admin,
+            Ada pesanan baru masuk!
+            
+            Kode: {instance.kode_booking}
+            Mobil: {instance.mobil.nama_mobil}
+            Customer: {instance.pelanggan.nama if instance.pelanggan else 'Corporate'}
+            Total: Rp {instance.harga_total:,.0f}
+            
+            Cek dashboard sekarang.
+            """
+            antre_email(subject_admin, msg_admin, [settings.EMAIL_HOST_USER], settings.EMAIL_HOST_USER)
 
         # B. Email ke Customer (Konfirmasi Menunggu)
-        if instance.pelanggan and instance.pelanggan.user.email:
-            try:
-                subject_cust = f"⏳ Menunggu Konfirmasi: {instance.kode_booking}"
-                msg_cust = f"""
-                Halo {instance.pelanggan.nama},
-
-                Pesanan sewa mobil Anda telah kami terima.
-                Status saat ini: MENUNGGU KONFIRMASI ADMIN.
-
-                Detail:
-                Mobil: {instance.mobil.nama_mobil}
-                Tanggal: {instance.tanggal_mulai} s/d {instance.tanggal_selesai}
-                Total: Rp {instance.harga_total:,.0f}
-
-                Kami akan segera menghubungi Anda setelah mengecek ketersediaan unit.
-                """
-                send_mail(subject_cust, msg_cust, settings.EMAIL_HOST_USER, [instance.pelanggan.user.email], fail_silently=True)
-            except Exception as e:
-                print(f"Gagal email customer: {e}")
+        if instance.pelanggan and instance.pelanggan.user and instance.pelanggan.user.email:
+            subject_cust = f"⏳ Menunggu Konfirmasi: {instance.kode_booking}"
+            msg_cust = f"""
+            Halo {instance.pelanggan.nama},
+
+            Pesanan sewa mobil Anda telah kami terima.
+            Status saat ini: MENUNGGU KONFIRMASI ADMIN.
+
+            Detail:
+            Mobil: {instance.mobil.nama_mobil}
+            Tanggal: {instance.tanggal_mulai} s/d {instance.tanggal_selesai}
+            Total: Rp {instance.harga_total:,.0f}
+
+            Kami akan segera menghubungi Anda setelah mengecek ketersediaan unit.
+            """
+            antre_email(subject_cust, msg_cust, [instance.pelanggan.user.email], settings.EMAIL_HOST_USER)
 
     # --- 2. LOGIKA SAAT UPDATE (Via Form Edit) ---
     def perform_update(self, serializer):
         instance_awal = self.get_object()
         status_lama = instance_awal.status
         
-        instance_baru = serializer.save()
-        status_baru = instance_baru.status
-        
-        # Jika status berubah via Edit Form, kirim notif juga
-        if status_lama != status_baru:
-            self._kirim_email_status(instance_baru)
+        with transaction.atomic():
+            instance_baru = serializer.save()
+            status_baru = instance_baru.status
+            
+            # Jika status berubah via Edit Form, kirim notif juga
+            if status_lama != status_baru:
+                self._kirim_email_status(instance_baru)
 
-    # --- HELPER: KIRIM EMAIL STATUS ---
+    # --- HELPER: KIRIM EMAIL STATUS (via outbox) ---
     def _kirim_email_status(self, pesanan):
-        if not pesanan.pelanggan or not pesanan.pelanggan.user.email:
-            return
+        subject, message = self._isi_email_status(pesanan)
+        if subject:
+            antre_email(subject, message, [pesanan.pelanggan.user.email], settings.EMAIL_HOST_USER)
+
+    @staticmethod
+    def _isi_email_status(pesanan):
+        """Return (subject, message) email status; ('', '') jika tidak perlu email."""
+        if not pesanan.pelanggan or not pesanan.pelanggan.user or not pesanan.pelanggan.user.email:
+            return "", ""
 
-        email_to = pesanan.pelanggan.user.email
         subject = ""
         message = ""
         
@@ -119,31 +173,21 @@ class PesananViewSet(viewsets.ModelViewSet):
             if pesanan.denda > 0:
                 message += f"\n\nCatatan: Terdapat denda keterlambatan sebesar Rp {pesanan.denda:,.0f}."
 
-        if subject:
-            try:
-                send_mail(subject, message, settings.EMAIL_HOST_USER, [email_to], fail_silently=True)
-            except: pass
+        return subject, message
 
     # --- 3. CEK KETERSEDIAAN (Anti Zombie & Admin Lupa) ---
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
     def cek_ketersediaan(self, request):
-        start = request.query_params.get('start')
-        end = request.query_params.get('end')
+        start = parse_date(request.query_params.get('start') or '')
+        end = parse_date(request.query_params.get('end') or '')
         
         if not start or not end:
             return Response({"error": "Parameter tanggal wajib"}, status=400)
             
-        today = timezone.now().date()
-        
-        booked_ids = Pesanan.objects.filter(
-            tanggal_mulai__lte=end,
-            tanggal_selesai__gte=start
-        ).filter(
-            # Logic: Hanya anggap sibuk jika masa sewa MASIH BERLAKU (Hari ini atau masa depan)
-            # Pesanan masa lalu (walaupun status masih 'aktif'/'pending') dianggap available
-            (Q(status__in=['pending', 'konfirmasi']) & Q(tanggal_mulai__gte=today)) |
-            (Q(status__in=['lunas', 'sedang_disewa', 'aktif']) & Q(tanggal_selesai__gte=today))
-        ).values_list('mobil_id', flat=True)
+        # Dijawab dari index in-memory (lihat availability.py), tanpa query ke tabel pesanan.
+        # Logic: Hanya anggap sibuk jika masa sewa MASIH BERLAKU (Hari ini atau masa depan)
+        # Pesanan masa lalu (walaupun status masih 'aktif'/'pending') dianggap available
+        booked_ids = index_ketersediaan.mobil_terpakai(start, end)
         
         available_cars = Mobil.objects.filter(status='aktif').exclude(id__in=booked_ids)
         serializer = MobilSerializer(available_cars, many=True, context={'request': request})
@@ -157,11 +201,12 @@ class PesananViewSet(viewsets.ModelViewSet):
         if pesanan.status in ['selesai', 'batal']:
              return Response({'error': 'Pesanan sudah selesai/batal'}, status=400)
         
-        pesanan.status = 'konfirmasi'
-        pesanan.save()
-        
-        # Kirim Email
-        self._kirim_email_status(pesanan)
+        with transaction.atomic():
+            pesanan.status = 'konfirmasi'
+            pesanan.save()
+            
+            # Kirim Email
+            self._kirim_email_status(pesanan)
         return Response({'status': 'Pesanan dikonfirmasi'})
 
     @action(detail=True, methods=['post'], permission_classes=[IsAdminUser])
@@ -182,7 +227,7 @@ class PesananViewSet(viewsets.ModelViewSet):
         pesanan = self.get_object()
         
         # 1. Cek Keterlambatan
-        today = timezone.now().date()
+        today = timezone.localdate()
         tanggal_janji = pesanan.tanggal_selesai
         denda = 0
         info_denda = ""
@@ -199,11 +244,12 @@ class PesananViewSet(viewsets.ModelViewSet):
             if not pesanan.catatan: pesanan.catatan = ""
             pesanan.catatan += f" | {info_denda}"
 
-        pesanan.status = 'selesai'
-        pesanan.save()
-        
-        # 2. Kirim Email ke Customer
-        self._kirim_email_status(pesanan)
+        with transaction.atomic():
+            pesanan.status = 'selesai'
+            pesanan.save()
+            
+            # 2. Kirim Email ke Customer
+            self._kirim_email_status(pesanan)
         
         return Response({
             'status': 'Pesanan selesai',
@@ -219,9 +265,226 @@ class PesananViewSet(viewsets.ModelViewSet):
         if not request.user.is_staff and pesanan.status != 'pending':
             return Response({'error': 'Pesanan yang sudah diproses tidak bisa dibatalkan user.'}, status=400)
             
-        pesanan.status = 'batal'
-        pesanan.save()
-        
-        # Kirim Email
-        self._kirim_email_status(pesanan)
-        return Response({'status': 'Pesanan dibatalkan'})
\ No newline at end of file
+        with transaction.atomic():
+            pesanan.status = 'batal'
+            pesanan.save()
+            
+            # Kirim Email
+            self._kirim_email_status(pesanan)
+        return Response({'status': 'Pesanan dibatalkan'})
+
+    # --- 5. AKSI MASSAL (DISPATCH PAGI) ---
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def aksi_massal(self, request):
+        """
+        Body: {"ids": [1, 2, 3], "aksi": "konfirmasi" | "aktifkan" | "selesai" | "batal"}
+        Semua id divalidasi, yang lolos diproses dalam 1 transaksi dengan
+        UPDATE berbasis set (denda keterlambatan dihitung di database), lalu
+        email diantrikan sekaligus. Response berisi hasil per id.
+        """
+        input_serializer = AksiMassalSerializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(input_serializer.validated_data['ids']))
+        aksi = input_serializer.validated_data['aksi']
+        status_tujuan, boleh_dari, pesan_ditolak = self.TRANSISI_MASSAL[aksi]
+
+        hasil = {}
+        with transaction.atomic():
+            # Kunci baris agar status tidak berubah di antara validasi & update
+            status_sekarang = dict(
+                Pesanan.objects.select_for_update().filter(id__in=ids).values_list('id', 'status')
+            )
+
+            valid_ids = []
+            for pesanan_id in ids:
+                status_lama = status_sekarang.get(pesanan_id)
+                if status_lama is None:
+                    error = 'Pesanan tidak ditemukan'
+                elif status_lama == status_tujuan:
+                    error = f'Status pesanan sudah {status_tujuan}'
+                elif not boleh_dari(status_lama):
+                    error = pesan_ditolak
+                else:
+                    valid_ids.append(pesanan_id)
+                    continue
+                hasil[pesanan_id] = {'id': pesanan_id, 'berhasil': False, 'error': error}
+
+            if valid_ids:
+                queryset = Pesanan.objects.filter(id__in=valid_ids)
+                # update() tidak memicu signal: sinkronkan rekap & index ketersediaan manual
+                catat_perubahan_status_massal(queryset, status_tujuan)
+
+                perubahan = {'status': status_tujuan, 'updated_at': timezone.now()}
+                if aksi == 'selesai':
+                    perubahan.update(self._ekspresi_denda(timezone.localdate()))
+                queryset.update(**perubahan)
+                transaction.on_commit(index_ketersediaan.invalidasi)
+
+                daftar_email = []
+                diperbarui = Pesanan.objects.filter(id__in=valid_ids).select_related('pelanggan__user', 'mobil')
+                for pesanan in diperbarui:
+                    subject, message = self._isi_email_status(pesanan)
+                    if subject:
+                        daftar_email.append({
+                            'subject': subject,
+                            'message': message,
+                            'recipient_list': [pesanan.pelanggan.user.email],
+                            'from_email': settings.EMAIL_HOST_USER,
+                        })
+
+                    item = {'id': pesanan.id, 'berhasil': True, 'status': pesanan.status}
+                    if aksi == 'selesai':
+                        item['denda'] = pesanan.denda
+                    hasil[pesanan.id] = item
+
+                antre_email_massal(daftar_email)
+
+        return Response({
+            'aksi': aksi,
+            'berhasil': len(valid_ids),
+            'gagal': len(ids) - len(valid_ids),
+            'hasil': [hasil[pesanan_id] for pesanan_id in ids],
+        })
+
+    @staticmethod
+    def _ekspresi_denda(today):
+        """
+        Versi set-based dari hitung denda di action `selesai`:
+        denda = hari telat * harga_per_hari mobil, plus catatan keterlambatan.
+        """
+        telat = Q(tanggal_selesai__lt=today)
+        selisih_hari = SelisihHari(Value(today), F('tanggal_selesai'))
+        harga_per_hari = Subquery(Mobil.objects.filter(id=OuterRef('mobil_id')).values('harga_per_hari')[:1])
+        denda = selisih_hari * harga_per_hari
+
+        info_denda = Concat(
+            Value(' | Terlambat '), Cast(selisih_hari, CharField()),
+            Value(' hari. Denda: Rp '), Func(denda, Value('FM999,999,999,999,990'), function='TO_CHAR'),
+            output_field=CharField(),
+        )
+        return {
+            'denda': Case(When(telat, then=denda), default=F('denda'), output_field=DecimalField()),
+            'catatan': Case(
+                When(telat, then=Concat(Coalesce(F('catatan'), Value('')), info_denda, output_field=TextField())),
+                default=F('catatan'),
+                output_field=TextField(),
+            ),
+        }
+
+    # --- 6. SIMULASI HARGA (MATRIKS MOBIL x RENTANG TANGGAL) ---
+
+    @action(detail=False, methods=['post'], permission_classes=[AllowAny])
+    def simulasi_harga(self, request):
+        """
+        Body: {
+            "mobil_ids": [1, 2, 3]  atau  "katalog": {"merk": "toyota", "transmisi": "matic"},
+            "rentang": [{"tanggal_mulai": "2025-01-10", "tanggal_selesai": "2025-01-12"}, ...],
+            "supir": 4,              (opsional)
+            "kode_promo": "LEBARAN"  (opsional)
+        }
+        Semua harga dihitung sekaligus (rumus sama dengan create pesanan), lalu
+        di-cache berdasarkan hash input selama SIMULASI_HARGA_TTL detik.
+        """
+        input_serializer = SimulasiHargaSerializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+        data = input_serializer.validated_data
+
+        kunci_input = json.dumps(data, sort_keys=True, default=str)
+        cache_key = 'pesanan:simulasi_harga:' + hashlib.sha256(kunci_input.encode('utf-8')).hexdigest()
+        hasil = cache.get(cache_key)
+        if hasil is None:
+            hasil = self._hitung_simulasi_harga(data)
+            cache.set(cache_key, hasil, getattr(settings, 'SIMULASI_HARGA_TTL', 120))
+        return Response(hasil)
+
+    @staticmethod
+    def _hitung_simulasi_harga(data):
+        # 1. Harga mobil (1 query, hanya kolom yang dibutuhkan)
+        if data.get('mobil_ids'):
+            mobil_qs = Mobil.objects.filter(status='aktif', id__in=data['mobil_ids'])
+        else:
+            # Simulasi hanya untuk mobil aktif, abaikan filter status dari client
+            katalog = {k: v for k, v in data['katalog'].items() if k != 'status'}
+            mobil_qs = filter_katalog(Mobil.objects.all(), katalog)
+        daftar_mobil = list(
+            mobil_qs.order_by('harga_per_hari', 'id')
+            .values_list('id', 'nama_mobil', 'harga_per_hari')[:SimulasiHargaSerializer.MAKS_MOBIL]
+        )
+
+        # 2. Supir (opsional)
+        info_supir = None
+        harga_supir = 0
+        if data.get('supir'):
+            info_supir = Supir.objects.filter(id=data['supir']).values('id', 'nama', 'harga_per_hari').first()
+            if not info_supir:
+                raise ValidationError({"supir": "Supir tidak ditemukan."})
+            harga_supir = info_supir['harga_per_hari']
+
+        # 3. Promo (opsional). Promo tidak valid tidak error, hanya tidak dipakai.
+        promo = None
+        info_promo = None
+        kode_promo = data.get('kode_promo')
+        if kode_promo:
+            promo = Promo.objects.filter(kode__iexact=kode_promo).first()
+            if promo and promo.is_valid:
+                info_promo = {'kode': promo.kode, 'valid': True}
+            else:
+                info_promo = {
+                    'kode': kode_promo,
+                    'valid': False,
+                    'pesan': 'Kode promo tidak ditemukan, tidak aktif, sudah berakhir, atau kuota habis.',
+                }
+                promo = None
+
+        # 4. Matriks harga [mobil][rentang]
+        rentang = [(r['tanggal_mulai'], r['tanggal_selesai']) for r in data['rentang']]
+        matriks = matriks_harga([m[2] for m in daftar_mobil], rentang, harga_supir, promo)
+
+        return {
+            'rentang': [
+                {'tanggal_mulai': mulai, 'tanggal_selesai': selesai, 'durasi': durasi_sewa(mulai, selesai)}
+                for mulai, selesai in rentang
+            ],
+            'supir': info_supir,
+            'promo': info_promo,
+            'hasil': [
+                {'mobil_id': mobil_id, 'nama_mobil': nama, 'harga_per_hari': harga_per_hari, 'harga': baris}
+                for (mobil_id, nama, harga_per_hari), baris in zip(daftar_mobil, matriks)
+            ],
+        }
+
+    # --- 7. PESANAN TERLAMBAT (DASHBOARD) ---
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def terlambat(self, request):
+        """
+        Pesanan yang saat ini masih disewa melewati tanggal selesai.
+        `denda` = hasil akrual terakhir (manage.py akrual_denda),
+        `denda_berjalan` = estimasi per detik ini (jam terlambat * denda_per_jam).
+        """
+        sekarang = timezone.now()
+        data = list(
+            Pesanan.objects.filter(
+                status__in=STATUS_DISEWA,
+                tanggal_selesai__lt=timezone.localdate(sekarang),
+            ).annotate(
+                jam_terlambat=JamTerlambat(F('tanggal_selesai'), sekarang),
+                denda_berjalan=F('jam_terlambat') * F('mobil__denda_per_jam'),
+            ).order_by('tanggal_selesai').values(
+                'id', 'kode_booking', 'status', 'tanggal_selesai', 'denda',
+                'pelanggan__nama', 'pelanggan__no_hp',
+                'mobil__nama_mobil', 'mobil__plat_nomor', 'mobil__denda_per_jam',
+                'jam_terlambat', 'denda_berjalan',
+            )
+        )
+
+        terakhir = AkrualDenda.objects.order_by('-dihitung_pada').values_list('dihitung_pada', flat=True).first()
+        return Response({
+            'jumlah': len(data),
+            'total_denda': sum((row['denda'] for row in data), 0),
+            'total_denda_berjalan': sum((row['denda_berjalan'] for row in data), 0),
+            'akrual_terakhir': terakhir,
+            'pesanan': data,
+        })
+
@@ -1,14 +1,14 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
-from django.db.models import Sum, Count
+from django.db.models import Sum
 from django.db.models.functions import TruncMonth
 import datetime
 
 from mobil.models import Mobil
 from pesanan.models import Pesanan
-from pembayaran.models import Pembayaran
 from pelanggan.models import Pelanggan
+from rekap.models import RekapPesananHarian, RekapPembayaranHarian
 
 class AdminDashboardStatsView(APIView):
     permission_classes = [IsAdminUser]
@@ -16,29 +16,34 @@ class AdminDashboardStatsView(APIView):
     def get(self, request):
         current_year = datetime.datetime.now().year
 
+        # Semua angka transaksi dibaca dari tabel rekap harian (app `rekap`),
+        # bukan scan tabel pesanan/pembayaran.
+
         # 1. Total Stats
         total_mobil = Mobil.objects.count()
-        total_pesanan = Pesanan.objects.count()
-        pembayaran_lunas = Pembayaran.objects.filter(status='lunas').count()
+        total_pesanan = RekapPesananHarian.objects.aggregate(total=Sum('jumlah'))['total'] or 0
+        pembayaran_lunas = RekapPembayaranHarian.objects.filter(
+            status='lunas'
+        ).aggregate(total=Sum('jumlah_transaksi'))['total'] or 0
         total_pelanggan = Pelanggan.objects.count()
 
         # 2. Revenue Chart
-        revenue_chart = Pembayaran.objects.filter(
+        revenue_chart = RekapPembayaranHarian.objects.filter(
             status='lunas',
-            created_at__year=current_year
+            tanggal__year=current_year
         ).annotate(
-            month=TruncMonth('created_at')
+            month=TruncMonth('tanggal')
         ).values('month').annotate(
-            revenue=Sum('jumlah')
+            revenue=Sum('total_nominal')
         ).order_by('month')
 
         # 3. Orders Chart
-        orders_chart = Pesanan.objects.filter(
-            created_at__year=current_year
+        orders_chart = RekapPesananHarian.objects.filter(
+            tanggal__year=current_year
         ).annotate(
-            month=TruncMonth('created_at')
+            month=TruncMonth('tanggal')
         ).values('month').annotate(
-            orders=Count('id')
+            orders=Sum('jumlah')
         ).order_by('month')
 
         # 4. Recent Activities (UPDATE CORPORATE LOGIC)
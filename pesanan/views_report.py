@@ -1,12 +1,20 @@
 # backend/pesanan/views.py (Tambahkan ini)
 
-from django.db.models import Sum, Count
+from datetime import datetime, time, timedelta
+
+from django.db.models import Sum
 from django.db.models.functions import TruncMonth
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
-from .models import Pesanan
+from rekap.models import RekapPesananHarian, RekapPembayaranHarian
 from pembayaran.models import Pembayaran
+from .models import Pesanan
+from .ekspor import stream_csv, stream_xlsx
+from .utilisasi import PERIODE_CHOICES, hitung_utilisasi
 
 class DashboardReportView(APIView):
     permission_classes = [IsAdminUser]
@@ -16,31 +24,33 @@ class DashboardReportView(APIView):
         import datetime
         current_year = datetime.datetime.now().year
         
+        # Semua agregasi dibaca dari tabel rekap harian (app `rekap`)
+
         # Agregasi Pesanan per Bulan
-        orders_per_month = Pesanan.objects.filter(
-            created_at__year=current_year
+        orders_per_month = RekapPesananHarian.objects.filter(
+            tanggal__year=current_year
         ).annotate(
-            month=TruncMonth('created_at')
+            month=TruncMonth('tanggal')
         ).values('month').annotate(
-            total_orders=Count('id')
+            total_orders=Sum('jumlah')
         ).order_by('month')
 
         # Agregasi Revenue per Bulan (Hanya yang Lunas)
-        revenue_per_month = Pembayaran.objects.filter(
+        revenue_per_month = RekapPembayaranHarian.objects.filter(
             status='lunas',
-            created_at__year=current_year
+            tanggal__year=current_year
         ).annotate(
-            month=TruncMonth('created_at')
+            month=TruncMonth('tanggal')
         ).values('month').annotate(
-            total_revenue=Sum('jumlah')
+            total_revenue=Sum('total_nominal')
         ).order_by('month')
 
         # 2. Distribusi Tipe Mobil
-        car_types = Pesanan.objects.filter(
+        car_types = RekapPesananHarian.objects.filter(
             status__in=['konfirmasi', 'selesai']
-        ).values('mobil__jenis').annotate(
-            count=Count('id')
-        ).order_by('-count')
+        ).values('jenis_mobil').annotate(
+            count=Sum('jumlah')
+        ).filter(count__gt=0).order_by('-count')
 
         # Formatting Data untuk Frontend
         months_label = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
@@ -66,9 +76,149 @@ class DashboardReportView(APIView):
         colors = ['#3B82F6', '#10B981', '#F59E0B', '#8B5CF6', '#EC4899']
         for idx, item in enumerate(car_types):
             report_data['car_types'].append({
-                'name': item['mobil__jenis'] or 'Lainnya',
+                'name': item['jenis_mobil'] or 'Lainnya',
                 'value': item['count'],
                 'color': colors[idx % len(colors)]
             })
 
-        return Response(report_data)
\ No newline at end of file
+        return Response(report_data)
+
+# --- EKSPOR DATA (CSV / XLSX STREAMING) ---
+
+class BaseEksporView(APIView):
+    """
+    Ekspor streaming untuk finance.
+    Query params:
+    - tipe: 'csv' (default) / 'xlsx'
+    - dari, sampai: tanggal transaksi dibuat (YYYY-MM-DD, inklusif)
+    - status, is_corporate: filter opsional
+    """
+    permission_classes = [IsAdminUser]
+    queryset = None  # diisi subclass, mis. Pesanan.objects.all()
+    nama_file = 'ekspor'
+    kolom = []  # list of (header, field values_list)
+    field_tanggal = 'created_at'
+    field_corporate = 'is_corporate'
+
+    def get_queryset(self):
+        # .all() agar queryset class attribute tidak ikut ter-cache antar request
+        return self.queryset.all()
+
+    def filter_queryset(self, queryset, params):
+        # Rentang [awal hari `dari`, awal hari setelah `sampai`) dalam zona waktu lokal:
+        # range langsung di kolom (memakai index), bukan __date yang meng-cast tiap baris
+        dari = parse_date(params.get('dari') or '')
+        sampai = parse_date(params.get('sampai') or '')
+        if dari:
+            awal = timezone.make_aware(datetime.combine(dari, time.min))
+            queryset = queryset.filter(**{f'{self.field_tanggal}__gte': awal})
+        if sampai:
+            batas = timezone.make_aware(datetime.combine(sampai + timedelta(days=1), time.min))
+            queryset = queryset.filter(**{f'{self.field_tanggal}__lt': batas})
+
+        status_param = params.get('status')
+        if status_param:
+            queryset = queryset.filter(status=status_param)
+
+        is_corporate = params.get('is_corporate')
+        if is_corporate is not None:
+            queryset = queryset.filter(**{self.field_corporate: is_corporate.lower() in ['true', '1', 'yes']})
+        return queryset
+
+    def get(self, request):
+        tipe = request.query_params.get('tipe', 'csv').lower()
+        if tipe not in ['csv', 'xlsx']:
+            return Response({"error": "Parameter tipe harus 'csv' atau 'xlsx'"}, status=400)
+
+        header = [h for h, _ in self.kolom]
+        fields = [f for _, f in self.kolom]
+
+        # iterator() = server-side cursor di PostgreSQL, baris diambil per chunk
+        rows = self.filter_queryset(self.get_queryset(), request.query_params).order_by(
+            self.field_tanggal, 'id'
+        ).values_list(*fields).iterator(chunk_size=2000)
+
+        tanggal = timezone.localdate().strftime('%Y%m%d')
+        if tipe == 'xlsx':
+            response = StreamingHttpResponse(
+                stream_xlsx(header, rows, nama_sheet=self.nama_file.title()),
+                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            )
+        else:
+            response = StreamingHttpResponse(stream_csv(header, rows), content_type='text/csv; charset=utf-8')
+
+        response['Content-Disposition'] = f'attachment; filename="{self.nama_file}_{tanggal}.{tipe}"'
+        return response
+
+
+class EksporPesananView(BaseEksporView):
+    nama_file = 'pesanan'
+    kolom = [
+        ('Kode Booking', 'kode_booking'),
+        ('Tanggal Dibuat', 'created_at'),
+        ('Pelanggan', 'pelanggan__nama'),
+        ('Corporate', 'is_corporate'),
+        ('Nama Perusahaan', 'perusahaan_nama'),
+        ('NPWP', 'perusahaan_npwp'),
+        ('Mobil', 'mobil__nama_mobil'),
+        ('Plat Nomor', 'mobil__plat_nomor'),
+        ('Supir', 'supir__nama'),
+        ('Promo', 'promo__kode'),
+        ('Tanggal Mulai', 'tanggal_mulai'),
+        ('Tanggal Selesai', 'tanggal_selesai'),
+        ('Total Hari', 'total_hari'),
+        ('Harga Total', 'harga_total'),
+        ('Denda', 'denda'),
+        ('Status', 'status'),
+        ('Tipe Pesanan', 'type_pesanan'),
+    ]
+    queryset = Pesanan.objects.all()
+
+
+class EksporPembayaranView(BaseEksporView):
+    nama_file = 'pembayaran'
+    field_corporate = 'pesanan__is_corporate'
+    kolom = [
+        ('Kode Booking', 'pesanan__kode_booking'),
+        ('Tanggal Dibuat', 'created_at'),
+        ('Pelanggan', 'pesanan__pelanggan__nama'),
+        ('Corporate', 'pesanan__is_corporate'),
+        ('Nama Perusahaan', 'pesanan__perusahaan_nama'),
+        ('Metode', 'metode'),
+        ('Jumlah', 'jumlah'),
+        ('Status', 'status'),
+        ('Dicatat Oleh', 'dicatat_oleh__username'),
+        ('Catatan Admin', 'catatan_admin'),
+    ]
+    queryset = Pembayaran.objects.all()
+
+
+# --- UTILISASI ARMADA ---
+
+class UtilisasiArmadaView(APIView):
+    """
+    URL: /api/pesanan/reports/utilisasi/?dari=2024-01-01&sampai=2025-12-31&periode=bulan&limit=10
+    - periode: hari / minggu / bulan (default bulan; 'hari' maksimal 366 hari)
+    - default: 30 hari terakhir
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        sampai = parse_date(request.query_params.get('sampai') or '') or timezone.localdate()
+        dari = parse_date(request.query_params.get('dari') or '') or sampai - timedelta(days=29)
+        periode = request.query_params.get('periode', 'bulan')
+
+        if dari > sampai:
+            return Response({"error": "Tanggal 'dari' tidak boleh setelah 'sampai'"}, status=400)
+        if periode not in PERIODE_CHOICES:
+            return Response({"error": "Parameter periode harus 'hari', 'minggu' atau 'bulan'"}, status=400)
+        if periode == 'hari' and (sampai - dari).days >= 366:
+            return Response({"error": "Periode harian maksimal 366 hari, gunakan 'minggu' atau 'bulan'"}, status=400)
+
+        try:
+            limit = max(int(request.query_params.get('limit', 10)), 1)
+        except ValueError:
+            limit = 10
+
+        return Response(hitung_utilisasi(dari, sampai, periode=periode, limit=limit))
+
@@ -0,0 +1,170 @@
+"""
+Varian gambar responsif (lebar tetap + WebP) untuk Mobil, Supir & konten_web.
+
+Peta varian dihitung SEKALI saat file berubah (signals post_save di tiap app)
+lalu disimpan di JSONField model, jadi serializer cukup membaca field:
+
+    {
+        "sumber": "<public_id / nama file>",   # penanda untuk deteksi perubahan
+        "asli": "<url>",
+        "lebar": [320, 640, ...],
+        "jpg": {"320": "<url>", ...},          # format asli
+        "webp": {"320": "<url>", ...},
+        "srcset": "<url> 320w, <url> 640w, ...",
+        "srcset_webp": "..."
+    }
+
+- CloudinaryField: URL transformasi Cloudinary (c_limit,w_N,q_auto), tanpa upload ulang.
+- ImageField di storage lokal: file varian dibuat dengan Pillow di folder
+  `<folder>/varian/`. URL-nya relatif (MEDIA_URL), diabsolutkan serializer.
+- Video tidak punya varian (hanya "asli").
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+LEBAR_VARIAN = [320, 640, 1024, 1600]
+FORMAT_VIDEO = {'mp4', 'webm', 'mov', 'mkv', 'avi'}
+
+# (model, field gambar, field varian) untuk backfill `manage.py buat_varian_gambar`
+MODEL_BERGAMBAR = [
+    ('mobil.Mobil', 'gambar', 'gambar_varian'),
+    ('supir.Supir', 'foto', 'foto_varian'),
+    ('konten_web.HeroSection', 'background_media', 'media_varian'),
+    ('konten_web.Dokumentasi', 'file_media', 'media_varian'),
+]
+
+
+def _peta(sumber, asli, lebar, url_jpg, url_webp):
+    return {
+        'sumber': sumber,
+        'asli': asli,
+        'lebar': lebar,
+        'jpg': {str(w): url_jpg[w] for w in lebar},
+        'webp': {str(w): url_webp[w] for w in lebar},
+        'srcset': ', '.join(f'{url_jpg[w]} {w}w' for w in lebar),
+        'srcset_webp': ', '.join(f'{url_webp[w]} {w}w' for w in lebar),
+    }
+
+
+# --- 1. CLOUDINARY ---
+
+def varian_cloudinary(resource):
+    """`resource`: nilai CloudinaryField (CloudinaryResource)."""
+    sumber = resource.public_id
+    asli = resource.build_url(secure=True)
+    format_asli = (resource.format or '').lower()
+    if resource.resource_type == 'video' or format_asli in FORMAT_VIDEO:
+        return {'sumber': sumber, 'asli': asli}
+
+    url_jpg = {w: resource.build_url(width=w, crop='limit', quality='auto', secure=True) for w in LEBAR_VARIAN}
+    url_webp = {
+        w: resource.build_url(width=w, crop='limit', quality='auto', format='webp', secure=True)
+        for w in LEBAR_VARIAN
+    }
+    return _peta(sumber, asli, LEBAR_VARIAN, url_jpg, url_webp)
+
+
+# --- 2. STORAGE LOKAL (PILLOW) ---
+
+def _simpan(storage, nama, gambar, format_pil, **opsi):
+    buffer = BytesIO()
+    gambar.save(buffer, format=format_pil, **opsi)
+    if storage.exists(nama):
+        storage.delete(nama)
+    return storage.save(nama, ContentFile(buffer.getvalue()))
+
+
+def varian_lokal(fieldfile):
+    """Buat file varian untuk ImageField; lebar di atas ukuran asli dilewati (tidak di-upscale)."""
+    storage = fieldfile.storage
+    folder, nama_file = os.path.split(fieldfile.name)
+    stem, ext = os.path.splitext(nama_file)
+    folder_varian = os.path.join(folder, 'varian')
+
+    with fieldfile.open('rb') as f:
+        gambar = ImageOps.exif_transpose(Image.open(f))
+        gambar.load()
+
+    format_pil = 'PNG' if gambar.format == 'PNG' or gambar.mode in ('RGBA', 'LA', 'P') else 'JPEG'
+    ext_varian = '.png' if format_pil == 'PNG' else '.jpg'
+    if format_pil == 'JPEG' and gambar.mode != 'RGB':
+        gambar = gambar.convert('RGB')
+
+    lebar = [w for w in LEBAR_VARIAN if w < gambar.width] or [gambar.width]
+    url_jpg, url_webp = {}, {}
+    for w in lebar:
+        kecil = gambar.copy()
+        kecil.thumbnail((w, w * 10), Image.LANCZOS)
+        nama = _simpan(storage, os.path.join(folder_varian, f'{stem}_{w}{ext_varian}'), kecil, format_pil,
+                       **({'quality': 82, 'optimize': True, 'progressive': True} if format_pil == 'JPEG' else {'optimize': True}))
+        url_jpg[w] = storage.url(nama)
+        nama = _simpan(storage, os.path.join(folder_varian, f'{stem}_{w}.webp'), kecil, 'WEBP', quality=80, method=4)
+        url_webp[w] = storage.url(nama)
+
+    return _peta(fieldfile.name, fieldfile.url, lebar, url_jpg, url_webp)
+
+
+# --- 3. SINKRONISASI (dipanggil dari signals) ---
+
+def hitung_varian(nilai):
+    """Peta varian untuk nilai field gambar (CloudinaryResource / FieldFile); {} jika kosong."""
+    if not nilai:
+        return {}
+    if hasattr(nilai, 'build_url'):
+        return varian_cloudinary(nilai)
+    return varian_lokal(nilai)
+
+
+def sumber_gambar(nilai):
+    if not nilai:
+        return None
+    return getattr(nilai, 'public_id', None) or getattr(nilai, 'name', None)
+
+
+def sinkron_varian(instance, field_gambar, field_varian, paksa=False):
+    """
+    Hitung ulang varian jika file gambar berubah, simpan lewat queryset.update
+    (tanpa memicu post_save lagi). Return True jika ada perubahan.
+    """
+    nilai = getattr(instance, field_gambar)
+    field = instance._meta.get_field(field_gambar)
+    if isinstance(nilai, str) and hasattr(field, 'parse_cloudinary_resource'):
+        # Nilai di-assign sebagai string ("image/upload/v1/..."), bukan hasil upload
+        nilai = field.to_python(nilai)
+    varian_lama = getattr(instance, field_varian) or {}
+    if not paksa and varian_lama.get('sumber') == sumber_gambar(nilai):
+        return False
+    try:
+        varian = hitung_varian(nilai)
+    except Exception:
+        # File rusak / bukan gambar: jangan gagalkan penyimpanan data, serializer fallback ke URL asli
+        logger.exception("Gagal membuat varian %s.%s pk=%s", instance._meta.label, field_gambar, instance.pk)
+        varian = {}
+    setattr(instance, field_varian, varian)
+    type(instance).objects.filter(pk=instance.pk).update(**{field_varian: varian})
+    return True
+
+
+def absolutkan(varian, request):
+    """URL relatif (storage lokal) -> absolut; URL Cloudinary sudah absolut dan dibiarkan."""
+    if not varian or request is None:
+        return varian
+
+    def _abs(url):
+        return request.build_absolute_uri(url) if url.startswith('/') else url
+
+    hasil = dict(varian)
+    hasil['asli'] = _abs(varian['asli'])
+    for kunci in ('jpg', 'webp'):
+        if kunci in varian:
+            hasil[kunci] = {w: _abs(url) for w, url in varian[kunci].items()}
+    if 'lebar' in varian:
+        hasil['srcset'] = ', '.join(f"{hasil['jpg'][str(w)]} {w}w" for w in varian['lebar'])
+        hasil['srcset_webp'] = ', '.join(f"{hasil['webp'][str(w)]} {w}w" for w in varian['lebar'])
+    return hasil
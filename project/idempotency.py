@@ -0,0 +1,107 @@
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from pesanan.models import IdempotencyKey
+
+HEADER_IDEMPOTENCY = 'HTTP_IDEMPOTENCY_KEY'
+
+
+def batas_kadaluarsa():
+    """Key dengan created_at sebelum waktu ini sudah kadaluarsa (IDEMPOTENCY_TTL)."""
+    return timezone.now() - datetime.timedelta(seconds=getattr(settings, 'IDEMPOTENCY_TTL', 60 * 60 * 24))
+
+
+def hapus_key_kadaluarsa(ukuran_batch=5000):
+    """
+    Hapus key kadaluarsa per batch (index created_at) agar tabel tidak tumbuh
+    tanpa batas. Return jumlah baris yang dihapus.
+    """
+    batas = batas_kadaluarsa()
+    total = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(created_at__lt=batas)
+            .order_by('created_at').values_list('pk', flat=True)[:ukuran_batch]
+        )
+        if not ids:
+            return total
+        total += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
+
+
+class IdempotentCreateMixin:
+    """
+    Dukungan header `Idempotency-Key` untuk `create` (POST) pada ViewSet.
+
+    - Key dicatat di tabel `idempotency_key` (pesanan.IdempotencyKey) dalam
+      transaksi yang SAMA dengan create-nya. Unique (pemilik, scope, key)
+      membuat retry paralel di worker lain menunggu di index sampai request
+      pertama commit / rollback, jadi tidak mungkin membuat data dua kali.
+    - Retry dengan key yang sama (user yang sama) langsung menerima response
+      tersimpan, tanpa validasi / upload ulang (header `Idempotency-Replayed: true`).
+    - Key yang sama dengan isi request berbeda -> 422.
+    - Response gagal ikut di-rollback (key tidak tersimpan), jadi retry diproses ulang.
+    - Key lebih tua dari IDEMPOTENCY_TTL detik dianggap belum pernah dipakai dan
+      dibersihkan berkala oleh `manage.py hapus_idempotency_kadaluarsa`.
+    """
+
+    def _kunci_idempotency(self, request, key):
+        pemilik = str(request.user.pk) if request.user and request.user.is_authenticated else 'anon'
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return {'pemilik': pemilik, 'scope': self.__class__.__name__, 'key': digest}
+
+    @staticmethod
+    def _sidik_request(request):
+        """Sidik isi request (field biasa + nama & ukuran file, tanpa membaca isi file)."""
+        bagian = []
+        for nama in sorted(request.data.keys()):
+            for nilai in (request.data.getlist(nama) if hasattr(request.data, 'getlist') else [request.data[nama]]):
+                if hasattr(nilai, 'size') and hasattr(nilai, 'name'):
+                    nilai = f'<file {nilai.name} {nilai.size}>'
+                bagian.append(f'{nama}={nilai}')
+        return hashlib.sha256('\n'.join(bagian).encode('utf-8')).hexdigest()
+
+    def _klaim_key(self, kunci, sidik):
+        """Return (baris baru, None) jika key belum dipakai, atau (None, baris lama)."""
+        IdempotencyKey.objects.filter(**kunci, created_at__lt=batas_kadaluarsa()).delete()
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(**kunci, sidik=sidik), None
+        except IntegrityError:
+            return None, IdempotencyKey.objects.get(**kunci)
+
+    def create(self, request, *args, **kwargs):
+        key = request.META.get(HEADER_IDEMPOTENCY)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > 255:
+            return Response({"error": "Idempotency-Key maksimal 255 karakter."}, status=status.HTTP_400_BAD_REQUEST)
+
+        sidik = self._sidik_request(request)
+        with transaction.atomic():
+            baris, tersimpan = self._klaim_key(self._kunci_idempotency(request, key), sidik)
+            if tersimpan is not None:
+                if tersimpan.sidik != sidik:
+                    return Response(
+                        {"error": "Idempotency-Key sudah dipakai untuk request dengan isi berbeda."},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                headers = dict(tersimpan.headers, **{'Idempotency-Replayed': 'true'})
+                return Response(tersimpan.data, status=tersimpan.status_code, headers=headers)
+
+            response = super().create(request, *args, **kwargs)
+            if not status.is_success(response.status_code):
+                # Buang key beserta apa pun yang sempat ditulis create yang gagal
+                transaction.set_rollback(True)
+                return response
+
+            baris.status_code = response.status_code
+            baris.data = response.data
+            baris.headers = {k: v for k, v in response.items() if k == 'Location'}
+            baris.save(update_fields=['status_code', 'data', 'headers'])
+        return response
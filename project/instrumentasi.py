@@ -0,0 +1,193 @@
+"""
+Instrumentasi per request: jumlah query, waktu DB, dan segmen lain
+(serializer, render JSON, email SMTP, upload Cloudinary).
+
+Hasilnya dikirim sebagai header `Server-Timing` (terlihat di tab Network /
+Timing devtools browser) dan sebagai log terstruktur di logger
+`project.instrumentasi`. Hanya sebagian request yang diukur, sesuai
+INSTRUMENTASI_SAMPLE_RATE (0.0 - 1.0).
+
+Menandai segmen baru di kode:
+    from project.instrumentasi import ukur
+    with ukur('email'):
+        ...
+Di luar request yang sedang diukur (worker, command), `ukur` tidak melakukan apa-apa.
+
+Segmen bawaan:
+- view       : kode Python view di luar query DB (permission, queryset,
+               serializer to_representation), dari URL ter-resolve sampai
+               response DRF mulai di-render (JSONRendererTerukur)
+- render     : encoding JSON
+- cloudinary : upload file di `CloudinaryField.pre_save` (ukur_upload_cloudinary)
+- email      : pengiriman SMTP di notifikasi/outbox.py
+
+Field ringkasan ikut di log sebagai `record.instrumentasi` (extra); formatter
+`project.log.FormatterTerstruktur` menuliskannya sebagai JSON di akhir baris.
+"""
+import functools
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from cloudinary.models import CloudinaryField
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+_pengukuran_aktif = ContextVar('pengukuran_aktif', default=None)
+
+
+class Pengukuran:
+    def __init__(self):
+        self.mulai = time.perf_counter()
+        self.jumlah_query = 0
+        self.waktu_db = 0.0
+        # nama segmen -> [total detik, jumlah panggilan]
+        self.segmen = {}
+        # (waktu mulai, waktu DB saat itu) sejak URL ter-resolve, ditutup saat render
+        self.awal_view = None
+
+    def tambah(self, nama, durasi):
+        total = self.segmen.setdefault(nama, [0.0, 0])
+        total[0] += durasi
+        total[1] += 1
+
+    def mulai_view(self):
+        self.awal_view = (time.perf_counter(), self.waktu_db)
+
+    def tutup_view(self):
+        if self.awal_view is None:
+            return
+        mulai, db_awal = self.awal_view
+        self.awal_view = None
+        self.tambah('view', time.perf_counter() - mulai - (self.waktu_db - db_awal))
+
+    def catat_query(self, execute, sql, params, many, context):
+        mulai = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.waktu_db += time.perf_counter() - mulai
+            self.jumlah_query += 1
+
+    def ringkasan(self):
+        data = {
+            'total_ms': round((time.perf_counter() - self.mulai) * 1000, 1),
+            'db_query': self.jumlah_query,
+            'db_ms': round(self.waktu_db * 1000, 1),
+        }
+        for nama, (durasi, jumlah) in self.segmen.items():
+            data[f'{nama}_ms'] = round(durasi * 1000, 1)
+            data[f'{nama}_jumlah'] = jumlah
+        return data
+
+    def server_timing(self, ringkasan):
+        bagian = [f'db;dur={ringkasan["db_ms"]};desc="{ringkasan["db_query"]} query"']
+        for nama in self.segmen:
+            bagian.append(f'{nama};dur={ringkasan[f"{nama}_ms"]}')
+        bagian.append(f'total;dur={ringkasan["total_ms"]}')
+        return ', '.join(bagian)
+
+
+@contextmanager
+def ukur(nama):
+    """Ukur durasi blok kode sebagai segmen `nama` pada request yang sedang diukur."""
+    pengukuran = _pengukuran_aktif.get()
+    if pengukuran is None:
+        yield
+        return
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        pengukuran.tambah(nama, time.perf_counter() - mulai)
+
+
+class JSONRendererTerukur(JSONRenderer):
+    """
+    JSONRenderer biasa, waktu render dicatat sebagai segmen 'render'. Render
+    adalah titik pertama setelah view selesai, jadi segmen 'view' ditutup di sini.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        pengukuran = _pengukuran_aktif.get()
+        if pengukuran is not None:
+            pengukuran.tutup_view()
+        with ukur('render'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+def ukur_upload_cloudinary(model):
+    """
+    Bungkus `pre_save` tiap CloudinaryField milik `model` agar upload file baru
+    tercatat sebagai segmen 'cloudinary'. Upload tetap dikerjakan pre_save
+    bawaan library. Dipanggil dari AppConfig.ready; idempoten.
+    """
+    for field in model._meta.concrete_fields:
+        if isinstance(field, CloudinaryField) and not getattr(field.pre_save, 'terukur', False):
+            field.pre_save = _pre_save_terukur(field.pre_save, field.attname)
+
+
+def _pre_save_terukur(pre_save, attname):
+    @functools.wraps(pre_save)
+    def bungkus(model_instance, add):
+        if not isinstance(getattr(model_instance, attname), UploadedFile):
+            return pre_save(model_instance, add)
+        with ukur('cloudinary'):
+            return pre_save(model_instance, add)
+
+    bungkus.terukur = True
+    return bungkus
+
+
+class InstrumentasiMiddleware:
+    """Pasang paling atas di MIDDLEWARE agar middleware lain ikut terukur."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Penghitung query selalu aktif (murah) & dibagikan lewat `request.pengukuran`
+        # ke MetrikMiddleware; segmen, header & log hanya untuk request yang disampel.
+        pengukuran = Pengukuran()
+        request.pengukuran = pengukuran
+        sample_rate = getattr(settings, 'INSTRUMENTASI_SAMPLE_RATE', 0.0)
+        disampel = sample_rate > 0 and random.random() < sample_rate
+
+        token = _pengukuran_aktif.set(pengukuran) if disampel else None
+        try:
+            with connection.execute_wrapper(pengukuran.catat_query):
+                response = self.get_response(request)
+        finally:
+            if token is not None:
+                _pengukuran_aktif.reset(token)
+        if not disampel:
+            return response
+
+        ringkasan = pengukuran.ringkasan()
+        response['Server-Timing'] = pengukuran.server_timing(ringkasan)
+
+        match = getattr(request, 'resolver_match', None)
+        ringkasan.update({
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+        })
+        logger.info(
+            "%s %s %s %sms db=%s/%sms",
+            request.method, request.path, response.status_code,
+            ringkasan['total_ms'], ringkasan['db_query'], ringkasan['db_ms'],
+            extra={'instrumentasi': ringkasan},
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        pengukuran = _pengukuran_aktif.get()
+        if pengukuran is not None:
+            pengukuran.mulai_view()
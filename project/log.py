@@ -0,0 +1,25 @@
+"""
+Formatter log proyek (settings 11. LOGGING).
+
+`FormatterTerstruktur` = formatter teks biasa, ditambah field terstruktur yang
+dikirim lewat `extra` (saat ini `instrumentasi`, project/instrumentasi.py) sebagai
+JSON satu baris di akhir pesan, mis.:
+
+    INFO 2025-10-22 16:11:52,190 instrumentasi GET /api/mobil/ 200 12.3ms db=5/1.4ms {"total_ms": 12.3, ...}
+
+`manage.py analisis_log` tetap membaca bagian depan baris; field JSON tersedia
+untuk agregator log.
+"""
+import json
+import logging
+
+FIELD_TERSTRUKTUR = ('instrumentasi',)
+
+
+class FormatterTerstruktur(logging.Formatter):
+    def format(self, record):
+        teks = super().format(record)
+        data = {nama: getattr(record, nama) for nama in FIELD_TERSTRUKTUR if hasattr(record, nama)}
+        if not data:
+            return teks
+        return f"{teks} {json.dumps(data, default=str, separators=(',', ':'))}"
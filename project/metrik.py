@@ -0,0 +1,104 @@
+"""
+Metrik Prometheus per route (nama URL / DRF route, mis. `pesanan-cek-ketersediaan`).
+
+- http_request_duration_seconds   histogram latency
+- http_requests_total             counter per status code
+- http_db_queries_total           counter jumlah query DB
+- http_db_duration_seconds_total  counter total waktu DB
+- http_requests_in_flight         gauge request yang sedang berjalan
+
+Mode multiprocess (gunicorn): set env PROMETHEUS_MULTIPROC_DIR sebelum worker
+start (sudah diatur di gunicorn.conf.py), nilai tiap worker ditulis ke file di
+folder itu dan digabung saat /metrics dibaca. Tanpa env tersebut (runserver),
+registry biasa di memori proses yang dipakai.
+
+Jumlah & waktu query dibaca dari `request.pengukuran` milik
+InstrumentasiMiddleware (project/instrumentasi.py), jadi middleware itu harus
+dipasang DI ATAS MetrikMiddleware; tanpa itu metrik DB dilewati.
+"""
+import os
+import time
+
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess,
+)
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.views import APIView
+
+ROUTE_TIDAK_DIKENAL = 'tidak_dikenal'
+
+LATENCY = Histogram(
+    'http_request_duration_seconds', 'Latency request per route',
+    ['route', 'method'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS = Counter('http_requests_total', 'Jumlah request per route & status', ['route', 'method', 'status'])
+DB_QUERIES = Counter('http_db_queries_total', 'Jumlah query DB per route', ['route'])
+DB_DURATION = Counter('http_db_duration_seconds_total', 'Total waktu query DB per route', ['route'])
+IN_FLIGHT = Gauge(
+    'http_requests_in_flight', 'Request yang sedang diproses per route',
+    ['route'], multiprocess_mode='livesum',
+)
+
+
+class MetrikMiddleware:
+    """
+    Route baru diketahui setelah URL di-resolve, jadi gauge in-flight dinaikkan
+    di `process_view` dan diturunkan setelah response selesai.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mulai = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            route = getattr(request, '_metrik_route', None)
+            if route is not None:
+                IN_FLIGHT.labels(route).dec()
+
+        route = route or ROUTE_TIDAK_DIKENAL
+        LATENCY.labels(route, request.method).observe(time.perf_counter() - mulai)
+        REQUESTS.labels(route, request.method, str(response.status_code)).inc()
+        pengukuran = getattr(request, 'pengukuran', None)
+        if pengukuran is not None and pengukuran.jumlah_query:
+            DB_QUERIES.labels(route).inc(pengukuran.jumlah_query)
+            DB_DURATION.labels(route).inc(pengukuran.waktu_db)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        route = (match.view_name if match else None) or ROUTE_TIDAK_DIKENAL
+        request._metrik_route = route
+        IN_FLIGHT.labels(route).inc()
+
+
+def _registry():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+class PrometheusTextRenderer(BaseRenderer):
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+class MetrikView(APIView):
+    """GET /metrics - format teks Prometheus (khusus admin, scraper pakai Bearer token)."""
+    permission_classes = [IsAdminUser]
+    renderer_classes = [PrometheusTextRenderer]
+
+    def get(self, request):
+        return HttpResponse(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,152 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import BooleanField, DateTimeField, F, Func, IntegerField, Value
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PerbandinganRow(Func):
+    """
+    `(created_at, id) < (%s, %s)`: perbandingan row value, dieksekusi sebagai satu
+    range scan di index (created_at, id), bukan OR bertingkat.
+    """
+    output_field = BooleanField()
+
+    def __init__(self, operator, created_at, pk):
+        self.operator = operator
+        super().__init__(
+            F('created_at'), F('id'),
+            Value(created_at, output_field=DateTimeField()), Value(pk, output_field=IntegerField()),
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        bagian, params = [], []
+        for expr in self.source_expressions:
+            sql, p = compiler.compile(expr)
+            bagian.append(sql)
+            params.extend(p)
+        return f'({bagian[0]}, {bagian[1]}) {self.operator} ({bagian[2]}, {bagian[3]})', params
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Pagination keyset berbasis (created_at, id): cursor berisi nilai
+    (created_at, id) baris terakhir / pertama halaman, halaman berikutnya
+    diambil dengan `WHERE (created_at, id) < (...) ORDER BY created_at DESC,
+    id DESC LIMIT n+1`. Tanpa COUNT(*) dan tanpa OFFSET, jadi halaman ke-1000
+    sama cepatnya dengan halaman 1. Format response sama dengan CursorPagination
+    DRF (`next`, `previous`, `results`).
+
+    Mode cursor aktif jika request mengirim `?cursor=...` atau `?paginasi=cursor`.
+    Selain itu tetap memakai PageNumberPagination (`?page=`) seperti sebelumnya,
+    supaya client lama tidak rusak.
+
+    Mode cursor hanya mendukung urutan (created_at, id) terbaru dulu. Jika
+    request juga mengirim `?ordering=` selain `-created_at` / `-created_at,-id`,
+    response 400: urutan lain tidak bisa dilanjutkan dengan cursor
+    (created_at, id), dan mengabaikannya diam-diam akan mengembalikan urutan
+    yang tidak diminta client. Untuk urutan lain pakai `?page=`.
+    """
+    ordering = ('-created_at', '-id')
+    ordering_cocok = (('-created_at',), ('-created_at', '-id'))
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
+    mode_query_param = 'paginasi'
+
+    def __init__(self):
+        self._page_number = None
+
+    def _pakai_cursor(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self._pakai_cursor(request):
+            self._page_number = PageNumberPagination()
+            return self._page_number.paginate_queryset(queryset, request, view)
+
+        self._cek_ordering(request)
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        posisi = self._decode_cursor(request)
+        mundur = posisi is not None and posisi[2]
+        if posisi is None:
+            queryset = queryset.order_by('-created_at', '-id')
+        elif mundur:
+            # Halaman sebelumnya: ambil n baris tepat di atas cursor (urut naik), lalu dibalik
+            queryset = queryset.filter(PerbandinganRow('>', posisi[0], posisi[1])).order_by('created_at', 'id')
+        else:
+            queryset = queryset.filter(PerbandinganRow('<', posisi[0], posisi[1])).order_by('-created_at', '-id')
+
+        rows = list(queryset[:self.page_size + 1])
+        ada_lagi = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if mundur:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, ada_lagi
+        else:
+            self.has_next, self.has_previous = ada_lagi, posisi is not None
+        return self.page
+
+    def _cek_ordering(self, request):
+        teks = request.query_params.get(api_settings.ORDERING_PARAM)
+        if not teks:
+            return
+        fields = tuple(f.strip() for f in teks.split(',') if f.strip())
+        if fields and fields not in self.ordering_cocok:
+            raise ValidationError({
+                api_settings.ORDERING_PARAM: (
+                    'Paginasi cursor hanya mendukung ordering=-created_at. '
+                    'Gunakan ?page= untuk urutan lain.'
+                ),
+            })
+
+    def _decode_cursor(self, request):
+        """Return None (halaman pertama) atau (created_at, id, mundur)."""
+        teks = request.query_params.get(self.cursor_query_param)
+        if not teks:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(teks.encode('ascii')))
+            created_at = parse_datetime(data['c'])
+            pk = int(data['i'])
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk, bool(data.get('m'))
+
+    def _link(self, obj, mundur):
+        data = {'c': obj.created_at.isoformat(), 'i': obj.pk}
+        if mundur:
+            data['m'] = 1
+        teks = base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, teks)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], mundur=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], mundur=True)
+
+    def get_paginated_response(self, data):
+        if self._page_number is not None:
+            return self._page_number.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self._page_number is not None:
+            return self._page_number.get_html_context()
+        return super().get_html_context()
@@ -0,0 +1,79 @@
+import operator
+from functools import reduce
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import FloatField, Q, Value
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Coalesce, Greatest
+from rest_framework import filters
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    Pengganti `filters.SearchFilter` (parameter & `search_fields` sama) yang
+    dilayani index GIN pg_trgm.
+
+    - `icontains` di PostgreSQL = `UPPER(kolom::text) LIKE UPPER('%x%')`, jadi
+      index dibuat di `OpClass(Upper(kolom), name='gin_trgm_ops')` agar cocok.
+    - Field relasi (`pelanggan__nama`) tidak di-OR lewat JOIN (planner jatuh ke
+      seq scan), tapi jadi `pelanggan_id IN (SELECT id FROM pelanggan WHERE ...)`
+      sehingga tiap tabel memakai index trigram-nya sendiri.
+    - `?search_rank=1`: urutkan hasil berdasarkan kemiripan (word_similarity).
+      Taruh filter ini SETELAH OrderingFilter di `filter_backends`. Tidak
+      berlaku di mode cursor karena urutannya dikunci oleh paginator.
+    """
+    rank_param = 'search_rank'
+
+    def _kondisi(self, model, orm_lookup, term):
+        nama, _, sisa = orm_lookup.partition(LOOKUP_SEP)
+        try:
+            field = model._meta.pk if nama == 'pk' else model._meta.get_field(nama)
+        except FieldDoesNotExist:
+            # Anotasi / lookup custom: biarkan Django yang menyelesaikan
+            field = None
+        relasi_maju = (
+            field is not None and sisa and field.is_relation and field.concrete
+            and (field.many_to_one or field.one_to_one)
+        )
+        if relasi_maju:
+            related = field.related_model
+            subquery = related._default_manager.filter(self._kondisi(related, sisa, term)).values('pk')
+            return Q(**{f'{nama}__in': subquery})
+        return Q(**{orm_lookup: term})
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+
+        if not search_fields or not search_terms:
+            return queryset
+
+        orm_lookups = [
+            self.construct_search(str(search_field), queryset)
+            for search_field in search_fields
+        ]
+
+        # Setiap kata wajib cocok di salah satu field (perilaku sama dengan SearchFilter)
+        conditions = (
+            reduce(operator.or_, (self._kondisi(queryset.model, orm_lookup, term) for orm_lookup in orm_lookups))
+            for term in search_terms
+        )
+        queryset = queryset.filter(reduce(operator.and_, conditions))
+
+        if request.query_params.get(self.rank_param, '').lower() in ['true', '1', 'yes']:
+            queryset = self._urutkan_kemiripan(queryset, search_fields, ' '.join(search_terms))
+        return queryset
+
+    def _urutkan_kemiripan(self, queryset, search_fields, teks):
+        fields = [
+            field[1:] if field[0] in self.lookup_prefixes else field
+            for field in map(str, search_fields)
+        ]
+        skor = [TrigramWordSimilarity(teks, field) for field in fields]
+        skor = skor[0] if len(skor) == 1 else Greatest(*skor)
+
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.annotate(
+            skor_pencarian=Coalesce(skor, Value(0.0), output_field=FloatField())
+        ).order_by('-skor_pencarian', *ordering)
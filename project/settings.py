@@ -3,6 +3,7 @@ import os
 import dj_database_url
 from datetime import timedelta
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
@@ -29,6 +30,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles', 
+    'django.contrib.postgres',
     
     # Cloudinary - Wajib di bawah staticfiles agar CSS Admin tidak rusak
     'cloudinary_storage', 
@@ -42,10 +44,14 @@ INSTALLED_APPS = [
 
     # Local apps
     'users', 'pelanggan', 'mobil', 'supir', 'promo', 'pesanan', 'pembayaran', 'konten_web',
+    'notifikasi', 'rekap',
 ]
 
 # 5. MIDDLEWARE
 MIDDLEWARE = [
+    # Paling atas agar seluruh request (termasuk middleware lain) ikut terukur
+    'project.instrumentasi.InstrumentasiMiddleware',
+    'project.metrik.MetrikMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware', 
     'corsheaders.middleware.CorsMiddleware', 
@@ -150,6 +156,10 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Header tambahan: Idempotency-Key (retry aman untuk POST pesanan/pembayaran)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotency-Replayed', 'Server-Timing']
+
 CSRF_TRUSTED_ORIGINS = [
     "http://localhost:3000",
     "https://niagakaryamandiri-rentalmobilpadang.vercel.app",
@@ -166,6 +176,11 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticatedOrReadOnly'],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_RENDERER_CLASSES': [
+        # JSONRenderer + pengukuran waktu render (project/instrumentasi.py)
+        'project.instrumentasi.JSONRendererTerukur',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 SIMPLE_JWT = {
@@ -180,18 +195,98 @@ AUTH_USER_MODEL = 'users.User'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # 11. LOGGING
+# Default hanya console (stdout, dikumpulkan platform). LOG_FILE=/path/django.log
+# menambah WatchedFileHandler: rotasi diserahkan ke logrotate, aman dipakai
+# banyak worker. Format `verbose` = format yang dibaca `manage.py analisis_log`.
+LOG_FILE = os.getenv('LOG_FILE')
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
-    'handlers': {'console': {'class': 'logging.StreamHandler'}},
+    'formatters': {
+        # + field `extra` terstruktur (instrumentasi) sebagai JSON di akhir baris (project/log.py)
+        'verbose': {
+            'class': 'project.log.FormatterTerstruktur',
+            'format': '{levelname} {asctime} {module} {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'verbose'},
+    },
     'root': {'handlers': ['console'], 'level': 'INFO'},
 }
+if LOG_FILE:
+    LOGGING['handlers']['file'] = {
+        'class': 'logging.handlers.WatchedFileHandler',
+        'filename': LOG_FILE,
+        'encoding': 'utf-8',
+        'formatter': 'verbose',
+    }
+    LOGGING['root']['handlers'].append('file')
+
+# Instrumentasi per request (project/instrumentasi.py): header Server-Timing +
+# log `project.instrumentasi`. Fraksi request yang diukur, 0 = nonaktif.
+INSTRUMENTASI_SAMPLE_RATE = float(os.getenv('INSTRUMENTASI_SAMPLE_RATE', '1.0' if DEBUG else '0.1'))
 
 # 12. EMAIL (SMTP GMAIL)
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Bisa diganti ke locmem/console untuk testing lokal
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
-DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
\ No newline at end of file
+DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+
+# Outbox email (notifikasi/outbox.py). Worker: `manage.py kirim_outbox --loop`
+# OUTBOX_KIRIM_OTOMATIS: kirim juga di thread latar setelah commit (fallback tanpa worker)
+OUTBOX_KIRIM_OTOMATIS = os.getenv('OUTBOX_KIRIM_OTOMATIS', 'True') == 'True'
+OUTBOX_UKURAN_BATCH = 50
+OUTBOX_MAKS_PERCOBAAN = 5
+OUTBOX_BACKOFF_DETIK = 30
+# Lama klaim batch oleh satu worker; lewat dari ini email dianggap belum terkirim
+OUTBOX_KLAIM_DETIK = 300
+
+# 13. CACHE
+# Sebaiknya dibagi antar worker gunicorn & proses manage.py (Redis): index
+# ketersediaan, versi katalog, dan rate limit bergantung padanya.
+# Tanpa REDIS_URL dipakai LocMem (per proses): tetap jalan, tapi sinkronisasi
+# antar worker hanya lewat TTL pendek di bawah (peringatan di log saat start).
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Idempotency-Key (project/idempotency.py): simpan response sukses selama N detik
+IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', str(60 * 60 * 24)))
+
+# Cache endpoint simulasi_harga (detik). Harga final tetap dihitung ulang saat create pesanan.
+SIMULASI_HARGA_TTL = int(os.getenv('SIMULASI_HARGA_TTL', '120'))
+
+# Cache katalog publik mobil (mobil/cache.py), dibuang otomatis saat Mobil berubah
+# Tanpa Redis versi katalog tidak terbagi antar worker, jadi TTL dibuat pendek
+KATALOG_CACHE_TTL = int(os.getenv('KATALOG_CACHE_TTL', '3600' if REDIS_URL else '60'))
+
+# Skor popularitas mobil untuk rekomendasi (mobil/skor.py): half-life peluruhan & jendela data (hari)
+SKOR_HALF_LIFE_HARI = int(os.getenv('SKOR_HALF_LIFE_HARI', '30'))
+SKOR_JENDELA_HARI = int(os.getenv('SKOR_JENDELA_HARI', '365'))
+# Refresh incremental tetap menghitung ulang penuh mobil yang terakhir dihitung ulang > N hari lalu
+SKOR_HITUNG_ULANG_HARI = int(os.getenv('SKOR_HITUNG_ULANG_HARI', '7'))
+
+# Index ketersediaan mobil (pesanan/availability.py): rebuild paksa tiap N detik
+# Tanpa Redis (development) perubahan dari proses lain hanya terlihat lewat TTL ini, jadi dibuat pendek
+KETERSEDIAAN_INDEX_TTL = int(os.getenv('KETERSEDIAAN_INDEX_TTL', '300' if REDIS_URL else '5'))
+
+# Fallback pembatalan pesanan kadaluarsa di middleware (detik, 0 = nonaktif).
+# Jika cron `manage.py batalkan_pesanan_kadaluarsa` sudah jalan, set ke 0.
+PESANAN_EXPIRY_FALLBACK_INTERVAL = int(os.getenv('PESANAN_EXPIRY_FALLBACK_INTERVAL', '600'))
@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from project.metrik import MetrikView
 
 urlpatterns = [
     # 1. Admin Panel Django
@@ -31,6 +32,9 @@ urlpatterns = [
 
     path('api/konten/', include('konten_web.urls')),
 
+    # Metrik Prometheus (khusus admin)
+    path('metrics', MetrikView.as_view(), name='metrics'),
+
     #path('api/password_reset/', include('django_rest_passwordreset.urls', namespace='password_reset')),
 ]
 
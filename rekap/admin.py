@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import RekapPesananHarian, RekapPembayaranHarian
+
+@admin.register(RekapPesananHarian)
+class RekapPesananHarianAdmin(admin.ModelAdmin):
+    list_display = ('tanggal', 'status', 'jenis_mobil', 'jumlah')
+    list_filter = ('status', 'jenis_mobil')
+    date_hierarchy = 'tanggal'
+
+@admin.register(RekapPembayaranHarian)
+class RekapPembayaranHarianAdmin(admin.ModelAdmin):
+    list_display = ('tanggal', 'status', 'jumlah_transaksi', 'total_nominal')
+    list_filter = ('status',)
+    date_hierarchy = 'tanggal'
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class RekapConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'rekap'
+
+    def ready(self):
+        # Signal agar rekap harian selalu ikut ter-update saat Pesanan/Pembayaran berubah
+        import rekap.signals
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from rekap.services import rebuild
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang (backfill) tabel rekap harian pesanan & pembayaran dari data transaksi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dari', help='Tanggal awal YYYY-MM-DD (default: semua data).')
+        parser.add_argument('--sampai', help='Tanggal akhir YYYY-MM-DD (default: semua data).')
+
+    def handle(self, *args, **options):
+        dari = sampai = None
+        if options['dari']:
+            dari = parse_date(options['dari'])
+            if not dari:
+                raise CommandError("Format --dari harus YYYY-MM-DD.")
+        if options['sampai']:
+            sampai = parse_date(options['sampai'])
+            if not sampai:
+                raise CommandError("Format --sampai harus YYYY-MM-DD.")
+
+        baris_pesanan, baris_pembayaran = rebuild(dari, sampai)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rekap selesai: {baris_pesanan} baris pesanan, {baris_pembayaran} baris pembayaran."
+        ))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RekapPembayaranHarian',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tanggal', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('jumlah_transaksi', models.IntegerField(default=0)),
+                ('total_nominal', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'verbose_name': 'Rekap Pembayaran Harian',
+                'verbose_name_plural': 'Rekap Pembayaran Harian',
+                'db_table': 'rekap_pembayaran_harian',
+                'ordering': ['-tanggal'],
+                'constraints': [models.UniqueConstraint(fields=('tanggal', 'status'), name='rekap_pembayaran_unik')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RekapPesananHarian',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tanggal', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('jenis_mobil', models.CharField(blank=True, default='', help_text='Kosong = jenis tidak diisi', max_length=50)),
+                ('jumlah', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Rekap Pesanan Harian',
+                'verbose_name_plural': 'Rekap Pesanan Harian',
+                'db_table': 'rekap_pesanan_harian',
+                'ordering': ['-tanggal'],
+                'constraints': [models.UniqueConstraint(fields=('tanggal', 'status', 'jenis_mobil'), name='rekap_pesanan_unik')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from rekap.services import rebuild
+
+
+def backfill(apps, schema_editor):
+    """Isi rekap awal dari data lama: fungsi yang sama dengan `manage.py rebuild_rekap`, dengan model historis."""
+    rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rekap', '0001_initial'),
+        ('pesanan', '0005_exclusion_constraint_jadwal'),
+        ('pembayaran', '0002_initial'),
+        ('mobil', '0006_alter_mobil_gambar'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
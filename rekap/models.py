@@ -0,0 +1,43 @@
+from django.db import models
+
+class RekapPesananHarian(models.Model):
+    """
+    Jumlah pesanan per hari (tanggal dibuat), per status, per jenis mobil.
+    Dipakai dashboard agar tidak perlu scan tabel pesanan.
+    """
+    tanggal = models.DateField()
+    status = models.CharField(max_length=20)
+    jenis_mobil = models.CharField(max_length=50, blank=True, default='', help_text="Kosong = jenis tidak diisi")
+    jumlah = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'rekap_pesanan_harian'
+        ordering = ['-tanggal']
+        verbose_name = 'Rekap Pesanan Harian'
+        verbose_name_plural = 'Rekap Pesanan Harian'
+        constraints = [
+            models.UniqueConstraint(fields=['tanggal', 'status', 'jenis_mobil'], name='rekap_pesanan_unik'),
+        ]
+
+    def __str__(self):
+        return f"{self.tanggal} {self.status} {self.jenis_mobil or '-'}: {self.jumlah}"
+
+
+class RekapPembayaranHarian(models.Model):
+    """Jumlah transaksi & total nominal pembayaran per hari (tanggal dibuat) per status."""
+    tanggal = models.DateField()
+    status = models.CharField(max_length=20)
+    jumlah_transaksi = models.IntegerField(default=0)
+    total_nominal = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'rekap_pembayaran_harian'
+        ordering = ['-tanggal']
+        verbose_name = 'Rekap Pembayaran Harian'
+        verbose_name_plural = 'Rekap Pembayaran Harian'
+        constraints = [
+            models.UniqueConstraint(fields=['tanggal', 'status'], name='rekap_pembayaran_unik'),
+        ]
+
+    def __str__(self):
+        return f"{self.tanggal} {self.status}: {self.jumlah_transaksi} / Rp {self.total_nominal:,.0f}"
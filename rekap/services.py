@@ -0,0 +1,161 @@
+"""
+Penghitung rekap harian untuk dashboard.
+
+- Perubahan satu baris (save/delete) ditangani signals.py.
+- Update massal (`queryset.update()`) TIDAK memicu signal, jadi pemanggilnya
+  wajib memanggil `catat_perubahan_status_massal()` sebelum update.
+- Jika data terlanjur tidak sinkron: `manage.py rebuild_rekap`.
+"""
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from pesanan.models import Pesanan
+from .models import RekapPesananHarian, RekapPembayaranHarian
+
+
+def tanggal_lokal(waktu):
+    """Tanggal (zona waktu lokal) sebuah created_at, sama seperti TruncDate di database."""
+    return timezone.localdate(waktu) if timezone.is_aware(waktu) else waktu.date()
+
+
+def _upsert_tambah(model, kunci, **delta):
+    """UPDATE ... SET kolom = kolom + delta; INSERT jika baris belum ada."""
+    if not any(delta.values()):
+        return
+    updates = {kolom: F(kolom) + nilai for kolom, nilai in delta.items()}
+    if model.objects.filter(**kunci).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**kunci, **delta)
+    except IntegrityError:
+        # Baris dibuat proses lain di antara UPDATE & INSERT
+        model.objects.filter(**kunci).update(**updates)
+
+
+# --- 1. PESANAN ---
+
+def tambah_pesanan(tanggal, status, jenis_mobil, delta):
+    _upsert_tambah(
+        RekapPesananHarian,
+        {'tanggal': tanggal, 'status': status, 'jenis_mobil': jenis_mobil or ''},
+        jumlah=delta,
+    )
+
+
+def catat_perubahan_status_massal(queryset, status_baru):
+    """
+    Pindahkan hitungan rekap untuk semua pesanan di `queryset` ke `status_baru`.
+    Satu query agregat (group by tanggal, status, jenis). Panggil di dalam
+    transaksi yang sama, SEBELUM `queryset.update(status=status_baru)`.
+    """
+    grup = (
+        queryset.exclude(status=status_baru)
+        .annotate(tanggal=TruncDate('created_at'))
+        .values('tanggal', 'status', 'mobil__jenis')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    for g in grup:
+        tambah_pesanan(g['tanggal'], g['status'], g['mobil__jenis'], -g['n'])
+        tambah_pesanan(g['tanggal'], status_baru, g['mobil__jenis'], g['n'])
+
+
+def catat_pindah_jenis_mobil(mobil_id, jenis_lama, jenis_baru):
+    """Jenis mobil diubah: pindahkan seluruh hitungan pesanan mobil tsb ke jenis baru."""
+    grup = (
+        Pesanan.objects.filter(mobil_id=mobil_id)
+        .annotate(tanggal=TruncDate('created_at'))
+        .values('tanggal', 'status')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    for g in grup:
+        tambah_pesanan(g['tanggal'], g['status'], jenis_lama, -g['n'])
+        tambah_pesanan(g['tanggal'], g['status'], jenis_baru, g['n'])
+
+
+# --- 2. PEMBAYARAN ---
+
+def tambah_pembayaran(tanggal, status, delta_transaksi, delta_nominal):
+    _upsert_tambah(
+        RekapPembayaranHarian,
+        {'tanggal': tanggal, 'status': status},
+        jumlah_transaksi=delta_transaksi,
+        total_nominal=delta_nominal,
+    )
+
+
+# --- 3. REBUILD / BACKFILL ---
+
+def rebuild(dari=None, sampai=None, apps=global_apps):
+    """
+    Hitung ulang rekap dari tabel transaksi untuk rentang tanggal (inklusif).
+    Return tuple (jumlah baris rekap pesanan, jumlah baris rekap pembayaran).
+    `apps`: registry model; migrasi data (0002_backfill_rekap) mengirim registry historisnya.
+    """
+    RekapPesanan = apps.get_model('rekap', 'RekapPesananHarian')
+    RekapPembayaran = apps.get_model('rekap', 'RekapPembayaranHarian')
+    pesanan_qs = apps.get_model('pesanan', 'Pesanan').objects.all()
+    pembayaran_qs = apps.get_model('pembayaran', 'Pembayaran').objects.all()
+    rekap_pesanan_qs = RekapPesanan.objects.all()
+    rekap_pembayaran_qs = RekapPembayaran.objects.all()
+
+    if dari:
+        pesanan_qs = pesanan_qs.filter(created_at__date__gte=dari)
+        pembayaran_qs = pembayaran_qs.filter(created_at__date__gte=dari)
+        rekap_pesanan_qs = rekap_pesanan_qs.filter(tanggal__gte=dari)
+        rekap_pembayaran_qs = rekap_pembayaran_qs.filter(tanggal__gte=dari)
+    if sampai:
+        pesanan_qs = pesanan_qs.filter(created_at__date__lte=sampai)
+        pembayaran_qs = pembayaran_qs.filter(created_at__date__lte=sampai)
+        rekap_pesanan_qs = rekap_pesanan_qs.filter(tanggal__lte=sampai)
+        rekap_pembayaran_qs = rekap_pembayaran_qs.filter(tanggal__lte=sampai)
+
+    grup_pesanan = (
+        pesanan_qs.annotate(tanggal=TruncDate('created_at'))
+        .values('tanggal', 'status', 'mobil__jenis')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    grup_pembayaran = (
+        pembayaran_qs.annotate(tanggal=TruncDate('created_at'))
+        .values('tanggal', 'status')
+        .annotate(n=Count('id'), total=Sum('jumlah'))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        rekap_pesanan_qs.delete()
+        rekap_pembayaran_qs.delete()
+
+        # jenis NULL & '' digabung ke baris yang sama
+        hitung = {}
+        for g in grup_pesanan:
+            kunci = (g['tanggal'], g['status'], g['mobil__jenis'] or '')
+            hitung[kunci] = hitung.get(kunci, 0) + g['n']
+
+        RekapPesanan.objects.bulk_create(
+            [
+                RekapPesanan(tanggal=tanggal, status=status, jenis_mobil=jenis, jumlah=n)
+                for (tanggal, status, jenis), n in hitung.items()
+            ],
+            batch_size=1000,
+        )
+        baris_pembayaran = RekapPembayaran.objects.bulk_create(
+            [
+                RekapPembayaran(
+                    tanggal=g['tanggal'], status=g['status'],
+                    jumlah_transaksi=g['n'], total_nominal=g['total'] or Decimal(0),
+                )
+                for g in grup_pembayaran
+            ],
+            batch_size=1000,
+        )
+
+    return len(hitung), len(baris_pembayaran)
@@ -0,0 +1,141 @@
+"""
+Rekap harian dari save/delete satu baris (rekap/services.py).
+
+- Nilai kolom rekap (status, mobil, jumlah, jenis) diingat saat instance dimuat
+  (post_init). Save yang tidak mengubah kolom itu dilewati tanpa SELECT maupun
+  upsert; hanya jika berubah nilai lama dibaca dari database di pre_save
+  (akurat walau baris sudah diubah proses lain sejak dimuat).
+- Delta diterapkan lewat `transaction.on_commit`: upsert (dan lock baris rekap)
+  tidak terjadi di dalam transaksi pemanggil, dan rollback tidak meninggalkan
+  delta. Jika proses mati di antara commit & callback: `manage.py rebuild_rekap`.
+"""
+from django.db import transaction
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from pesanan.models import Pesanan
+from pembayaran.models import Pembayaran
+from mobil.models import Mobil
+from . import services
+
+KOLOM_PESANAN = ('status', 'mobil_id')
+KOLOM_PEMBAYARAN = ('status', 'jumlah')
+KOLOM_MOBIL = ('jenis',)
+
+
+def _nilai(instance, kolom):
+    """Kolom yang sudah dimuat saja (kolom ter-defer tidak ada di __dict__, tanpa query)."""
+    return {k: instance.__dict__[k] for k in kolom if k in instance.__dict__}
+
+
+def _ingat(instance, kolom):
+    instance._rekap_lama = _nilai(instance, kolom) if instance.pk else None
+
+
+def _lengkapi(sender, instance, kolom):
+    """pre_save: SELECT nilai lama hanya jika kolom rekap (mungkin) berubah sejak dimuat."""
+    if not instance.pk:
+        instance._rekap_lama = None
+        return
+    lama = getattr(instance, '_rekap_lama', None)
+    if lama is not None and lama == {k: instance.__dict__.get(k) for k in kolom}:
+        return
+    instance._rekap_lama = sender.objects.filter(pk=instance.pk).values(*kolom).first()
+
+
+def _perubahan(instance, created, kolom):
+    """Return (lama, baru); lama None untuk baris baru. Nilai yang diingat ikut diperbarui."""
+    lama = None if created else getattr(instance, '_rekap_lama', None)
+    baru = {k: getattr(instance, k) for k in kolom}
+    instance._rekap_lama = dict(baru)
+    return lama, baru
+
+
+# --- PESANAN ---
+
+@receiver(post_init, sender=Pesanan)
+def ingat_kondisi_pesanan(sender, instance, **kwargs):
+    _ingat(instance, KOLOM_PESANAN)
+
+@receiver(pre_save, sender=Pesanan)
+def lengkapi_kondisi_lama_pesanan(sender, instance, **kwargs):
+    _lengkapi(sender, instance, KOLOM_PESANAN)
+
+@receiver(post_save, sender=Pesanan)
+def update_rekap_pesanan(sender, instance, created, **kwargs):
+    lama, baru = _perubahan(instance, created, KOLOM_PESANAN)
+    if lama == baru:
+        return
+    tanggal = services.tanggal_lokal(instance.created_at)
+
+    def terapkan():
+        mobil_ids = {baru['mobil_id'], lama['mobil_id'] if lama else None} - {None}
+        jenis = dict(Mobil.objects.filter(pk__in=mobil_ids).values_list('id', 'jenis'))
+        jenis_baru = jenis.get(baru['mobil_id'])
+        if lama:
+            jenis_lama = jenis.get(lama['mobil_id'])
+            if lama['status'] == baru['status'] and (jenis_lama or '') == (jenis_baru or ''):
+                return
+            services.tambah_pesanan(tanggal, lama['status'], jenis_lama, -1)
+        services.tambah_pesanan(tanggal, baru['status'], jenis_baru, 1)
+
+    transaction.on_commit(terapkan, robust=True)
+
+@receiver(post_delete, sender=Pesanan)
+def kurangi_rekap_pesanan(sender, instance, **kwargs):
+    tanggal, status, mobil_id = services.tanggal_lokal(instance.created_at), instance.status, instance.mobil_id
+
+    def terapkan():
+        jenis = Mobil.objects.filter(pk=mobil_id).values_list('jenis', flat=True).first()
+        services.tambah_pesanan(tanggal, status, jenis, -1)
+
+    transaction.on_commit(terapkan, robust=True)
+
+# --- PEMBAYARAN ---
+
+@receiver(post_init, sender=Pembayaran)
+def ingat_kondisi_pembayaran(sender, instance, **kwargs):
+    _ingat(instance, KOLOM_PEMBAYARAN)
+
+@receiver(pre_save, sender=Pembayaran)
+def lengkapi_kondisi_lama_pembayaran(sender, instance, **kwargs):
+    _lengkapi(sender, instance, KOLOM_PEMBAYARAN)
+
+@receiver(post_save, sender=Pembayaran)
+def update_rekap_pembayaran(sender, instance, created, **kwargs):
+    lama, baru = _perubahan(instance, created, KOLOM_PEMBAYARAN)
+    if lama == baru:
+        return
+    tanggal = services.tanggal_lokal(instance.created_at)
+
+    def terapkan():
+        if lama:
+            services.tambah_pembayaran(tanggal, lama['status'], -1, -lama['jumlah'])
+        services.tambah_pembayaran(tanggal, baru['status'], 1, baru['jumlah'])
+
+    transaction.on_commit(terapkan, robust=True)
+
+@receiver(post_delete, sender=Pembayaran)
+def kurangi_rekap_pembayaran(sender, instance, **kwargs):
+    tanggal, status, jumlah = services.tanggal_lokal(instance.created_at), instance.status, instance.jumlah
+    transaction.on_commit(lambda: services.tambah_pembayaran(tanggal, status, -1, -jumlah), robust=True)
+
+# --- MOBIL (jenis berubah) ---
+
+@receiver(post_init, sender=Mobil)
+def ingat_jenis_mobil(sender, instance, **kwargs):
+    _ingat(instance, KOLOM_MOBIL)
+
+@receiver(pre_save, sender=Mobil)
+def lengkapi_jenis_lama_mobil(sender, instance, **kwargs):
+    _lengkapi(sender, instance, KOLOM_MOBIL)
+
+@receiver(post_save, sender=Mobil)
+def pindah_rekap_jenis_mobil(sender, instance, created, **kwargs):
+    lama, baru = _perubahan(instance, created, KOLOM_MOBIL)
+    if created or lama is None or (lama['jenis'] or '') == (baru['jenis'] or ''):
+        return
+    mobil_id = instance.pk
+    transaction.on_commit(
+        lambda: services.catat_pindah_jenis_mobil(mobil_id, lama['jenis'], baru['jenis']), robust=True
+    )
@@ -0,0 +1,94 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from mobil.models import Mobil
+from pelanggan.models import Pelanggan
+from pesanan.models import Pesanan
+from .models import RekapPesananHarian
+from .services import rebuild
+
+User = get_user_model()
+
+
+class RekapSignalTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='budi', password='rahasia123', email='budi@example.com')
+        self.pelanggan = Pelanggan.objects.create(user=user, nama='Budi', no_hp='081200000000')
+        self.mobil = Mobil.objects.create(
+            nama_mobil='Avanza', merk='Toyota', jenis='MPV', plat_nomor='BA 1 TES', tahun=2020,
+            transmisi='manual', kapasitas_kursi=7, harga_per_hari=300000,
+        )
+        self.mulai = datetime.date(2030, 1, 1)
+
+    def _rekap(self):
+        return {
+            (r.status, r.jenis_mobil): r.jumlah
+            for r in RekapPesananHarian.objects.exclude(jumlah=0)
+        }
+
+    def _buat(self, status='pending'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Pesanan.objects.create(
+                pelanggan=self.pelanggan, mobil=self.mobil, status=status,
+                tanggal_mulai=self.mulai, tanggal_selesai=self.mulai,
+            )
+
+    def test_delta_diterapkan_setelah_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            pesanan = Pesanan.objects.create(
+                pelanggan=self.pelanggan, mobil=self.mobil, status='pending',
+                tanggal_mulai=self.mulai, tanggal_selesai=self.mulai,
+            )
+            self.assertEqual(self._rekap(), {})
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self._rekap(), {('pending', 'MPV'): 1})
+
+        pesanan = Pesanan.objects.get(pk=pesanan.pk)
+        pesanan.status = 'konfirmasi'
+        with self.captureOnCommitCallbacks(execute=True):
+            pesanan.save()
+            pesanan.status = 'lunas'
+            pesanan.save()
+
+        self.assertEqual(self._rekap(), {('lunas', 'MPV'): 1})
+
+    def test_save_tanpa_perubahan_tidak_menyentuh_rekap(self):
+        pesanan = Pesanan.objects.get(pk=self._buat().pk)
+        pesanan.catatan = 'hanya catatan'
+
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            pesanan.save()
+
+        self.assertFalse([q['sql'] for q in queries if 'rekap_' in q['sql']])
+        self.assertEqual(self._rekap(), {('pending', 'MPV'): 1})
+
+    def test_nilai_lama_dibaca_ulang_jika_berubah_di_tempat_lain(self):
+        pesanan = Pesanan.objects.get(pk=self._buat().pk)
+        # Diubah lewat instance lain setelah `pesanan` dimuat -> snapshot-nya basi
+        with self.captureOnCommitCallbacks(execute=True):
+            basi = Pesanan.objects.get(pk=pesanan.pk)
+            basi.status = 'batal'
+            basi.save()
+
+        pesanan.status = 'konfirmasi'
+        with self.captureOnCommitCallbacks(execute=True):
+            pesanan.save()
+
+        self.assertEqual(self._rekap(), {('konfirmasi', 'MPV'): 1})
+
+    def test_hapus_dan_sama_dengan_rebuild(self):
+        self._buat('pending')
+        hapus = self._buat('konfirmasi')
+        with self.captureOnCommitCallbacks(execute=True):
+            hapus.delete()
+        inkremental = self._rekap()
+
+        rebuild()
+
+        self.assertEqual(inkremental, {('pending', 'MPV'): 1})
+        self.assertEqual(self._rekap(), inkremental)
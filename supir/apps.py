@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SupirConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'supir'
+
+    def ready(self):
+        # Signal pembuatan varian gambar responsif (project/gambar.py)
+        import supir.signals
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supir', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supir',
+            name='foto_varian',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -15,6 +15,8 @@ class Supir(models.Model):
     
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='tersedia')
     foto = models.ImageField(upload_to='supir/', blank=True, null=True)
+    # Peta URL varian responsif (srcset), diisi otomatis oleh signals (project/gambar.py)
+    foto_varian = models.JSONField(default=dict, blank=True, editable=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,80 @@
+"""
+Jadwal & penugasan otomatis supir.
+
+Jadwal supir dibangun dari rentang tanggal Pesanan (1 query untuk satu jendela
+waktu), lalu ketersediaan dicek di memori. Penugasan otomatis memakai sweep
+greedy: pesanan diurutkan dari tanggal mulai paling awal, masing-masing diberi
+supir bebas dengan beban (hari bertugas) paling sedikit.
+
+Bentrok jadwal tetap dijaga exclusion constraint `pesanan_supir_tidak_bentrok`.
+"""
+import datetime
+from bisect import bisect_right, insort
+
+from pesanan.models import Pesanan, STATUS_BLOKIR_JADWAL
+from .models import Supir
+
+
+def _hari_overlap(mulai_a, selesai_a, mulai_b, selesai_b):
+    """Jumlah hari irisan dua rentang inklusif."""
+    return max((min(selesai_a, selesai_b) - max(mulai_a, mulai_b)).days + 1, 0)
+
+
+class JadwalSupir:
+    """Interval tugas setiap supir di jendela [dari, sampai]."""
+
+    def __init__(self, dari, sampai):
+        self.dari = dari
+        self.sampai = sampai
+        # supir_id -> list[(tanggal_mulai, tanggal_selesai, pesanan_id)], urut tanggal_mulai
+        self.interval = {}
+        # supir_id -> jumlah hari bertugas di dalam jendela
+        self.beban = {}
+
+        rows = Pesanan.objects.filter(
+            supir__isnull=False,
+            status__in=STATUS_BLOKIR_JADWAL,
+            tanggal_mulai__lte=sampai,
+            tanggal_selesai__gte=dari,
+        ).values_list('supir_id', 'tanggal_mulai', 'tanggal_selesai', 'id')
+
+        for supir_id, mulai, selesai, pesanan_id in rows:
+            self.interval.setdefault(supir_id, []).append((mulai, selesai, pesanan_id))
+            self.beban[supir_id] = self.beban.get(supir_id, 0) + _hari_overlap(mulai, selesai, dari, sampai)
+
+        for intervals in self.interval.values():
+            intervals.sort()
+
+    def bebas(self, supir_id, mulai, selesai):
+        intervals = self.interval.get(supir_id, [])
+        # Hanya interval yang mulai <= selesai yang mungkin overlap
+        batas = bisect_right(intervals, (selesai, datetime.date.max, float('inf')))
+        return all(akhir < mulai for _, akhir, _ in intervals[:batas])
+
+    def tambah(self, supir_id, mulai, selesai, pesanan_id):
+        insort(self.interval.setdefault(supir_id, []), (mulai, selesai, pesanan_id))
+        self.beban[supir_id] = self.beban.get(supir_id, 0) + _hari_overlap(mulai, selesai, self.dari, self.sampai)
+
+
+def supir_siap():
+    """Supir yang boleh ditugaskan (status 'off' dikecualikan)."""
+    return list(Supir.objects.exclude(status='off').order_by('id').values_list('id', flat=True))
+
+
+def pilih_supir(daftar_pesanan, supir_ids, jadwal):
+    """
+    `daftar_pesanan`: iterable (pesanan_id, tanggal_mulai, tanggal_selesai).
+    Return dict pesanan_id -> supir_id (None jika tidak ada supir bebas).
+    """
+    hasil = {}
+    # Mulai paling awal dulu; yang lebih panjang didahulukan jika mulai bersamaan
+    urut = sorted(daftar_pesanan, key=lambda p: (p[1], -(p[2] - p[1]).days, p[0]))
+    for pesanan_id, mulai, selesai in urut:
+        kandidat = [s for s in supir_ids if jadwal.bebas(s, mulai, selesai)]
+        if not kandidat:
+            hasil[pesanan_id] = None
+            continue
+        terpilih = min(kandidat, key=lambda s: (jadwal.beban.get(s, 0), s))
+        jadwal.tambah(terpilih, mulai, selesai, pesanan_id)
+        hasil[pesanan_id] = terpilih
+    return hasil
@@ -1,8 +1,10 @@
 from rest_framework import serializers
+from project.gambar import absolutkan
 from .models import Supir
 
 class SupirSerializer(serializers.ModelSerializer):
     foto_url = serializers.SerializerMethodField()
+    foto_varian = serializers.SerializerMethodField()
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     
     class Meta:
@@ -15,4 +17,18 @@ class SupirSerializer(serializers.ModelSerializer):
             request = self.context.get('request')
             if request:
                 return request.build_absolute_uri(obj.foto.url)
-        return None
\ No newline at end of file
+        return None
+
+    def get_foto_varian(self, obj):
+        # File varian di storage lokal -> URL relatif, diabsolutkan seperti foto_url
+        return absolutkan(obj.foto_varian, self.context.get('request'))
+
+
+class AutoAssignSerializer(serializers.Serializer):
+    """
+    Input auto_assign. Tanpa `pesanan_ids`: semua pesanan mendatang yang
+    mobilnya paket dengan supir (`dengan_supir`) tapi belum ada supirnya.
+    """
+    pesanan_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=500
+    )
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from project.gambar import sinkron_varian
+
+from .models import Supir
+
+
+@receiver(post_save, sender=Supir)
+def buat_varian_foto(sender, instance, raw=False, **kwargs):
+    """Foto baru / berganti: buat file varian (Pillow) & simpan petanya di `foto_varian`."""
+    if not raw:
+        sinkron_varian(instance, 'foto', 'foto_varian')
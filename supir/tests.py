@@ -1,3 +1,61 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from mobil.models import Mobil
+from pelanggan.models import Pelanggan
+from pesanan.models import Pesanan
+from .models import Supir
+
+User = get_user_model()
+
+
+class AutoAssignTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'rahasia123'))
+        user = User.objects.create_user(username='budi', password='rahasia123', email='budi@example.com')
+        self.pelanggan = Pelanggan.objects.create(user=user, nama='Budi', no_hp='081200000000')
+        self.mobil = Mobil.objects.create(
+            nama_mobil='Avanza', merk='Toyota', jenis='MPV', plat_nomor='BA 1 TES', tahun=2020,
+            transmisi='manual', kapasitas_kursi=7, harga_per_hari=300000,
+        )
+        self.supir = Supir.objects.create(nama='Andi', no_hp='0812', harga_per_hari=150000)
+        self.mulai = timezone.localdate() + datetime.timedelta(days=3)
+
+    def _pesanan(self, status, harga_total, hari=2):
+        return Pesanan.objects.create(
+            pelanggan=self.pelanggan, mobil=self.mobil, status=status, harga_total=harga_total,
+            tanggal_mulai=self.mulai, tanggal_selesai=self.mulai + datetime.timedelta(days=hari - 1),
+        )
+
+    def _assign(self, *pesanan):
+        return self.client.post('/api/supir/auto_assign/', {'pesanan_ids': [p.id for p in pesanan]}, format='json')
+
+    def test_hanya_jasa_supir_yang_ditambahkan(self):
+        # Harga tersimpan sudah termasuk promo; harga mobil yang berubah tidak ikut dihitung ulang
+        pesanan = self._pesanan('konfirmasi', Decimal('500000'))
+        Mobil.objects.filter(pk=self.mobil.pk).update(harga_per_hari=999000)
+
+        response = self._assign(pesanan)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['berhasil'], 1)
+        pesanan.refresh_from_db()
+        self.assertEqual(pesanan.supir_id, self.supir.id)
+        self.assertEqual(pesanan.harga_total, Decimal('800000'))
+
+    def test_pesanan_lunas_ditolak(self):
+        pesanan = self._pesanan('lunas', Decimal('600000'))
+
+        response = self._assign(pesanan)
 
-# Create your tests here.
+        self.assertEqual(response.json()['gagal'], 1)
+        self.assertIn('lunas', response.json()['hasil'][0]['error'])
+        pesanan.refresh_from_db()
+        self.assertIsNone(pesanan.supir_id)
+        self.assertEqual(pesanan.harga_total, Decimal('600000'))
@@ -1,7 +1,15 @@
 from rest_framework import viewsets, filters
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAdminUser
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from pesanan.availability import index_ketersediaan
+from pesanan.models import Pesanan
 from .models import Supir
-from .serializers import SupirSerializer
+from .serializers import SupirSerializer, AutoAssignSerializer
+from .penugasan import JadwalSupir, pilih_supir, supir_siap
 
 class SupirViewSet(viewsets.ModelViewSet):
     queryset = Supir.objects.all()
@@ -31,4 +39,131 @@ class SupirViewSet(viewsets.ModelViewSet):
         if status:
             queryset = queryset.filter(status=status)
             
-        return queryset
\ No newline at end of file
+        return queryset
+
+    # --- KALENDER KETERSEDIAAN SUPIR ---
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def ketersediaan(self, request):
+        """
+        URL: /api/supir/ketersediaan/?start=2025-01-10&end=2025-01-12
+        Jadwal tugas tiap supir di rentang tsb + apakah bebas di seluruh rentang.
+        """
+        start = parse_date(request.query_params.get('start') or '')
+        end = parse_date(request.query_params.get('end') or '')
+        if not start or not end:
+            return Response({"error": "Parameter tanggal wajib"}, status=400)
+        if start > end:
+            return Response({"error": "Tanggal selesai tidak boleh sebelum tanggal mulai."}, status=400)
+
+        jadwal = JadwalSupir(start, end)
+        data = []
+        for supir in Supir.objects.order_by('nama').values('id', 'nama', 'no_hp', 'status'):
+            supir_id = supir['id']
+            supir['tersedia'] = supir['status'] != 'off' and jadwal.bebas(supir_id, start, end)
+            supir['hari_bertugas'] = jadwal.beban.get(supir_id, 0)
+            supir['jadwal'] = [
+                {'tanggal_mulai': mulai, 'tanggal_selesai': selesai, 'pesanan_id': pesanan_id}
+                for mulai, selesai, pesanan_id in jadwal.interval.get(supir_id, [])
+            ]
+            data.append(supir)
+        return Response(data)
+
+    # --- PENUGASAN OTOMATIS ---
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def auto_assign(self, request):
+        """
+        Body: {"pesanan_ids": [1, 2, 3]} (opsional)
+        Tiap pesanan diberi supir yang bebas di tanggalnya, beban paling ringan
+        (hari bertugas) diprioritaskan. Mobil paket `dengan_supir` harganya sudah
+        termasuk supir; selain itu hanya jasa supir (harga_per_hari supir x total_hari)
+        yang ditambahkan ke `harga_total` tersimpan, harga mobil & promo tidak dihitung ulang.
+        Pesanan `lunas` tanpa paket supir ditolak: tagihannya sudah dibayar.
+        """
+        input_serializer = AutoAssignSerializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+        pesanan_ids = input_serializer.validated_data.get('pesanan_ids')
+
+        today = timezone.localdate()
+        # Hanya pesanan yang belum berjalan & belum punya supir
+        queryset = Pesanan.objects.filter(
+            supir__isnull=True,
+            status__in=['pending', 'konfirmasi', 'lunas'],
+            tanggal_selesai__gte=today,
+        )
+        if pesanan_ids:
+            queryset = queryset.filter(id__in=pesanan_ids)
+        else:
+            queryset = queryset.filter(mobil__dengan_supir=True)
+
+        try:
+            with transaction.atomic():
+                daftar = list(
+                    queryset.select_for_update(of=('self',))
+                    .select_related('mobil')
+                    .only(
+                        'id', 'kode_booking', 'status', 'tanggal_mulai', 'tanggal_selesai', 'total_hari',
+                        'harga_total', 'supir', 'mobil__dengan_supir',
+                    )
+                )
+                if not daftar:
+                    return Response({'berhasil': 0, 'gagal': 0, 'hasil': []})
+
+                ditolak = {p.id for p in daftar if p.status == 'lunas' and not p.mobil.dengan_supir}
+                daftar_proses = [p for p in daftar if p.id not in ditolak]
+
+                penugasan = {}
+                if daftar_proses:
+                    jadwal = JadwalSupir(
+                        min(p.tanggal_mulai for p in daftar_proses),
+                        max(p.tanggal_selesai for p in daftar_proses),
+                    )
+                    penugasan = pilih_supir(
+                        [(p.id, p.tanggal_mulai, p.tanggal_selesai) for p in daftar_proses],
+                        supir_siap(),
+                        jadwal,
+                    )
+
+                info_supir = {
+                    supir_id: (nama, harga) for supir_id, nama, harga in
+                    Supir.objects.filter(id__in=set(penugasan.values()) - {None})
+                    .values_list('id', 'nama', 'harga_per_hari')
+                }
+                sekarang = timezone.now()
+                diperbarui = []
+                for pesanan in daftar_proses:
+                    supir_id = penugasan[pesanan.id]
+                    if supir_id:
+                        pesanan.supir_id = supir_id
+                        pesanan.updated_at = sekarang
+                        if not pesanan.mobil.dengan_supir:
+                            pesanan.harga_total += info_supir[supir_id][1] * pesanan.total_hari
+                        diperbarui.append(pesanan)
+                Pesanan.objects.bulk_update(diperbarui, ['supir', 'harga_total', 'updated_at'], batch_size=500)
+                # bulk_update tidak memicu signal: index ketersediaan di-refresh manual.
+                # Rekap harian tidak berubah (hanya menghitung status & jenis mobil).
+                if diperbarui:
+                    transaction.on_commit(index_ketersediaan.invalidasi)
+        except IntegrityError:
+            # Supir keburu ditugaskan di tempat lain (exclusion constraint)
+            return Response({"error": "Jadwal supir berubah saat proses, silakan ulangi."}, status=409)
+
+        hasil = []
+        for pesanan in sorted(daftar, key=lambda p: (p.tanggal_mulai, p.id)):
+            supir_id = penugasan.get(pesanan.id)
+            item = {'id': pesanan.id, 'kode_booking': pesanan.kode_booking, 'berhasil': supir_id is not None}
+            if supir_id:
+                item.update({
+                    'supir_id': supir_id, 'supir_nama': info_supir[supir_id][0], 'harga_total': pesanan.harga_total,
+                })
+            elif pesanan.id in ditolak:
+                item['error'] = 'Pesanan sudah lunas, jasa supir tidak bisa ditambahkan'
+            else:
+                item['error'] = 'Tidak ada supir yang bebas di tanggal tersebut'
+            hasil.append(item)
+
+        return Response({
+            'berhasil': len(diperbarui),
+            'gagal': len(daftar) - len(diperbarui),
+            'hasil': hasil,
+        })
+
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """IdempotencyKey pindah ke app pesanan; tabel `idempotency_key` tetap dipakai apa adanya."""
+
+    dependencies = [
+        ('users', '0003_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.DeleteModel(name='IdempotencyKey'),
+            ],
+            database_operations=[],
+        ),
+    ]
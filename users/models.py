@@ -37,4 +37,5 @@ class PasswordResetOTP(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
-        return f"{self.user.email} - {self.otp_code}"
\ No newline at end of file
+        return f"{self.user.email} - {self.otp_code}"
+
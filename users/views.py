@@ -10,7 +10,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 
 from django.contrib.auth import get_user_model, authenticate
 from django.db import transaction
-from django.core.mail import send_mail  # <--- Penting untuk kirim email
+from notifikasi.outbox import antre_email  # <--- Email lewat outbox (tidak blok request)
 
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
@@ -219,20 +219,21 @@ class RequestPasswordResetView(APIView):
             # 1. Generate Kode 6 Digit
             otp = str(random.randint(100000, 999999))
             
-            # 2. Simpan ke Database
-            PasswordResetOTP.objects.update_or_create(
-                user=user,
-                defaults={'otp_code': otp}
-            )
-
-            # 3. Kirim Email
-            send_mail(
-                subject="Kode Reset Password - Rental Mobil",
-                message=f"Kode OTP Anda adalah: {otp}\n\nJangan berikan kode ini ke siapapun.",
-                from_email="noreply@rentalmobil.com",
-                recipient_list=[email],
-                fail_silently=False,
-            )
+            with transaction.atomic():
+                # 2. Simpan ke Database
+                PasswordResetOTP.objects.update_or_create(
+                    user=user,
+                    defaults={'otp_code': otp}
+                )
+
+                # 3. Antri Email (dikirim worker outbox)
+                antre_email(
+                    subject="Kode Reset Password - Rental Mobil",
+                    message=f"Kode OTP Anda adalah: {otp}\n\nJangan berikan kode ini ke siapapun.",
+                    from_email="noreply@rentalmobil.com",
+                    recipient_list=[email],
+                    rahasia=True,
+                )
 
             return Response({'message': 'Kode OTP terkirim ke email.'})
 